@@ -0,0 +1,12 @@
+"""
+Benchmarks for the madVR Envy integration.
+
+Runs the real device, remote and driver code against the in-process Envy
+simulator and records latency and throughput figures as JSON, so runs can be
+compared against a baseline:
+
+    python -m benchmarks --output results/current.json --baseline results/baseline.json
+
+:copyright: (c) 2025 by Meir Miyara
+:license: MPL-2.0, see LICENSE for more details.
+"""
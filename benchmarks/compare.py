@@ -0,0 +1,92 @@
+"""
+Compare benchmark results against a baseline.
+
+    python -m benchmarks.compare baseline.json current.json
+
+Exits non-zero when a metric regressed by more than its tolerance.
+
+:copyright: (c) 2025 by Meir Miyara
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+DEFAULT_THRESHOLDS = Path(__file__).with_name("thresholds.json")
+
+
+def load_thresholds(path: Path = DEFAULT_THRESHOLDS) -> dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(baseline: dict[str, float], current: dict[str, float], thresholds: dict[str, Any]) -> list[dict[str, Any]]:
+    """Return one entry per metric present in both runs, flagging regressions.
+
+    A metric regresses when it moved the wrong way by more than its relative
+    tolerance and by more than its absolute ``min_delta``, the latter keeps
+    sub-millisecond noise on fast metrics from failing a run.
+    """
+    higher_is_better = set(thresholds.get("higher_is_better", []))
+    tolerances = thresholds.get("tolerance", {})
+    min_deltas = thresholds.get("min_delta", {})
+
+    rows = []
+    for metric in sorted(baseline.keys() & current.keys()):
+        before, after = baseline[metric], current[metric]
+        tolerance = tolerances.get(metric, thresholds.get("default_tolerance", 0.25))
+        min_delta = min_deltas.get(metric, thresholds.get("default_min_delta", 0.0))
+
+        worse_by = before - after if metric in higher_is_better else after - before
+        change = (after - before) / before if before else 0.0
+        regressed = worse_by > min_delta and worse_by > abs(before) * tolerance
+
+        rows.append({
+            "metric": metric,
+            "baseline": before,
+            "current": after,
+            "change": change,
+            "regressed": regressed,
+        })
+    return rows
+
+
+def report(rows: list[dict[str, Any]]) -> str:
+    width = max((len(row["metric"]) for row in rows), default=10)
+    lines = [f"{'metric':<{width}}  {'baseline':>12}  {'current':>12}  {'change':>8}"]
+    for row in rows:
+        flag = "  REGRESSED" if row["regressed"] else ""
+        lines.append(
+            f"{row['metric']:<{width}}  {row['baseline']:>12.3f}  {row['current']:>12.3f}  "
+            f"{row['change']:>+8.1%}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare madVR integration benchmark results")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("current", type=Path)
+    parser.add_argument("--thresholds", type=Path, default=DEFAULT_THRESHOLDS)
+    args = parser.parse_args(argv)
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["metrics"]
+    with open(args.current, "r", encoding="utf-8") as f:
+        current = json.load(f)["metrics"]
+
+    rows = compare(baseline, current, load_thresholds(args.thresholds))
+    print(report(rows))
+
+    regressions = [row["metric"] for row in rows if row["regressed"]]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Run the benchmark scenarios and write the results as JSON.
+
+:copyright: (c) 2025 by Meir Miyara
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import time
+from pathlib import Path
+from typing import Any
+
+from benchmarks import compare
+from benchmarks.scenarios import SCENARIOS
+
+RESULTS_DIR = Path(__file__).with_name("results")
+DRIVER_JSON = Path(__file__).resolve().parent.parent / "driver.json"
+
+
+def _driver_version() -> str:
+    try:
+        with open(DRIVER_JSON, "r", encoding="utf-8") as f:
+            return json.load(f).get("version", "unknown")
+    except (OSError, ValueError):
+        return "unknown"
+
+
+async def run(names: list[str], options: dict[str, Any], scale: float) -> dict[str, float]:
+    metrics = {}
+    for name in names:
+        scenario, iterations = SCENARIOS[name]
+        iterations = max(1, int(iterations * scale))
+        started = time.perf_counter()
+        metrics.update(await scenario(options, iterations))
+        print(f"{name}: {iterations} iterations in {time.perf_counter() - started:.2f}s")
+    return metrics
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the madVR integration against the Envy simulator")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="scenario to run, may be repeated (default: all)")
+    parser.add_argument("--latency", type=float, default=1.0, help="simulated mean reply latency in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="simulated latency deviation in ms")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every scenario's iterations")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", type=Path, default=None, help="results file to compare against")
+    parser.add_argument("--thresholds", type=Path, default=compare.DEFAULT_THRESHOLDS)
+    args = parser.parse_args(argv)
+
+    # The integration logs every command at INFO and ucapi every update at DEBUG, which would dominate the timings
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s [%(levelname)s] %(name)s: %(message)s')
+    logging.disable(logging.INFO)
+
+    names = args.scenario or list(SCENARIOS)
+    options = {"latency": args.latency / 1000, "jitter": args.jitter / 1000}
+    metrics = asyncio.run(run(names, options, args.scale))
+
+    results = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "version": _driver_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "simulator": {"latency_ms": args.latency, "jitter_ms": args.jitter},
+        "metrics": metrics,
+    }
+
+    output = args.output or RESULTS_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.baseline is None:
+        for metric, value in metrics.items():
+            print(f"  {metric}: {value}")
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["metrics"]
+    rows = compare.compare(baseline, metrics, compare.load_thresholds(args.thresholds))
+    print(compare.report(rows))
+    return 1 if any(row["regressed"] for row in rows) else 0
@@ -0,0 +1,225 @@
+"""
+Benchmark scenarios.
+
+Every scenario drives the integration code the way the driver does, against a
+fresh simulator, and returns flat ``<scenario>.<metric>`` figures. Times are
+reported in milliseconds unless the metric name says otherwise.
+
+:copyright: (c) 2025 by Meir Miyara
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import asyncio
+import math
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+import ucapi
+from ucapi.remote import Commands
+
+from uc_intg_madvr import const, driver
+from uc_intg_madvr.config import MadVRDeviceConfig
+from uc_intg_madvr.device import DeviceScheduler, EventBus, MadVRDevice, PowerState
+from uc_intg_madvr.remote import MadVRRemote
+from uc_intg_madvr.simulator import EnvySimulator
+
+Scenario = Callable[[dict[str, Any], int], Awaitable[dict[str, float]]]
+
+# Commands timed one by one in the command latency scenario
+LATENCY_COMMANDS = (
+    const.CMD_HEARTBEAT,
+    const.CMD_GET_SIGNAL_INFO,
+    const.CMD_GET_TEMPERATURES,
+    f"{const.CMD_KEY_PRESS} {const.KEY_UP}",
+)
+
+WAIT_TIMEOUT = 10.0
+
+
+def percentiles(samples: list[float], prefix: str) -> dict[str, float]:
+    """Nearest-rank p50/p95/p99 of samples in seconds, reported in milliseconds."""
+    ordered = sorted(samples)
+    result = {}
+    for percentile in (50, 95, 99):
+        rank = max(1, math.ceil(percentile / 100 * len(ordered)))
+        result[f"{prefix}.p{percentile}_ms"] = round(ordered[rank - 1] * 1000, 3)
+    return result
+
+
+async def wait_for(condition: Callable[[], bool], timeout: float = WAIT_TIMEOUT):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("Benchmark condition not reached")
+        await asyncio.sleep(0.001)
+
+
+@asynccontextmanager
+async def simulator(options: dict[str, Any]) -> AsyncIterator[EnvySimulator]:
+    envy = EnvySimulator(host="127.0.0.1", port=0, **options)
+    await envy.start()
+    try:
+        yield envy
+    finally:
+        await envy.stop()
+
+
+@asynccontextmanager
+async def device(envy: EnvySimulator) -> AsyncIterator[MadVRDevice]:
+    config = MadVRDeviceConfig("127.0.0.1", envy.port, "Benchmark Envy", envy.mac_address)
+    madvr = MadVRDevice(config)
+    try:
+        yield madvr
+    finally:
+        await madvr.stop_polling()
+
+
+async def command_latency(options: dict[str, Any], iterations: int) -> dict[str, float]:
+    """Round trip of single commands on an established connection."""
+    result = {}
+    async with simulator(options) as envy, device(envy) as madvr:
+        await madvr.update()
+        for command in LATENCY_COMMANDS:
+            samples = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                reply = await madvr.send_command(command)
+                samples.append(time.perf_counter() - started)
+                if not reply.success:
+                    raise RuntimeError(f"{command} failed: {reply.error}")
+            result.update(percentiles(samples, f"command_latency.{command.split()[0]}"))
+    return result
+
+
+async def poll_cycle(options: dict[str, Any], iterations: int) -> dict[str, float]:
+    """Full refresh of every status value."""
+    async with simulator(options) as envy, device(envy) as madvr:
+        await madvr.update()
+        samples = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            await madvr.update()
+            samples.append(time.perf_counter() - started)
+        if madvr.state != PowerState.ON:
+            raise RuntimeError(f"Poll cycle ended in {madvr.state}")
+    return percentiles(samples, "poll_cycle")
+
+
+async def key_throughput(options: dict[str, Any], iterations: int) -> dict[str, float]:
+    """Key presses per second through the remote entity, one at a time and as one repeated press."""
+    async with simulator(options) as envy, device(envy) as madvr:
+        remote = MadVRRemote(madvr._config, madvr)
+        await madvr.update()
+
+        # Taps made while a stream is open are merged into it, so each tap is timed once the previous stream closed
+        streamer = remote._key_streamer
+        elapsed = 0.0
+        for _ in range(iterations):
+            await wait_for(lambda: not streamer.is_streaming)
+            started = time.perf_counter()
+            await remote.command_handler(remote, Commands.SEND_CMD, {"command": "Up"})
+            elapsed += time.perf_counter() - started
+        sequential = iterations / elapsed
+
+        # Repeats are paced by the key streamer, so this tracks KEY_STREAM_INTERVAL plus overhead
+        repeat = max(2, iterations // 10)
+        await wait_for(lambda: not streamer.is_streaming)
+        started = time.perf_counter()
+        await remote.command_handler(remote, Commands.SEND_CMD, {"command": "Down", "repeat": repeat})
+        streamed = repeat / (time.perf_counter() - started)
+        await wait_for(lambda: not streamer.is_streaming)
+
+        delivered = envy.commands[const.CMD_KEY_PRESS]
+        if delivered != iterations + repeat:
+            raise RuntimeError(f"Simulator received {delivered} of {iterations + repeat} key presses")
+
+    return {
+        "key_throughput.sequential_keys_per_second": round(sequential, 1),
+        "key_throughput.streamed_keys_per_second": round(streamed, 2),
+    }
+
+
+async def reconnect(options: dict[str, Any], iterations: int) -> dict[str, float]:
+    """Time from the Envy dropping the connection until the device is talking to it again."""
+    async with simulator(options) as envy, device(envy) as madvr:
+        await madvr.start_polling()
+        await wait_for(lambda: madvr.state == PowerState.ON and madvr.is_listening)
+
+        samples = []
+        for _ in range(iterations):
+            connections = envy.connections
+            started = time.perf_counter()
+            envy.drop_connections()
+            await wait_for(lambda: envy.connections > connections and madvr.is_connected and madvr.is_listening)
+            samples.append(time.perf_counter() - started)
+    return percentiles(samples, "reconnect")
+
+
+async def time_to_first_state(options: dict[str, Any], iterations: int) -> dict[str, float]:
+    """Time from start_polling until the device has published a power state."""
+    samples = []
+    async with simulator(options) as envy:
+        for _ in range(iterations):
+            async with device(envy) as madvr:
+                started = time.perf_counter()
+                await madvr.start_polling()
+                await wait_for(lambda: madvr.state != PowerState.UNKNOWN)
+                samples.append(time.perf_counter() - started)
+    return percentiles(samples, "time_to_first_state")
+
+
+async def driver_dispatch(options: dict[str, Any], iterations: int) -> dict[str, float]:
+    """Cost of routing device updates to entity attribute changes in the driver.
+
+    No simulator is needed, updates are fed straight into ``on_device_update``
+    for one unit whose entities are all configured.
+    """
+    loop = asyncio.get_running_loop()
+    config = MadVRDeviceConfig("127.0.0.1", const.DEFAULT_PORT, "Benchmark Envy")
+    previous_api, driver.api = driver.api, ucapi.IntegrationAPI(loop)
+    state_dir = tempfile.TemporaryDirectory()
+    unit = driver._DeviceUnit(config, loop, EventBus(loop), DeviceScheduler(loop), state_dir.name)
+    driver._units[config.identifier] = unit
+    try:
+        for entity in unit.entities:
+            driver.api.available_entities.add(entity)
+            driver.api.configured_entities.add(entity)
+        driver._build_routes()
+
+        updates = [
+            (config.identifier, {"state": PowerState.ON, "signal_info": "3840x2160 23.976p 2D 422"}),
+            (config.identifier, {"state": PowerState.STANDBY, "signal_info": "No Signal (Standby)"}),
+            (unit.sensors[1].id, {"value": 65, "state": "ON"}),
+            (unit.sensors[5].id, {"value": "2.40:1", "state": "ON"}),
+        ]
+
+        started = time.perf_counter()
+        for index in range(iterations):
+            identifier, update = updates[index % len(updates)]
+            driver.on_device_update(identifier, update)
+        driver._updates.flush()
+        elapsed = time.perf_counter() - started
+    finally:
+        driver._updates.flush()
+        driver._units.pop(config.identifier, None)
+        driver._build_routes()
+        driver.api = previous_api
+        state_dir.cleanup()
+
+    return {
+        "driver_dispatch.per_update_us": round(elapsed / iterations * 1_000_000, 3),
+        "driver_dispatch.updates_per_second": round(iterations / elapsed),
+    }
+
+
+# Name -> (scenario, default iterations), enough samples that p99 is not just the single slowest one
+SCENARIOS: dict[str, tuple[Scenario, int]] = {
+    "command_latency": (command_latency, 500),
+    "poll_cycle": (poll_cycle, 500),
+    "key_throughput": (key_throughput, 100),  # each tap first waits out KEY_STREAM_INTERVAL
+    "reconnect": (reconnect, 200),
+    "time_to_first_state": (time_to_first_state, 200),
+    "driver_dispatch": (driver_dispatch, 20000),
+}
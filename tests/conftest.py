@@ -0,0 +1,91 @@
+"""
+Shared fixtures, every test runs against an Envy listening on loopback.
+
+:copyright: (c) 2025 by Meir Miyara
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import asyncio
+from typing import Callable
+
+import pytest
+
+from uc_intg_madvr.config import MadVRDeviceConfig
+from uc_intg_madvr.device import MadVRDevice
+from uc_intg_madvr.simulator import WELCOME_BANNER, EnvySimulator
+
+
+class ScriptedEnvy:
+    """Bare Envy that answers each received command with the lines its script returns.
+
+    Unlike the simulator, replies are written exactly as scripted, which lets a
+    test interleave notifications with the replies of commands in flight.
+    """
+
+    def __init__(self, script: Callable[[str], list[str]], banner: bool = True, banner_delay: float = 0.0):
+        self.script = script
+        self.banner = banner
+        self.banner_delay = banner_delay
+        self.received: list[str] = []
+        self.port = 0
+        self._server: asyncio.Server | None = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        if self.banner:
+            await asyncio.sleep(self.banner_delay)
+            writer.write(f"{WELCOME_BANNER}\r\n".encode())
+        try:
+            while line := await reader.readline():
+                command = line.decode().strip()
+                self.received.append(command)
+                writer.write("".join(f"{reply}\r\n" for reply in self.script(command)).encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.fixture
+async def simulator():
+    envy = EnvySimulator(host="127.0.0.1", port=0)
+    await envy.start()
+    yield envy
+    await envy.stop()
+
+
+@pytest.fixture
+async def scripted():
+    servers = []
+
+    async def start(script: Callable[[str], list[str]], banner: bool = True, banner_delay: float = 0.0) -> ScriptedEnvy:
+        server = ScriptedEnvy(script, banner, banner_delay)
+        await server.start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        await server.stop()
+
+
+@pytest.fixture
+async def make_device():
+    devices = []
+
+    def create(port: int) -> MadVRDevice:
+        device = MadVRDevice(MadVRDeviceConfig("127.0.0.1", port, "Test Envy"))
+        devices.append(device)
+        return device
+
+    yield create
+    for device in devices:
+        await device.stop_polling()
@@ -0,0 +1,194 @@
+"""
+MadVRDevice tests: reply demultiplexing, command queue and shutdown.
+
+:copyright: (c) 2025 by Meir Miyara
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import asyncio
+
+from uc_intg_madvr import const
+from uc_intg_madvr.device import CommandPriority, _CommandQueue, _PendingCommand
+
+SIGNAL = "3840x2160 23.976p 2D 422 10bit HDR10 2020 TV 16:9"
+
+
+def _envy_replies(command: str) -> list[str]:
+    # Query answers are preceded by a notification no command in the tests is waiting for
+    if command == const.CMD_GET_SIGNAL_INFO:
+        return ["OK", "Temperatures 68 58 48 38", f"IncomingSignalInfo {SIGNAL}"]
+    if command == const.CMD_GET_ASPECT_RATIO:
+        return ["OK", "Temperatures 70 60 50 40", 'AspectRatio 3840:1600 2.400 240 "Panavision"']
+    if command == const.CMD_GET_MASKING_RATIO:
+        # The signal query of the same batch has been answered, so this one is a notification
+        return ["OK", "IncomingSignalInfo 1920x1080 59.940p 2D 444 8bit SDR 709 TV 16:9",
+                "MaskingRatio 3840:1600 2.400 240"]
+    if command == "KeyPress BOGUS":
+        return ['ERROR "Invalid parameter"']
+    return ["OK"]
+
+
+async def test_replies_reach_their_command_between_notifications(scripted, make_device):
+    envy = await scripted(_envy_replies)
+    device = make_device(envy.port)
+
+    results = await device.query_batch(
+        [const.CMD_GET_SIGNAL_INFO, const.CMD_GET_ASPECT_RATIO, const.CMD_GET_MASKING_RATIO]
+    )
+
+    signal = results[const.CMD_GET_SIGNAL_INFO]
+    assert signal.success and signal.message.keyword == "IncomingSignalInfo"
+    assert signal.message.resolution == "3840x2160"
+    aspect = results[const.CMD_GET_ASPECT_RATIO]
+    assert aspect.success and aspect.message.name == "Panavision"
+    masking = results[const.CMD_GET_MASKING_RATIO]
+    assert masking.success and masking.message.ratio_int == 240
+
+
+async def test_interleaved_notifications_update_state(scripted, make_device):
+    envy = await scripted(_envy_replies)
+    device = make_device(envy.port)
+
+    await device.query_batch([const.CMD_GET_SIGNAL_INFO, const.CMD_GET_ASPECT_RATIO, const.CMD_GET_MASKING_RATIO])
+
+    # Query answers are returned to the caller, only the lines nobody waited for reach the device state
+    assert device._temperatures == [70, 60, 50, 40]
+    assert device.signal_info == "1920x1080 59.940p 2D 444"
+
+
+async def test_acknowledgements_and_errors_resolve_in_order(scripted, make_device):
+    envy = await scripted(_envy_replies)
+    device = make_device(envy.port)
+
+    results = await device.query_batch(["KeyPress UP", "KeyPress BOGUS", "KeyPress DOWN"],
+                                       priority=CommandPriority.CONTROL)
+
+    assert results["KeyPress UP"].success
+    assert not results["KeyPress BOGUS"].success
+    assert results["KeyPress BOGUS"].error == "Invalid parameter"
+    assert results["KeyPress DOWN"].success
+    assert envy.received == ["KeyPress UP", "KeyPress BOGUS", "KeyPress DOWN"]
+
+
+async def test_data_line_before_acknowledgement_is_a_notification(scripted, make_device):
+    def replies(command: str) -> list[str]:
+        if command == const.CMD_GET_ASPECT_RATIO:
+            # A same-keyword notification overtakes the acknowledgement
+            return ['AspectRatio 1920:1080 1.778 178 "TV"', "OK", 'AspectRatio 3840:1600 2.400 240 "Panavision"']
+        return _envy_replies(command)
+
+    envy = await scripted(replies)
+    device = make_device(envy.port)
+
+    results = await device.query_batch([const.CMD_GET_ASPECT_RATIO, "KeyPress BOGUS"])
+
+    assert results[const.CMD_GET_ASPECT_RATIO].message.name == "Panavision"
+    assert results["KeyPress BOGUS"].error == "Invalid parameter"
+    assert device._aspect_ratio != "Unknown"
+
+
+async def test_late_reply_to_timed_out_command_is_dropped(scripted, make_device):
+    def replies(command: str) -> list[str]:
+        if command == "KeyPress UP":
+            return []
+        # The acknowledgement of KeyPress UP arrives only now, ahead of this command's error
+        return ["OK", 'ERROR "Missing parameter"']
+
+    envy = await scripted(replies)
+    device = make_device(envy.port)
+
+    timed_out = await device.query_batch(["KeyPress UP"], timeout=0.1, priority=CommandPriority.CONTROL)
+    result = await device.send_command("KeyPress")
+
+    assert timed_out["KeyPress UP"].error == "Timeout"
+    assert not result.success and result.error == "Missing parameter"
+
+
+async def test_command_waits_for_connect_started_by_polling(scripted, make_device):
+    envy = await scripted(_envy_replies, banner_delay=0.2)
+    device = make_device(envy.port)
+    poll = asyncio.create_task(device.query_batch([const.CMD_GET_SIGNAL_INFO], priority=CommandPriority.POLL))
+    await asyncio.sleep(0.05)
+
+    result = await device.send_command("KeyPress UP")
+
+    assert result.success
+    assert (await poll)[const.CMD_GET_SIGNAL_INFO].success
+
+
+async def test_commands_against_simulator(simulator, make_device):
+    device = make_device(simulator.port)
+
+    assert (await device.send_command("KeyPress MENU")).success
+    result = await device.send_command(const.CMD_GET_MAC_ADDRESS)
+
+    assert result.success and result.message.address == simulator.mac_address
+
+
+def _queued(loop, priority: CommandPriority, *commands: str) -> list[_PendingCommand]:
+    return [_PendingCommand(command, loop, priority) for command in commands]
+
+
+async def test_queue_drains_most_urgent_lane_first():
+    loop = asyncio.get_running_loop()
+    queue = _CommandQueue(max_depth=8)
+    queue.put(_queued(loop, CommandPriority.POLL, const.CMD_GET_TEMPERATURES, const.CMD_GET_ASPECT_RATIO))
+    queue.put(_queued(loop, CommandPriority.QUERY, const.CMD_GET_MAC_ADDRESS))
+    queue.put(_queued(loop, CommandPriority.CONTROL, "KeyPress UP"))
+    queue.put(_queued(loop, CommandPriority.CONTROL, "KeyPress DOWN"))
+
+    batches = [[pending.command for pending in await queue.get_batch(loop.time)] for _ in range(3)]
+
+    assert batches == [
+        ["KeyPress UP", "KeyPress DOWN"],
+        [const.CMD_GET_MAC_ADDRESS],
+        [const.CMD_GET_TEMPERATURES, const.CMD_GET_ASPECT_RATIO],
+    ]
+    assert len(queue) == 0
+
+
+async def test_full_queue_drops_oldest_polls_for_user_commands():
+    loop = asyncio.get_running_loop()
+    queue = _CommandQueue(max_depth=3)
+    polls = _queued(loop, CommandPriority.POLL, "GetA", "GetB", "GetC")
+    assert queue.put(polls)
+
+    assert queue.put(_queued(loop, CommandPriority.CONTROL, "KeyPress UP", "KeyPress DOWN"))
+    assert [pending.future.result() for pending in polls[:2]] == [_CommandQueue.QUEUE_FULL_RESULT] * 2
+    assert not polls[2].future.done()
+
+    # Polls never evict anything, and user commands cannot evict each other
+    assert not queue.put(_queued(loop, CommandPriority.POLL, "GetD"))
+    assert queue.put(_queued(loop, CommandPriority.QUERY, "GetE"))
+    assert not queue.put(_queued(loop, CommandPriority.CONTROL, "KeyPress LEFT"))
+
+    stats = queue.stats()
+    assert stats["POLL"]["rejected"] == 4
+    assert stats["CONTROL"]["rejected"] == 1
+    assert len(queue) == 3
+
+
+async def test_stop_while_connecting_resolves_command(scripted, make_device):
+    # Accepts the connection but never sends the welcome banner
+    envy = await scripted(_envy_replies, banner=False)
+    device = make_device(envy.port)
+    command = asyncio.create_task(device.send_command("KeyPress UP"))
+    await asyncio.sleep(0.1)
+
+    await device.stop_polling()
+
+    result = await asyncio.wait_for(command, 1)
+    assert not result.success and result.error == "Stopped"
+
+
+async def test_stop_while_awaiting_reply_resolves_command(scripted, make_device):
+    envy = await scripted(lambda command: [])
+    device = make_device(envy.port)
+    command = asyncio.create_task(device.send_command("KeyPress UP"))
+    while not envy.received:
+        await asyncio.sleep(0.01)
+
+    await device.stop_polling()
+
+    result = await asyncio.wait_for(command, 1)
+    assert not result.success
@@ -0,0 +1,120 @@
+"""
+Discovery tests, sweeping loopback addresses with simulators on some of them.
+
+:copyright: (c) 2025 by Meir Miyara
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import asyncio
+import ipaddress
+
+import ifaddr
+import pytest
+
+from uc_intg_madvr import discovery
+from uc_intg_madvr.discovery import DiscoveredDevice, discover, is_welcome_banner, local_networks, probe
+from uc_intg_madvr.simulator import WELCOME_BANNER, EnvySimulator
+
+
+@pytest.fixture
+async def loopback_lan():
+    """Envy simulators on 127.0.0.2 and .5, another service on .3 and a silent one on .4, all on one port."""
+    envy = EnvySimulator(host="127.0.0.2", port=0)
+    await envy.start()
+    second = EnvySimulator(host="127.0.0.5", port=envy.port)
+    await second.start()
+
+    async def other_service(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        writer.write(b"SSH-2.0-OpenSSH_9.6\r\n")
+        writer.close()
+
+    async def silent(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        await reader.read()
+        writer.close()
+
+    servers = [
+        await asyncio.start_server(other_service, "127.0.0.3", envy.port),
+        await asyncio.start_server(silent, "127.0.0.4", envy.port),
+    ]
+    yield envy.port
+    for server in servers:
+        server.close()
+    await envy.stop()
+    await second.stop()
+
+
+async def test_discover_finds_simulators_on_loopback(loopback_lan):
+    found = await discover([ipaddress.ip_network("127.0.0.0/29")], port=loopback_lan, timeout=0.3)
+
+    assert [(device.host, device.port) for device in found] == [
+        ("127.0.0.2", loopback_lan),
+        ("127.0.0.5", loopback_lan),
+    ]
+    assert all(device.banner == WELCOME_BANNER for device in found)
+    assert found[0].version == "1.1.3.0"
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+async def test_discover_limits_concurrency(loopback_lan, monkeypatch, concurrency):
+    in_flight = peak = 0
+
+    async def counting_probe(host: str, port: int, timeout: float) -> DiscoveredDevice | None:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            return await probe(host, port, timeout)
+        finally:
+            in_flight -= 1
+
+    monkeypatch.setattr(discovery, "probe", counting_probe)
+    found = await discover([ipaddress.ip_network("127.0.0.0/29")], port=loopback_lan, timeout=0.3,
+                           concurrency=concurrency)
+
+    assert [device.host for device in found] == ["127.0.0.2", "127.0.0.5"]
+    assert peak == concurrency
+
+
+async def test_probe_rejects_other_services(loopback_lan):
+    assert await probe("127.0.0.3", loopback_lan, timeout=0.3) is None
+    assert await probe("127.0.0.4", loopback_lan, timeout=0.3) is None
+    assert await probe("127.0.0.6", loopback_lan, timeout=0.3) is None
+    assert isinstance(await probe("127.0.0.2", loopback_lan, timeout=0.3), DiscoveredDevice)
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("WELCOME to Envy v1.1.3.0", True),
+    ("WELCOME to madVR Envy", True),
+    ("Welcome to Envy", False),
+    ("WELCOME to nginx", False),
+    ("WELCOME", False),
+    ("", False),
+])
+def test_is_welcome_banner(line, expected):
+    assert is_welcome_banner(line) is expected
+
+
+def test_version_needs_v_prefix():
+    assert DiscoveredDevice("127.0.0.2", 44077, "WELCOME to Envy v1.1.3.0").version == "1.1.3.0"
+    assert DiscoveredDevice("127.0.0.2", 44077, "WELCOME to Envy").version == ""
+
+
+def test_local_networks_follow_interface_netmasks(monkeypatch):
+    adapters = [
+        ifaddr.Adapter("lo", "lo", [ifaddr.IP("127.0.0.1", 8, "lo")]),
+        ifaddr.Adapter("eth0", "eth0", [
+            ifaddr.IP("192.168.1.20", 25, "eth0"),
+            ifaddr.IP(("fe80::1", 0, 2), 64, "eth0"),
+        ]),
+        ifaddr.Adapter("eth1", "eth1", [ifaddr.IP("10.20.30.40", 16, "eth1")]),
+        ifaddr.Adapter("eth2", "eth2", [ifaddr.IP("169.254.10.1", 16, "eth2")]),
+    ]
+    monkeypatch.setattr(ifaddr, "get_adapters", lambda: adapters)
+
+    networks = local_networks()
+
+    # Narrower than a /24 is kept, wider than the cap is swept around the local address only
+    assert networks == [
+        ipaddress.ip_network("192.168.1.0/25"),
+        ipaddress.ip_network("10.20.28.0/22"),
+    ]
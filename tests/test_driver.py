@@ -0,0 +1,66 @@
+"""
+Driver tests: units follow configuration changes.
+
+:copyright: (c) 2025 by Meir Miyara
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import asyncio
+
+import pytest
+import ucapi
+
+from uc_intg_madvr import driver
+from uc_intg_madvr.config import MadVRConfig
+
+
+@pytest.fixture
+async def configured_driver(tmp_path, monkeypatch):
+    monkeypatch.setattr(driver, "api", ucapi.IntegrationAPI(asyncio.get_running_loop()))
+    monkeypatch.setattr(driver, "_config", MadVRConfig(str(tmp_path)))
+    monkeypatch.setattr(driver, "_units", {})
+    monkeypatch.setattr(driver, "_entity_units", {})
+    monkeypatch.setattr(driver, "_events", None)
+    monkeypatch.setattr(driver, "_scheduler", None)
+    yield driver
+    for identifier in list(driver._units):
+        await driver._remove_unit(identifier)
+    await driver._config.flush()
+
+
+def _subscribe(api: ucapi.IntegrationAPI, entity_ids: list[str]):
+    for entity_id in entity_ids:
+        api.configured_entities.add(api.available_entities.get(entity_id))
+
+
+async def test_changed_unit_keeps_subscriptions(configured_driver, simulator):
+    api = configured_driver.api
+    configured_driver._config.add_device("127.0.0.1", simulator.port, "Envy")
+    assert await configured_driver._initialize_entities()
+    unit = configured_driver._units["127_0_0_1"]
+    subscribed = [unit.media_player.id, unit.remote.id]
+    _subscribe(api, subscribed)
+    configured_driver._build_routes()
+
+    configured_driver._config.add_device("127.0.0.1", simulator.port, "Living Room Envy")
+    assert await configured_driver._initialize_entities()
+
+    replaced = configured_driver._units["127_0_0_1"]
+    assert replaced is not unit
+    assert api.configured_entities.get(unit.media_player.id) is replaced.media_player
+    assert api.configured_entities.get(unit.remote.id) is replaced.remote
+    assert not api.configured_entities.contains(replaced.select.id)
+    assert configured_driver._routes[replaced.device.identifier]
+
+
+async def test_unchanged_unit_keeps_running_device(configured_driver, simulator):
+    configured_driver._config.add_device("127.0.0.1", simulator.port, "Envy")
+    assert await configured_driver._initialize_entities()
+    unit = configured_driver._units["127_0_0_1"]
+
+    settings = configured_driver._config.add_device("127.0.0.1", simulator.port, "Envy", "01-02-03-04-05-06")
+    assert await configured_driver._initialize_entities()
+
+    assert configured_driver._units["127_0_0_1"] is unit
+    assert unit.config is settings
+    assert unit.device._config.mac_address == "01-02-03-04-05-06"
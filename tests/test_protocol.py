@@ -0,0 +1,81 @@
+"""
+Protocol decoding tests.
+
+:copyright: (c) 2025 by Meir Miyara
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import pytest
+
+from uc_intg_madvr.protocol import (
+    OK,
+    AspectRatio,
+    Error,
+    IncomingSignal,
+    Message,
+    NoSignal,
+    Temperatures,
+    parse_line,
+)
+
+
+@pytest.mark.parametrize("line", [b"", b"\r\n", b"   \r\n"])
+def test_blank_lines_are_skipped(line):
+    assert parse_line(line) is None
+
+
+def test_ok_is_shared_instance():
+    assert parse_line(b"OK\r\n") is OK
+
+
+def test_known_lines_are_decoded():
+    signal = parse_line(b"IncomingSignalInfo 3840x2160 23.976p 2D 422 10bit HDR10 2020 TV 16:9\r\n")
+    assert isinstance(signal, IncomingSignal)
+    assert signal.summary == "3840x2160 23.976p 2D 422"
+    assert signal.aspect == "16:9"
+
+    aspect = parse_line(b'AspectRatio 3840:1600 2.400 240 "Panavision"\r\n')
+    assert isinstance(aspect, AspectRatio)
+    assert (aspect.ratio, aspect.ratio_int, aspect.name) == (2.4, 240, "Panavision")
+
+    assert isinstance(parse_line(b"NoSignal\r\n"), NoSignal)
+    temperatures = parse_line(b"Temperatures 65 58 42 45\r\n")
+    assert isinstance(temperatures, Temperatures)
+    assert temperatures.values == (65, 58, 42, 45)
+
+
+def test_error_reason_is_unquoted():
+    error = parse_line(b'ERROR "Unknown command"\r\n')
+    assert isinstance(error, Error)
+    assert error.message == "Unknown command"
+
+
+@pytest.mark.parametrize("line, keyword", [
+    (b"Temperatures 65 hot 42 45\r\n", "Temperatures"),
+    (b"Temperatures 65\r\n", "Temperatures"),
+    (b"AspectRatio 3840:1600\r\n", "AspectRatio"),
+    (b"AspectRatio 3840:1600 wide 240\r\n", "AspectRatio"),
+    (b"MaskingRatio\r\n", "MaskingRatio"),
+    (b"MacAddress\r\n", "MacAddress"),
+])
+def test_malformed_fields_fall_back_to_plain_message(line, keyword):
+    message = parse_line(line)
+    assert type(message) is Message
+    assert message.keyword == keyword
+    assert message.line == line.decode().strip()
+
+
+def test_short_signal_info_is_padded():
+    signal = parse_line(b"IncomingSignalInfo 1920x1080\r\n")
+    assert isinstance(signal, IncomingSignal)
+    assert signal.frame_rate == ""
+    assert signal.summary == "1920x1080"
+
+
+def test_unknown_and_undecodable_lines():
+    assert parse_line(b"PowerOff\r\n").keyword == "PowerOff"
+
+    message = parse_line(b"Custom\xff \xfevalue\r\n")
+    assert type(message) is Message
+    assert message.keyword == "Custom\ufffd"
+    assert message.text == "\ufffdvalue"
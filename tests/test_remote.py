@@ -0,0 +1,90 @@
+"""
+Remote entity tests: key press streaming.
+
+:copyright: (c) 2025 by Meir Miyara
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import asyncio
+
+from uc_intg_madvr import const
+from uc_intg_madvr.protocol import RESULT_OK, CommandResult
+from uc_intg_madvr.remote import _KeyStreamer
+
+
+class SlowDevice:
+    """Stands in for MadVRDevice, records when each command is sent and answers after a delay."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.sent: list[tuple[float, str]] = []
+
+    async def send_command(self, command: str) -> CommandResult:
+        self.sent.append((asyncio.get_running_loop().time(), command))
+        await asyncio.sleep(self.latency)
+        return RESULT_OK
+
+
+async def _tap(streamer: _KeyStreamer, command: str, taps: int, gap: float) -> list[CommandResult]:
+    presses = []
+    for _ in range(taps):
+        presses.append(asyncio.create_task(streamer.press(command)))
+        await asyncio.sleep(gap)
+    return await asyncio.gather(*presses)
+
+
+async def _stream_closed(streamer: _KeyStreamer):
+    while streamer.is_streaming:
+        await asyncio.sleep(0.01)
+
+
+async def test_taps_are_paced_and_coalesced():
+    device = SlowDevice(latency=0.3)
+    streamer = _KeyStreamer(device)
+
+    results = await _tap(streamer, "KeyPress UP", taps=10, gap=0.01)
+    await _stream_closed(streamer)
+
+    assert all(result.success for result in results)
+    assert 1 < len(device.sent) <= 1 + const.KEY_BACKLOG_MAX
+    times = [sent_at for sent_at, _ in device.sent]
+    assert all(later - earlier >= const.KEY_STREAM_INTERVAL * 0.9 for earlier, later in zip(times, times[1:]))
+
+
+async def test_other_key_replaces_queued_presses():
+    device = SlowDevice(latency=0.05)
+    streamer = _KeyStreamer(device)
+
+    ups = asyncio.create_task(_tap(streamer, "KeyPress UP", taps=4, gap=0))
+    await asyncio.sleep(const.KEY_STREAM_INTERVAL / 2)
+    await streamer.press("KeyPress DOWN")
+    await ups
+    await _stream_closed(streamer)
+
+    assert [command for _, command in device.sent] == ["KeyPress UP", "KeyPress DOWN"]
+
+
+async def test_press_returns_before_stream_closes():
+    device = SlowDevice(latency=0.01)
+    streamer = _KeyStreamer(device)
+
+    started = asyncio.get_running_loop().time()
+    assert (await streamer.press("KeyPress UP")).success
+
+    assert asyncio.get_running_loop().time() - started < const.KEY_STREAM_INTERVAL
+    assert streamer.is_streaming
+    await _stream_closed(streamer)
+
+
+async def test_awaited_taps_are_paced():
+    device = SlowDevice(latency=0.01)
+    streamer = _KeyStreamer(device)
+
+    await streamer.press("KeyPress UP")
+    await streamer.press("KeyPress UP")
+    await _stream_closed(streamer)
+    await streamer.press("KeyPress UP")
+
+    (first, _), (second, _), (third, _) = device.sent
+    assert second - first >= const.KEY_STREAM_INTERVAL * 0.9
+    assert third - second >= const.KEY_STREAM_INTERVAL * 0.9
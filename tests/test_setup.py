@@ -0,0 +1,44 @@
+"""
+Setup flow tests.
+
+:copyright: (c) 2025 by Meir Miyara
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import pytest
+from ucapi import SetupComplete
+from ucapi.api_definitions import UserDataResponse
+
+from uc_intg_madvr.config import MadVRConfig
+from uc_intg_madvr.setup import MadVRSetup
+
+
+@pytest.fixture
+def setup_flow(tmp_path):
+    return MadVRSetup(None, MadVRConfig(str(tmp_path)), None)
+
+
+async def test_typed_address_wins_over_discovered_unit(setup_flow, simulator):
+    action = await setup_flow.handle_setup(UserDataResponse({
+        "discovered": "192.0.2.10:44077",
+        "host": " 127.0.0.1 ",
+        "port": str(simulator.port),
+        "name": "Envy",
+    }))
+
+    assert isinstance(action, SetupComplete)
+    assert [(device.host, device.port) for device in setup_flow._config.devices] == [("127.0.0.1", simulator.port)]
+
+
+async def test_discovered_unit_used_without_typed_address(setup_flow, simulator):
+    action = await setup_flow.handle_setup(UserDataResponse({
+        "discovered": f"127.0.0.1:{simulator.port}",
+        "host": "",
+        "port": "44077",
+        "name": "Envy",
+    }))
+
+    assert isinstance(action, SetupComplete)
+    device = setup_flow._config.devices[0]
+    assert (device.host, device.port) == ("127.0.0.1", simulator.port)
+    assert device.mac_address == simulator.mac_address
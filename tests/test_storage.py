@@ -0,0 +1,125 @@
+"""
+Write-behind storage tests.
+
+:copyright: (c) 2025 by Meir Miyara
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from uc_intg_madvr import storage
+from uc_intg_madvr.storage import WriteBehindFile, file_signature, read_if_changed, write_atomic
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    """Content of every file write, in order."""
+    written = []
+
+    def counting_write(path: str, data: bytes):
+        written.append(data)
+        return write_atomic(path, data)
+
+    monkeypatch.setattr(storage, "write_atomic", counting_write)
+    return written
+
+
+def test_write_atomic_replaces_file(tmp_path):
+    path = str(tmp_path / "sub" / "config.json")
+    write_atomic(path, b"old")
+
+    signature = write_atomic(path, b"new content")
+
+    with open(path, "rb") as f:
+        assert f.read() == b"new content"
+    assert signature == file_signature(path)
+    assert signature[1] == len(b"new content")
+    assert os.listdir(tmp_path / "sub") == ["config.json"]
+
+
+def test_failed_write_keeps_previous_content(tmp_path, monkeypatch):
+    path = str(tmp_path / "config.json")
+    write_atomic(path, b"previous")
+
+    def failing_fsync(fd):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "fsync", failing_fsync)
+    with pytest.raises(OSError):
+        write_atomic(path, b"truncat")
+
+    with open(path, "rb") as f:
+        assert f.read() == b"previous"
+
+
+def test_read_if_changed(tmp_path):
+    path = str(tmp_path / "config.json")
+    assert read_if_changed(path) == (None, None)
+
+    signature = write_atomic(path, b"content")
+    assert read_if_changed(path) == (signature, b"content")
+    assert read_if_changed(path, signature) == (signature, None)
+
+
+async def test_burst_is_coalesced_into_one_write(tmp_path, writes):
+    file = WriteBehindFile(str(tmp_path / "state.json"), delay=0.05)
+    encodes = []
+
+    for value in range(10):
+        file.schedule(lambda value=value: encodes.append(value) or f"state {value}".encode())
+    assert file.pending
+    await asyncio.sleep(0.1)
+    await file.flush()
+
+    # Only the last scheduled encoder runs
+    assert encodes == [9]
+    assert writes == [b"state 9"]
+    assert not file.pending
+    assert file.signature == file_signature(file.path)
+
+
+async def test_unchanged_content_is_not_rewritten(tmp_path, writes):
+    path = str(tmp_path / "state.json")
+    write_atomic(path, b"loaded")
+    file = WriteBehindFile(path, delay=10)
+    signature, data = read_if_changed(path)
+    file.loaded(data, signature)
+
+    file.schedule(lambda: b"loaded")
+    await file.flush()
+    file.schedule(lambda: b"changed")
+    await file.flush()
+    file.schedule(lambda: b"changed")
+    await file.flush()
+
+    assert writes == [b"changed"]
+
+
+async def test_flushed_writes_land_in_order(tmp_path, writes):
+    file = WriteBehindFile(str(tmp_path / "state.json"), delay=0)
+
+    # Each change starts its own write while the previous one may still be running
+    for value in range(5):
+        file.schedule(lambda value=value: f"state {value}".encode())
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+    await file.flush()
+
+    assert len(writes) > 1
+    assert writes == sorted(writes)
+    assert writes[-1] == b"state 4"
+    with open(file.path, "rb") as f:
+        assert f.read() == b"state 4"
+
+
+async def test_remove_flushes_then_deletes(tmp_path, writes):
+    file = WriteBehindFile(str(tmp_path / "state.json"), delay=10)
+    file.schedule(lambda: b"state")
+
+    assert await file.remove()
+    assert writes == [b"state"]
+    assert not os.path.exists(file.path)
+    assert await file.remove()
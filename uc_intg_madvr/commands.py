@@ -0,0 +1,121 @@
+"""
+madVR Envy command registry.
+
+Every command the entities can send is built once, at import, together with
+its encoded wire frame. Entities look commands up here instead of formatting
+protocol strings per button press, and the device writes the shared frames.
+
+:copyright: (c) 2025 by Meir Miyara
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from types import MappingProxyType
+from typing import Mapping
+
+from uc_intg_madvr import const
+
+
+def _key(key: str) -> str:
+    return f"{const.CMD_KEY_PRESS} {key}"
+
+
+def _menu(menu: str) -> str:
+    return f"{const.CMD_OPEN_MENU} {menu}"
+
+
+def _toggle(setting: str) -> str:
+    return f"{const.CMD_TOGGLE} {setting}"
+
+
+def _aspect_ratio_mode(mode: str) -> str:
+    return f"{const.CMD_SET_ASPECT_RATIO_MODE} {mode}"
+
+
+# Aspect ratio select option -> command, in the order the options are offered
+ASPECT_RATIO_MODES: Mapping[str, str] = MappingProxyType({
+    mode: _aspect_ratio_mode(mode) for mode in (
+        const.AR_AUTO, const.AR_HOLD, const.AR_4_3, const.AR_16_9, const.AR_1_85,
+        const.AR_2_00, const.AR_2_35, const.AR_2_40, const.AR_2_55, const.AR_2_76,
+    )
+})
+
+# Simple command name -> command, offered for custom button mappings on the remote entity
+SIMPLE_COMMANDS: Mapping[str, str] = MappingProxyType({
+    # Power commands
+    "Standby": const.CMD_STANDBY,
+    "Power Off": const.CMD_POWER_OFF,
+    "Restart": const.CMD_RESTART,
+    "Reload Software": const.CMD_RELOAD_SOFTWARE,
+
+    # Menu commands
+    "Open Info Menu": _menu(const.MENU_INFO),
+    "Open Settings Menu": _menu(const.MENU_SETTINGS),
+    "Open Configuration Menu": _menu(const.MENU_CONFIGURATION),
+    "Open Profiles Menu": _menu(const.MENU_PROFILES),
+    "Open Test Patterns Menu": _menu(const.MENU_TEST_PATTERNS),
+    "Close Menu": const.CMD_CLOSE_MENU,
+
+    # Navigation keys
+    "Up": _key(const.KEY_UP),
+    "Down": _key(const.KEY_DOWN),
+    "Left": _key(const.KEY_LEFT),
+    "Right": _key(const.KEY_RIGHT),
+    "OK": _key(const.KEY_OK),
+    "Back": _key(const.KEY_BACK),
+
+    # Color keys
+    "Red": _key(const.KEY_RED),
+    "Green": _key(const.KEY_GREEN),
+    "Blue": _key(const.KEY_BLUE),
+    "Yellow": _key(const.KEY_YELLOW),
+    "Magenta": _key(const.KEY_MAGENTA),
+    "Cyan": _key(const.KEY_CYAN),
+
+    # Aspect ratio presets
+    **{f"Aspect {mode}": command for mode, command in ASPECT_RATIO_MODES.items()},
+
+    # Picture settings toggles
+    "Toggle Tone Map": _toggle(const.TOGGLE_TONE_MAP),
+    "Tone Map On": const.CMD_TONE_MAP_ON,
+    "Tone Map Off": const.CMD_TONE_MAP_OFF,
+    "Toggle Highlight Recovery": _toggle(const.TOGGLE_HIGHLIGHT_RECOVERY),
+    "Toggle Shadow Recovery": _toggle(const.TOGGLE_SHADOW_RECOVERY),
+    "Toggle Contrast Recovery": _toggle(const.TOGGLE_CONTRAST_RECOVERY),
+    "Toggle 3DLUT": _toggle(const.TOGGLE_3DLUT),
+    "Toggle Histogram": _toggle(const.TOGGLE_HISTOGRAM),
+    "Toggle Debug OSD": _toggle(const.TOGGLE_DEBUG_OSD),
+
+    # Info commands
+    "Get Signal Info": const.CMD_GET_SIGNAL_INFO,
+    "Get Aspect Ratio": const.CMD_GET_ASPECT_RATIO,
+    "Get Temperatures": const.CMD_GET_TEMPERATURES,
+    "Get MAC Address": const.CMD_GET_MAC_ADDRESS,
+    "Get Masking Ratio": const.CMD_GET_MASKING_RATIO,
+
+    # Utility commands
+    "Force 1080p60": const.CMD_FORCE_1080P60,
+    "Hotplug": const.CMD_HOTPLUG,
+    "Refresh License": const.CMD_REFRESH_LICENSE,
+})
+
+# KeyPress command -> the KeyHold command sent for a long press of the same key
+HOLD_COMMANDS: Mapping[str, str] = MappingProxyType({
+    command: command.replace(const.CMD_KEY_PRESS, const.CMD_KEY_HOLD, 1)
+    for command in SIMPLE_COMMANDS.values() if command.startswith(const.CMD_KEY_PRESS)
+})
+
+# Wire frame of every known command, including the ones only sent by polling
+FRAMES: Mapping[str, bytes] = MappingProxyType({
+    command: f"{command}\r\n".encode() for command in (
+        *SIMPLE_COMMANDS.values(),
+        *HOLD_COMMANDS.values(),
+        *const.RESPONSE_KEYWORDS,
+        const.CMD_HEARTBEAT,
+    )
+})
+
+
+def frame(command: str) -> bytes:
+    """Wire frame of a command, shared for registered commands and encoded on the fly otherwise."""
+    data = FRAMES.get(command)
+    return data if data is not None else f"{command}\r\n".encode()
@@ -5,109 +5,180 @@ Configuration management for madVR Envy integration.
 :license: MPL-2.0, see LICENSE for more details.
 """
 
+import asyncio
 import json
 import logging
 import os
 from typing import Any
 
 from uc_intg_madvr import const
+from uc_intg_madvr.storage import WriteBehindFile, read_if_changed
 
 _LOG = logging.getLogger(__name__)
 
 
+class MadVRDeviceConfig:
+    """Settings of one madVR Envy unit."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int = None,
+        name: str = None,
+        mac_address: str | None = None,
+        store: "MadVRConfig | None" = None,
+    ):
+        """Initialize device settings.
+
+        Args:
+            host: IP address or hostname of the Envy
+            port: IP control port
+            name: Display name
+            mac_address: MAC address used for Wake-on-LAN
+            store: Configuration the settings are saved in, None for a throwaway config
+        """
+        self.host = host
+        self.port = port if port is not None else const.DEFAULT_PORT
+        self.name = name if name else "madVR Envy"
+        self.mac_address = mac_address
+        self._store = store
+
+    @property
+    def identifier(self) -> str:
+        """Stable identifier used in entity ids."""
+        return self.host.replace('.', '_')
+
+    def set_mac_address(self, mac_address: str) -> None:
+        """Store MAC address."""
+        self.mac_address = mac_address
+        if self._store:
+            self._store.update_mac_address(self.identifier, mac_address)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "host": self.host,
+            "port": self.port,
+            "name": self.name,
+            "mac_address": self.mac_address,
+        }
+
+
 class MadVRConfig:
-    """Configuration manager for madVR Envy integration."""
+    """Configuration manager for madVR Envy integration, holds every configured unit."""
 
     def __init__(self, config_dir: str = None):
-        """Initialize configuration manager."""
+        """Initialize configuration manager, call load() to read the configuration file."""
         if config_dir is None:
             config_dir = os.getenv("UC_CONFIG_HOME") or os.getenv("HOME") or "./"
         
         self._config_dir = config_dir
         self._config_file = os.path.join(config_dir, "madvr_config.json")
-        self._config: dict[str, Any] = {}
-        self._load_config()
+        self._devices: dict[str, MadVRDeviceConfig] = {}
+        self._file = WriteBehindFile(self._config_file, const.CONFIG_SAVE_DELAY)
+
+    @property
+    def config_dir(self) -> str:
+        return self._config_dir
 
-    def _load_config(self) -> None:
-        """Load configuration from disk."""
+    async def load(self) -> None:
+        """Load configuration from disk, unless the file did not change since it was last read or written."""
+        # Changes not written yet would otherwise be lost, or overwrite what is read
+        await self._file.flush()
         try:
-            if os.path.exists(self._config_file):
-                with open(self._config_file, "r", encoding="utf-8") as f:
-                    self._config = json.load(f)
-                _LOG.info("Configuration loaded from %s", self._config_file)
-            else:
+            loop = asyncio.get_running_loop()
+            signature, data = await loop.run_in_executor(None, read_if_changed, self._config_file, self._file.signature)
+            if signature is None:
                 _LOG.info("No configuration file found, using defaults")
-                self._config = {}
+                self._devices = {}
+            elif data is None:
+                _LOG.debug("Configuration file unchanged, keeping %d devices", len(self._devices))
+                return
+            else:
+                self._devices = self._parse_devices(json.loads(data))
+                _LOG.info("Configuration loaded from %s (%d devices)", self._config_file, len(self._devices))
+            self._file.loaded(data, signature)
         except Exception as e:
             _LOG.error("Failed to load configuration: %s", e)
-            self._config = {}
-
-    def reload_from_disk(self) -> None:
+            self._devices = {}
+            self._file.loaded(None, None)
+
+    def _parse_devices(self, data: dict[str, Any]) -> dict[str, MadVRDeviceConfig]:
+        # Single-device configurations stored the device settings at the top level
+        entries = data.get("devices", [data] if data.get("host") else [])
+
+        devices = {}
+        for entry in entries:
+            if not entry.get("host"):
+                continue
+            device = MadVRDeviceConfig(
+                entry["host"], entry.get("port"), entry.get("name"), entry.get("mac_address"), store=self
+            )
+            devices[device.identifier] = device
+        return devices
+
+    async def reload_from_disk(self) -> None:
         """Reload configuration from disk (critical for reboot survival)."""
         _LOG.info("Reloading configuration from disk")
-        self._load_config()
-
-    def _save_config(self) -> None:
-        """Save configuration to disk."""
-        try:
-            os.makedirs(self._config_dir, exist_ok=True)
-            with open(self._config_file, "w", encoding="utf-8") as f:
-                json.dump(self._config, f, indent=2)
-            _LOG.info("Configuration saved to %s", self._config_file)
-        except Exception as e:
-            _LOG.error("Failed to save configuration: %s", e)
+        await self.load()
 
-    def is_configured(self) -> bool:
-        """Check if integration is configured."""
-        return bool(self._config.get("host"))
-
-    def set_config(self, host: str, port: int = None, name: str = None) -> None:
-        """Set and save configuration."""
-        if port is None:
-            port = const.DEFAULT_PORT
-        if name is None:
-            name = "madVR Envy"
-            
-        self._config = {
-            "host": host,
-            "port": port,
-            "name": name,
-            "mac_address": self._config.get("mac_address")
-        }
-        self._save_config()
-        _LOG.info("Configuration updated: %s:%d", host, port)
+    def save(self) -> None:
+        """Save configuration to disk, changes made within CONFIG_SAVE_DELAY are written together."""
+        self._file.schedule(self._encode)
 
-    @property
-    def host(self) -> str | None:
-        """Get configured host."""
-        return self._config.get("host")
+    async def flush(self) -> None:
+        """Write unsaved changes now."""
+        await self._file.flush()
 
-    @property
-    def port(self) -> int:
-        """Get configured port."""
-        return self._config.get("port", const.DEFAULT_PORT)
+    def _encode(self) -> bytes:
+        data = {"devices": [device.to_dict() for device in self._devices.values()]}
+        return json.dumps(data, indent=2).encode("utf-8")
 
-    @property
-    def name(self) -> str:
-        """Get device name."""
-        return self._config.get("name", "madVR Envy")
+    def is_configured(self) -> bool:
+        """Check if integration is configured."""
+        return bool(self._devices)
 
     @property
-    def mac_address(self) -> str | None:
-        """Get stored MAC address."""
-        return self._config.get("mac_address")
-
-    def set_mac_address(self, mac_address: str) -> None:
-        """Store MAC address."""
-        self._config["mac_address"] = mac_address
-        self._save_config()
-
-    def clear(self) -> None:
+    def devices(self) -> list[MadVRDeviceConfig]:
+        """All configured units."""
+        return list(self._devices.values())
+
+    def get_device(self, identifier: str) -> MadVRDeviceConfig | None:
+        return self._devices.get(identifier)
+
+    def add_device(
+        self, host: str, port: int = None, name: str = None, mac_address: str | None = None
+    ) -> MadVRDeviceConfig:
+        """Add a unit, or replace the settings of the unit with the same host, and save."""
+        previous = self._devices.get(host.replace('.', '_'))
+        if mac_address is None and previous:
+            mac_address = previous.mac_address
+
+        device = MadVRDeviceConfig(host, port, name, mac_address, store=self)
+        self._devices[device.identifier] = device
+        self.save()
+        _LOG.info("Device %s: %s:%d", "updated" if previous else "added", device.host, device.port)
+        return device
+
+    def update_mac_address(self, identifier: str, mac_address: str) -> None:
+        """Store the MAC address of a unit and save."""
+        # Looked up by identifier, running devices may hold settings from before a reload
+        device = self._devices.get(identifier)
+        if device is None:
+            return
+        device.mac_address = mac_address
+        self.save()
+
+    def remove_device(self, identifier: str) -> bool:
+        """Remove a unit and save, returns False if it was not configured."""
+        device = self._devices.pop(identifier, None)
+        if device is None:
+            return False
+        self.save()
+        _LOG.info("Device removed: %s:%d", device.host, device.port)
+        return True
+
+    async def clear(self) -> None:
         """Clear configuration."""
-        self._config = {}
-        if os.path.exists(self._config_file):
-            try:
-                os.remove(self._config_file)
-                _LOG.info("Configuration file removed")
-            except Exception as e:
-                _LOG.error("Failed to remove configuration file: %s", e)
\ No newline at end of file
+        self._devices = {}
+        if await self._file.remove():
+            _LOG.info("Configuration file removed")
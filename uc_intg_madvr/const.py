@@ -7,12 +7,61 @@ Constants for madVR Envy integration.
 
 DEFAULT_PORT = 44077
 CONNECTION_TIMEOUT = 10.0
+PROBE_CONNECT_TIMEOUT = 3.0
+CIRCUIT_FAILURE_THRESHOLD = 1
+RECONNECT_BACKOFF_INITIAL = 1.0
+RECONNECT_BACKOFF_MAX = 60.0
+RECONNECT_BACKOFF_JITTER = 0.2
 COMMAND_TIMEOUT = 5.0
+# Upper bound on queueing plus connecting (CONNECTION_TIMEOUT and the banner read) before a command is written
+COMMAND_SEND_TIMEOUT = 30.0
+MAX_CONSECUTIVE_TIMEOUTS = 3
+COMMAND_QUEUE_MAX_DEPTH = 32
 HEARTBEAT_INTERVAL = 20.0
+KEEPALIVE_TIMEOUT = 3.0
 
 POLL_INTERVAL = 10.0
+PUSH_POLL_INTERVAL = 60.0
+SIGNAL_FAST_POLL_INTERVAL = 2.0
+SIGNAL_FAST_POLL_WINDOW = 30.0
+MASKING_POLL_INTERVAL = 30.0
+TEMPERATURE_POLL_INTERVAL = 180.0
+OFF_POLL_MAX_INTERVAL = 120.0
+
+SCHEDULER_MAX_CONCURRENCY = 4
+SCHEDULER_JITTER = 0.1
+SCHEDULER_START_STAGGER = 0.5
+SCHEDULER_START_SPREAD = 10.0
+
+UPDATE_FLUSH_WINDOW = 0.02
+SNAPSHOT_WRITE_DELAY = 10.0
+CONFIG_SAVE_DELAY = 1.0
+
+DISCOVERY_CONCURRENCY = 64
+DISCOVERY_PROBE_TIMEOUT = 1.0
+DISCOVERY_MIN_PREFIX_LENGTH = 22  # caps a sweep at 1024 addresses
+
+METRICS_PORT_ENV = "UC_MADVR_METRICS_PORT"
+METRICS_HOST = "127.0.0.1"
+
+TRACE_ENV = "UC_MADVR_TRACE"
+TRACE_SLOW_MS_ENV = "UC_MADVR_TRACE_SLOW_MS"
+TRACE_BUFFER_SIZE = 512
+TRACE_DUMP_INTERVAL = 60.0
+
+WOL_PORT = 9
+WOL_BROADCAST_PREFIX = 24  # assumed prefix of a routed device network, local ones use the interface netmask
+WOL_BURST_COUNT = 3
+WOL_BURST_INTERVAL = 0.1
+WOL_RESEND_INTERVAL = 10.0
+WOL_PROBE_INTERVAL = 1.0
+WOL_PROBE_TIMEOUT = 1.0
+WOL_READY_TIMEOUT = 45.0
 
 COMMAND_DELAY = 0.5
+KEY_STREAM_INTERVAL = 0.1
+KEY_BACKLOG_MAX = 3
+KEY_HOLD_THRESHOLD = 500
 POWER_COMMAND_DELAY = 2.0
 
 CMD_POWER_OFF = "PowerOff"
@@ -95,4 +144,19 @@ CMD_REFRESH_LICENSE = "RefreshLicenseInfo"
 
 RESPONSE_OK = "OK"
 RESPONSE_ERROR = "ERROR"
-NO_SIGNAL = "NoSignal"
\ No newline at end of file
+NO_SIGNAL = "NoSignal"
+
+NOTIFY_INCOMING_SIGNAL = "IncomingSignalInfo"
+NOTIFY_ASPECT_RATIO = "AspectRatio"
+NOTIFY_MASKING_RATIO = "MaskingRatio"
+NOTIFY_TEMPERATURES = "Temperatures"
+NOTIFY_MAC_ADDRESS = "MacAddress"
+
+# Response keywords answering each query; any other command completes on OK/ERROR
+RESPONSE_KEYWORDS = {
+    CMD_GET_SIGNAL_INFO: (NOTIFY_INCOMING_SIGNAL, NO_SIGNAL),
+    CMD_GET_ASPECT_RATIO: (NOTIFY_ASPECT_RATIO,),
+    CMD_GET_MASKING_RATIO: (NOTIFY_MASKING_RATIO,),
+    CMD_GET_TEMPERATURES: (NOTIFY_TEMPERATURES,),
+    CMD_GET_MAC_ADDRESS: (NOTIFY_MAC_ADDRESS,),
+}
@@ -6,22 +6,128 @@ madVR Envy device handler.
 """
 
 import asyncio
+import heapq
+import inspect
+import ipaddress
 import logging
+import random
 import socket
+from collections import deque
+from typing import Any, Awaitable, Callable
 from enum import IntEnum, StrEnum
 from asyncio import AbstractEventLoop
-from pyee.asyncio import AsyncIOEventEmitter
 
-from uc_intg_madvr.config import MadVRConfig
+from uc_intg_madvr.commands import frame
+from uc_intg_madvr.config import MadVRDeviceConfig
+from uc_intg_madvr.discovery import interface_addresses
+from uc_intg_madvr.metrics import DeviceMetrics
+from uc_intg_madvr.snapshot import StateSnapshot
+from uc_intg_madvr.trace import TRACER, CommandTrace
 from uc_intg_madvr import const
+from uc_intg_madvr.protocol import (
+    OK, AspectRatio, CommandResult, Error, IncomingSignal, MacAddress, MaskingRatio, Message, NoSignal,
+    RESULT_OK, Temperatures, parse_line,
+)
 
 _LOG = logging.getLogger(__name__)
 
+_UNSET = object()
+
+
+def _interface_network(host: str) -> ipaddress.IPv4Network | None:
+    """Network of the local interface the host is on, None if it is on none of them.
+
+    Blocking, reads the interface list from the OS.
+    """
+    try:
+        address = ipaddress.IPv4Address(host)
+    except ValueError:
+        return None
+    for interface in interface_addresses():
+        if address in interface.network:
+            return interface.network
+    return None
+
 
 class EVENTS(IntEnum):
     UPDATE = 1
 
 
+class EventBus:
+    """Device event bus with optional per-topic subscriptions.
+
+    Plain function listeners are called directly when an event is emitted.
+    Coroutine listeners are queued and delivered in order by one task per
+    flush, so a burst of events costs a single task rather than one each.
+    """
+
+    def __init__(self, loop: AbstractEventLoop):
+        self._loop = loop
+        self._listeners: dict[tuple[EVENTS, str | None], list[tuple[Callable, bool]]] = {}
+        self._backlog: list[tuple[Callable, tuple, float]] = []
+        self._flush_task: asyncio.Task | None = None
+        self._stats = {"emitted": 0, "delivered": 0, "total_latency": 0.0, "max_latency": 0.0}
+
+    def on(self, event: EVENTS, listener: Callable, topic: str | None = None):
+        """Subscribe to an event.
+
+        Args:
+            event: Event type
+            listener: Function or coroutine function called with the event arguments
+            topic: Only deliver events for this identifier, all identifiers if None
+        """
+        entry = (listener, inspect.iscoroutinefunction(listener))
+        self._listeners.setdefault((event, topic), []).append(entry)
+
+    def remove_listener(self, event: EVENTS, listener: Callable, topic: str | None = None):
+        listeners = self._listeners.get((event, topic), [])
+        self._listeners[(event, topic)] = [entry for entry in listeners if entry[0] != listener]
+
+    def emit(self, event: EVENTS, identifier: str, *args):
+        self._stats["emitted"] += 1
+        for key in ((event, identifier), (event, None)):
+            for listener, is_async in self._listeners.get(key, ()):
+                if is_async:
+                    self._queue(listener, (identifier, *args))
+                    continue
+                try:
+                    listener(identifier, *args)
+                except Exception as e:
+                    _LOG.error(f"Event listener {listener.__name__} failed: {e}", exc_info=True)
+                self._record_delivery(0.0)
+
+    def stats(self) -> dict[str, float]:
+        """Emitted and delivered counts, and the emit-to-deliver latency of queued deliveries."""
+        delivered = self._stats["delivered"]
+        return {
+            "emitted": self._stats["emitted"],
+            "delivered": delivered,
+            "pending": len(self._backlog),
+            "avg_latency_ms": round(self._stats["total_latency"] / delivered * 1000, 3) if delivered else 0.0,
+            "max_latency_ms": round(self._stats["max_latency"] * 1000, 3),
+        }
+
+    def _queue(self, listener: Callable, args: tuple):
+        self._backlog.append((listener, args, self._loop.time()))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = self._loop.create_task(self._flush())
+
+    async def _flush(self):
+        while self._backlog:
+            backlog, self._backlog = self._backlog, []
+            for listener, args, emitted_at in backlog:
+                self._record_delivery(self._loop.time() - emitted_at)
+                try:
+                    await listener(*args)
+                except Exception as e:
+                    _LOG.error(f"Event listener {listener.__name__} failed: {e}", exc_info=True)
+
+    def _record_delivery(self, latency: float):
+        self._stats["delivered"] += 1
+        self._stats["total_latency"] += latency
+        self._stats["max_latency"] = max(self._stats["max_latency"], latency)
+
+
 class PowerState(StrEnum):
     OFF = "OFF"
     ON = "ON"
@@ -29,28 +135,453 @@ class PowerState(StrEnum):
     UNKNOWN = "UNKNOWN"
 
 
+class CircuitState(StrEnum):
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+
+class _CircuitBreaker:
+    """Connection circuit breaker with exponential backoff and jitter.
+
+    After CIRCUIT_FAILURE_THRESHOLD failed connects the circuit opens and
+    commands fail fast, so commands wait on at most that many failed
+    attempts. One trial connect is allowed (half-open) once the backoff
+    delay has passed; success closes the circuit again.
+    """
+
+    def __init__(self):
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.retry_at = 0.0
+
+    def retry_delay(self) -> float:
+        exponent = max(0, self.failures - const.CIRCUIT_FAILURE_THRESHOLD)
+        delay = min(const.RECONNECT_BACKOFF_INITIAL * (2 ** exponent), const.RECONNECT_BACKOFF_MAX)
+        return delay * (1 + random.uniform(-const.RECONNECT_BACKOFF_JITTER, const.RECONNECT_BACKOFF_JITTER))
+
+    def try_half_open(self, now: float) -> bool:
+        if self.state == CircuitState.CLOSED:
+            return True
+        if self.state == CircuitState.OPEN and now >= self.retry_at:
+            self.state = CircuitState.HALF_OPEN
+            return True
+        return False
+
+    def record_success(self):
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+
+    def record_failure(self, now: float) -> bool:
+        """Record a failed connect, returns True if this opened the circuit."""
+        previous = self.state
+        self.failures += 1
+        if self.state == CircuitState.HALF_OPEN or self.failures >= const.CIRCUIT_FAILURE_THRESHOLD:
+            self.state = CircuitState.OPEN
+            self.retry_at = now + self.retry_delay()
+        return previous == CircuitState.CLOSED and self.state == CircuitState.OPEN
+
+
+class PowerTransition:
+    """A power-on in progress, shared by every caller that asks for it.
+
+    Await it (or ``wait()``) for the final CommandResult; ``stage`` and
+    ``elapsed`` report progress while it runs.
+    """
+
+    def __init__(self, loop: AbstractEventLoop):
+        self._loop = loop
+        self.started = loop.time()
+        self.stage = "Starting"
+        self.task: asyncio.Task | None = None
+
+    @property
+    def elapsed(self) -> float:
+        return self._loop.time() - self.started
+
+    def done(self) -> bool:
+        return self.task is not None and self.task.done()
+
+    def wait(self) -> asyncio.Future:
+        # Shielded so a caller giving up does not cancel the wake for everyone else
+        return asyncio.shield(self.task)
+
+    def __await__(self):
+        return self.wait().__await__()
+
+
+class CommandPriority(IntEnum):
+    CONTROL = 0  # power and navigation
+    QUERY = 1  # user Get* commands
+    POLL = 2  # background polling and keepalive
+
+
+class _PendingCommand:
+    """A command queued for or written to the Envy that is still waiting for its reply."""
+
+    def __init__(self, command: str, loop: AbstractEventLoop, priority: CommandPriority):
+        self.command = command
+        self.frame = frame(command)
+        self.keywords = const.RESPONSE_KEYWORDS.get(command, ())
+        self.priority = priority
+        self.enqueued_at = loop.time()
+        self.sent = loop.create_future()
+        self.future = loop.create_future()
+        self.acked = False
+        self.trace: CommandTrace | None = None
+
+    def mark_sent(self):
+        if not self.sent.done():
+            self.sent.set_result(None)
+
+    def resolve(self, result: CommandResult):
+        self.mark_sent()
+        if not self.future.done():
+            self.future.set_result(result)
+
+
+class _CommandQueue:
+    """Bounded command queue with one lane per CommandPriority.
+
+    The sender always drains the most urgent lane first, so user input
+    queued behind a poll cycle goes out before the remaining poll queries.
+    """
+
+    QUEUE_FULL_RESULT = CommandResult.failed("Queue full")
+
+    def __init__(self, max_depth: int):
+        self._max_depth = max_depth
+        self._lanes: dict[CommandPriority, deque[_PendingCommand]] = {lane: deque() for lane in CommandPriority}
+        self._ready = asyncio.Event()
+        self._stats = {lane: {"dispatched": 0, "rejected": 0, "total_wait": 0.0, "max_wait": 0.0}
+                       for lane in CommandPriority}
+
+    def __len__(self) -> int:
+        return sum(len(lane) for lane in self._lanes.values())
+
+    def put(self, pending_commands: list[_PendingCommand]) -> bool:
+        priority = pending_commands[0].priority
+        overflow = len(self) + len(pending_commands) - self._max_depth
+
+        # User commands make room by dropping the oldest background polls
+        poll_lane = self._lanes[CommandPriority.POLL]
+        while overflow > 0 and priority != CommandPriority.POLL and poll_lane:
+            dropped = poll_lane.popleft()
+            dropped.resolve(self.QUEUE_FULL_RESULT)
+            self._stats[CommandPriority.POLL]["rejected"] += 1
+            overflow -= 1
+
+        if overflow > 0:
+            self._stats[priority]["rejected"] += len(pending_commands)
+            return False
+
+        self._lanes[priority].extend(pending_commands)
+        self._ready.set()
+        return True
+
+    async def get_batch(self, now: Callable[[], float]) -> list[_PendingCommand]:
+        """Wait for commands and return everything queued in the most urgent non-empty lane."""
+        while True:
+            for lane, queue in self._lanes.items():
+                batch = []
+                while queue:
+                    pending = queue.popleft()
+                    if not pending.sent.done():
+                        batch.append(pending)
+                if batch:
+                    self._record_wait(lane, batch, now())
+                    return batch
+
+            self._ready.clear()
+            await self._ready.wait()
+
+    def clear(self, result: CommandResult):
+        for queue in self._lanes.values():
+            while queue:
+                queue.popleft().resolve(result)
+
+    def _record_wait(self, lane: CommandPriority, batch: list[_PendingCommand], now: float):
+        stats = self._stats[lane]
+        for pending in batch:
+            wait = now - pending.enqueued_at
+            stats["dispatched"] += 1
+            stats["total_wait"] += wait
+            stats["max_wait"] = max(stats["max_wait"], wait)
+
+    def stats(self) -> dict[str, dict]:
+        result = {}
+        for lane, stats in self._stats.items():
+            dispatched = stats["dispatched"]
+            result[lane.name] = {
+                "depth": len(self._lanes[lane]),
+                "dispatched": dispatched,
+                "rejected": stats["rejected"],
+                "avg_wait_ms": round(stats["total_wait"] / dispatched * 1000, 2) if dispatched else 0.0,
+                "max_wait_ms": round(stats["max_wait"] * 1000, 2),
+            }
+        return result
+
+
+class _PollScheduler:
+    """Per-query poll intervals that follow the device power state.
+
+    Temperatures change slowly and are polled every few minutes, signal and
+    aspect are polled fast for a while after a change, and while the device
+    is OFF only a backed-off heartbeat is sent.
+    """
+
+    QUERIES = (
+        const.CMD_HEARTBEAT,
+        const.CMD_GET_SIGNAL_INFO,
+        const.CMD_GET_TEMPERATURES,
+        const.CMD_GET_ASPECT_RATIO,
+        const.CMD_GET_MASKING_RATIO,
+    )
+
+    def __init__(self):
+        self._next_due: dict[str, float] = dict.fromkeys(self.QUERIES, 0.0)
+        self._fast_until = 0.0
+        self._off_interval = const.POLL_INTERVAL
+
+    def interval(self, command: str, state: "PowerState", listening: bool, now: float) -> float | None:
+        """Return the poll interval of a query, or None if it is not polled in this state."""
+        if state == PowerState.OFF:
+            return self._off_interval if command == const.CMD_HEARTBEAT else None
+
+        if command == const.CMD_HEARTBEAT:
+            # The keepalive task covers idle connections while the device is online
+            return None
+        if command == const.CMD_GET_TEMPERATURES:
+            return const.TEMPERATURE_POLL_INTERVAL
+        if state != PowerState.ON and command != const.CMD_GET_SIGNAL_INFO:
+            return None
+
+        if command in (const.CMD_GET_SIGNAL_INFO, const.CMD_GET_ASPECT_RATIO) and now < self._fast_until:
+            return const.SIGNAL_FAST_POLL_INTERVAL
+        if listening:
+            # Signal, aspect and masking changes are pushed, polling is only a fallback
+            return const.PUSH_POLL_INTERVAL
+        if command == const.CMD_GET_MASKING_RATIO:
+            return const.MASKING_POLL_INTERVAL
+        return const.POLL_INTERVAL
+
+    def due(self, state: "PowerState", listening: bool, now: float) -> list[str]:
+        due = [
+            command for command in self.QUERIES
+            if self._next_due[command] <= now and self.interval(command, state, listening, now) is not None
+        ]
+        # Any reply proves the device is alive, the heartbeat is only needed on its own
+        if len(due) > 1 and const.CMD_HEARTBEAT in due:
+            due.remove(const.CMD_HEARTBEAT)
+        return due
+
+    def record(self, commands: list[str], state: "PowerState", listening: bool, now: float):
+        for command in self.QUERIES:
+            if command not in commands and command != const.CMD_HEARTBEAT:
+                continue
+            interval = self.interval(command, state, listening, now)
+            if interval is not None:
+                self._next_due[command] = now + interval
+
+    def seconds_until_due(self, state: "PowerState", listening: bool, now: float) -> float:
+        delays = [
+            self._next_due[command] - now for command in self.QUERIES
+            if self.interval(command, state, listening, now) is not None
+        ]
+        return max(0.0, min(delays, default=const.POLL_INTERVAL))
+
+    def back_off(self):
+        self._off_interval = min(self._off_interval * 2, const.OFF_POLL_MAX_INTERVAL)
+
+    def signal_changed(self, now: float):
+        self._fast_until = now + const.SIGNAL_FAST_POLL_WINDOW
+        for command in (const.CMD_GET_SIGNAL_INFO, const.CMD_GET_ASPECT_RATIO):
+            self._next_due[command] = min(self._next_due[command], now + const.SIGNAL_FAST_POLL_INTERVAL)
+
+    def reset(self):
+        self._off_interval = const.POLL_INTERVAL
+        self._next_due = dict.fromkeys(self.QUERIES, 0.0)
+
+
+class DeviceScheduler:
+    """Runs the periodic work of every device from one timer heap.
+
+    Each device registers a job that does its due polls and keepalive and
+    returns the delay until it needs to run again. First runs are staggered
+    and every delay is jittered, so devices do not poll in lockstep, and at
+    most ``max_concurrency`` jobs talk to their device at the same time.
+    """
+
+    def __init__(self, loop: AbstractEventLoop, max_concurrency: int = const.SCHEDULER_MAX_CONCURRENCY):
+        self._loop = loop
+        self._jobs: dict[str, Callable[[], Awaitable[float]]] = {}
+        self._due: dict[str, float] = {}
+        self._heap: list[tuple[float, str]] = []
+        self._running: dict[str, asyncio.Task] = {}
+        self._rerun: set[str] = set()
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def add(self, key: str, job: Callable[[], Awaitable[float]]):
+        # Spread first runs so a driver restart does not connect to every device at once
+        stagger = min(const.SCHEDULER_START_STAGGER * len(self._jobs), const.SCHEDULER_START_SPREAD)
+        self._jobs[key] = job
+        self._schedule(key, self._loop.time() + random.uniform(0.0, stagger))
+
+        if self._task is None or self._task.done():
+            self._task = self._loop.create_task(self._run())
+
+    def remove(self, key: str):
+        self._jobs.pop(key, None)
+        self._due.pop(key, None)
+        self._rerun.discard(key)
+        task = self._running.pop(key, None)
+        if task and task is not asyncio.current_task():
+            task.cancel()
+
+        if not self._jobs and self._task:
+            self._task.cancel()
+            self._task = None
+
+    def wake(self, key: str):
+        """Run the job of a device as soon as possible."""
+        if key not in self._jobs:
+            return
+        if key in self._running:
+            self._rerun.add(key)
+        else:
+            self._schedule(key, self._loop.time())
+
+    def _schedule(self, key: str, when: float):
+        # Superseded heap entries are skipped when they come up
+        self._due[key] = when
+        heapq.heappush(self._heap, (when, key))
+        self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            try:
+                while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+                    heapq.heappop(self._heap)
+
+                delay = self._heap[0][0] - self._loop.time() if self._heap else None
+                if delay is None or delay > 0:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                _, key = heapq.heappop(self._heap)
+                del self._due[key]
+
+                await self._slots.acquire()
+                if key not in self._jobs:
+                    self._slots.release()
+                    continue
+                self._running[key] = self._loop.create_task(self._run_job(key))
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                _LOG.error(f"Scheduler error: {e}")
+
+    async def _run_job(self, key: str):
+        delay = const.POLL_INTERVAL
+        try:
+            delay = await self._jobs[key]()
+        except asyncio.CancelledError:
+            return
+        except Exception as e:
+            _LOG.error(f"Scheduled job {key} failed: {e}")
+        finally:
+            self._slots.release()
+            if self._running.get(key) is asyncio.current_task():
+                del self._running[key]
+
+        if key not in self._jobs:
+            return
+        if key in self._rerun:
+            self._rerun.discard(key)
+            self._schedule(key, self._loop.time())
+        else:
+            self._schedule(key, self._loop.time() + delay * (1 + random.uniform(0.0, const.SCHEDULER_JITTER)))
+
+
 class MadVRDevice:
 
-    def __init__(self, config: MadVRConfig, loop: AbstractEventLoop | None = None):
+    # Returned while the circuit is open, instead of waiting on a connect that cannot succeed
+    _DEVICE_OFF_RESULT = CommandResult.failed("Device is off")
+    # Returned instead of queueing user input behind a trial connect of an open circuit
+    _CONNECTING_RESULT = CommandResult.failed("Device is connecting")
+    _CONNECT_FAILED_RESULT = CommandResult.failed("Connection failed")
+    _STOPPED_RESULT = CommandResult.failed("Stopped")
+
+    def __init__(
+        self,
+        config: MadVRDeviceConfig,
+        loop: AbstractEventLoop | None = None,
+        events: EventBus | None = None,
+        scheduler: DeviceScheduler | None = None,
+        snapshot: StateSnapshot | None = None,
+    ):
         self._loop: AbstractEventLoop = loop or asyncio.get_running_loop()
-        self.events = AsyncIOEventEmitter(self._loop)
+        # Devices of one driver share a bus, event ids already carry the device identifier
+        self.events = events or EventBus(self._loop)
         self._config = config
         self._state: PowerState = PowerState.UNKNOWN
         self._signal_info: str = "Unknown"
         self._is_polling = False
-        self._lock = asyncio.Lock()
+        self._scheduler = _PollScheduler()
+        # Periodic work runs from a scheduler shared by all devices of the driver
+        self._device_scheduler = scheduler
+        self._last_activity = 0.0
+
+        self._power_transition: PowerTransition | None = None
+
+        # Connection circuit breaker, probed in the background while open
+        self._breaker = _CircuitBreaker()
+        self._probe_task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()  # guards adopting a connection and writing, never held while connecting
+        self._connect_task: asyncio.Task | None = None
         self._reader: asyncio.StreamReader | None = None
         self._writer: asyncio.StreamWriter | None = None
 
+        # Response demultiplexer: the listener owns the reader while connected and
+        # routes each line to the pending command it answers, or to notifications
+        self._listener_task: asyncio.Task | None = None
+        # Every written command in order, until its own OK or ERROR arrives, timed-out ones included
+        self._ack_queue: deque[_PendingCommand] = deque()
+        self._data_waiters: dict[str, deque[_PendingCommand]] = {}
+        self._consecutive_timeouts = 0
+
+        # Prioritised command lanes, written to the socket by a single sender task
+        self._command_queue = _CommandQueue(const.COMMAND_QUEUE_MAX_DEPTH)
+        self._sender_task: asyncio.Task | None = None
+
         # Sensor data
         self._temperatures: list[int] = [0, 0, 0, 0]  # GPU, CPU, Board, PSU
         self._aspect_ratio: str = "Unknown"
         self._masking_ratio: str = "Unknown"
         self._aspect_ratio_mode: str = "Auto"
 
+        # Last published attributes per entity, only changes are emitted
+        self._attributes: dict[str, dict[str, Any]] = {}
+
+        # Last known state persisted across restarts, a restored state is reconciled by a full refresh
+        self._snapshot = snapshot
+        self._restored = False
+
+        self.metrics = DeviceMetrics()
+
     @property
     def identifier(self) -> str:
-        return self._config.host.replace('.', '_')
+        return self._config.identifier
 
     @property
     def name(self) -> str:
@@ -64,6 +595,54 @@ class MadVRDevice:
     def signal_info(self) -> str:
         return self._signal_info
 
+    @property
+    def is_listening(self) -> bool:
+        return self._listener_task is not None and not self._listener_task.done()
+
+    @property
+    def is_connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    @property
+    def circuit_state(self) -> CircuitState:
+        return self._breaker.state
+
+    def use_config(self, config: MadVRDeviceConfig):
+        """Use the current settings of this unit, e.g. after setup stored a new MAC address."""
+        self._config = config
+
+    def attributes(self, entity_id: str) -> dict[str, Any]:
+        """Last published attributes of an entity."""
+        return dict(self._attributes.get(entity_id, {}))
+
+    def republish(self, entity_id: str | None = None):
+        """Emit the full last published attributes again, e.g. for a new subscriber.
+
+        Args:
+            entity_id: Entity to republish, all entities if None
+        """
+        entity_ids = [entity_id] if entity_id is not None else list(self._attributes)
+        for identifier in entity_ids:
+            if self._attributes.get(identifier):
+                self.events.emit(EVENTS.UPDATE, identifier, dict(self._attributes[identifier]))
+
+    @property
+    def queue_stats(self) -> dict[str, dict]:
+        """Queue depth and wait time per command lane."""
+        return self._command_queue.stats()
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Connection state, queue and latency metrics, for correlating complaints with device behaviour."""
+        return {
+            "name": self.name,
+            "host": self._config.host,
+            "state": self._state.value,
+            "connected": self.is_connected,
+            "circuit": self._breaker.state.value,
+            "queue": self.queue_stats,
+            **self.metrics.snapshot(),
+        }
+
     async def start_polling(self):
         if self._is_polling:
             return
@@ -74,102 +653,225 @@ class MadVRDevice:
         else:
             _LOG.info(f"[{self.name}] MAC address loaded from config: {self._config.mac_address}")
         
-        self._loop.create_task(self._poll_loop())
+        if self._device_scheduler is None:
+            self._device_scheduler = DeviceScheduler(self._loop)
+        self._device_scheduler.add(self.identifier, self._run_periodic)
         _LOG.info(f"[{self.name}] Started polling")
 
     async def stop_polling(self):
         self._is_polling = False
+        if self._device_scheduler:
+            self._device_scheduler.remove(self.identifier)
+        if self._probe_task:
+            self._probe_task.cancel()
+            self._probe_task = None
+        if self._connect_task:
+            self._connect_task.cancel()
+            self._connect_task = None
+        if self._sender_task:
+            sender_task, self._sender_task = self._sender_task, None
+            sender_task.cancel()
+            # Lets the sender resolve the batch it was connecting or writing for
+            await asyncio.wait([sender_task])
+        self._command_queue.clear(self._STOPPED_RESULT)
         await self._disconnect()
+        if self._snapshot:
+            await self._snapshot.flush()
         _LOG.info(f"[{self.name}] Stopped polling")
 
-    async def _poll_loop(self):
-        while self._is_polling:
-            try:
-                await self.update()
-                await asyncio.sleep(const.POLL_INTERVAL)
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                _LOG.error(f"[{self.name}] Polling error: {e}")
-                await asyncio.sleep(const.POLL_INTERVAL)
+    async def _run_periodic(self) -> float:
+        """Run due polls and the keepalive, returns the delay until the next run."""
+        await self._poll_due()
+        keepalive_delay = await self._keepalive_due()
+        poll_delay = self._scheduler.seconds_until_due(self._state, self.is_listening, self._loop.time())
+        return min(poll_delay, keepalive_delay)
+
+    async def _keepalive_due(self) -> float:
+        idle = self._loop.time() - self._last_activity
+        if self._state == PowerState.OFF:
+            # The poll scheduler probes a powered off device with a backed-off heartbeat
+            return const.HEARTBEAT_INTERVAL
+        if not self.is_connected:
+            await self._reconnect()
+            return const.HEARTBEAT_INTERVAL
+        if idle >= const.HEARTBEAT_INTERVAL:
+            await self._send_keepalive()
+            return const.HEARTBEAT_INTERVAL
+        return const.HEARTBEAT_INTERVAL - idle
+
+    def _wake(self):
+        if self._is_polling and self._device_scheduler:
+            self._device_scheduler.wake(self.identifier)
+
+    async def _send_keepalive(self):
+        result = await self._send_command(
+            const.CMD_HEARTBEAT,
+            timeout=const.KEEPALIVE_TIMEOUT,
+            priority=CommandPriority.POLL
+        )
+        if result.success:
+            return
+
+        # No answer on an idle socket means it is half-open, replace it before a user command needs it
+        _LOG.warning(f"[{self.name}] Keepalive failed ({result.error}), reconnecting")
+        await self._disconnect()
+        await self._reconnect()
+
+    async def _reconnect(self):
+        if not await self._ensure_connected():
+            self._set_power_state(PowerState.OFF, "Powered Off")
+
+    async def _poll_due(self):
+        if self._state == PowerState.UNKNOWN or self._restored:
+            self._restored = False
+            await self.update()
+            return
+
+        was_off = self._state == PowerState.OFF
+        commands = self._scheduler.due(self._state, self.is_listening, self._loop.time())
+        if not commands:
+            return
+
+        online = await self._poll(commands)
+        if online and was_off:
+            # Back from OFF: refresh everything once, then follow the per-query schedule
+            await self._poll(list(_PollScheduler.QUERIES))
+        elif not online:
+            self._scheduler.back_off()
 
     async def update(self):
+        """Refresh every status value at once."""
+        await self._poll(list(_PollScheduler.QUERIES))
+
+    async def _poll(self, commands: list[str]) -> bool:
         try:
-            heartbeat_result = await self._send_command(
-                const.CMD_HEARTBEAT, 
-                timeout=const.COMMAND_TIMEOUT
-            )
-            
-            if heartbeat_result["success"]:
-                if not self._config.mac_address:
-                    _LOG.info(f"[{self.name}] Device online but no MAC address stored, fetching now...")
-                    await self._fetch_mac_address()
-                
-                signal_result = await self._send_command(
-                    const.CMD_GET_SIGNAL_INFO, 
-                    timeout=const.COMMAND_TIMEOUT
-                )
-                
-                if signal_result["success"] and signal_result.get("data"):
-                    signal_data = signal_result["data"]
-
-                    # Ignore temperature responses that sometimes get mixed with signal queries
-                    if "Temperatures" in signal_data:
-                        _LOG.debug(f"[{self.name}] Ignoring temperature data in signal query")
-                        new_state = PowerState.STANDBY
-                        self._signal_info = "Standby Mode"
-                    elif const.NO_SIGNAL in signal_data or const.RESPONSE_ERROR in signal_data:
-                        new_state = PowerState.STANDBY
-                        self._signal_info = "No Signal (Standby)"
-                    else:
-                        new_state = PowerState.ON
-                        parts = signal_data.split()
-                        if len(parts) > 1:
-                            self._signal_info = " ".join(parts[1:5])
-                        else:
-                            self._signal_info = "Signal Active"
-                else:
-                    new_state = PowerState.STANDBY
-                    self._signal_info = "Standby Mode"
-
-                # Query sensor data when device is online
-                await self._update_sensor_data()
+            # All due queries go out in a single write, so a refresh costs one round trip
+            if not self._config.mac_address:
+                commands = [*commands, const.CMD_GET_MAC_ADDRESS]
+
+            results = await self.query_batch(commands, timeout=const.COMMAND_TIMEOUT, priority=CommandPriority.POLL)
+
+            if const.CMD_HEARTBEAT in results:
+                online = results[const.CMD_HEARTBEAT].success
+            else:
+                online = any(result.success for result in results.values())
+
+            if online:
+                if const.CMD_GET_MAC_ADDRESS in results:
+                    _LOG.info(f"[{self.name}] Device online but no MAC address stored, using batched query result")
+                    self._store_mac_address(results[const.CMD_GET_MAC_ADDRESS])
+
+                if const.CMD_GET_SIGNAL_INFO in results:
+                    self._apply_signal_result(results[const.CMD_GET_SIGNAL_INFO])
+
+                self._update_sensor_data(results)
             else:
-                new_state = PowerState.OFF
-                self._signal_info = "Powered Off"
-
-            if self._state != new_state or self._signal_info != self._signal_info:
-                old_state = self._state
-                self._state = new_state
-                
-                _LOG.info(f"[{self.name}] State: {old_state} -> {new_state}, Signal: {self._signal_info}")
-                
-                self.events.emit(EVENTS.UPDATE, self.identifier, {
-                    "state": self._state,
-                    "signal_info": self._signal_info
-                })
-            
+                self._set_power_state(PowerState.OFF, "Powered Off")
+
+            self._scheduler.record(commands, self._state, self.is_listening, self._loop.time())
+            return online
+
         except Exception as e:
             _LOG.error(f"[{self.name}] Update failed: {e}")
             if self._state != PowerState.OFF:
-                self._state = PowerState.OFF
-                self._signal_info = "Connection Error"
-                self.events.emit(EVENTS.UPDATE, self.identifier, {
-                    "state": self._state,
-                    "signal_info": self._signal_info
-                })
-
-    async def send_command(self, command: str) -> dict:
-        if command == const.CMD_STANDBY and self._state == PowerState.OFF:
-            _LOG.info(f"[{self.name}] Device is OFF, triggering Wake-on-LAN before Standby")
-            wol_result = await self._wake_on_lan()
-            if not wol_result["success"]:
-                _LOG.error(f"[{self.name}] Wake-on-LAN failed: {wol_result.get('error')}")
-                return wol_result
-            _LOG.info(f"[{self.name}] Wake-on-LAN sequence completed")
-        
+                self._set_power_state(PowerState.OFF, "Connection Error")
+            return False
+
+    def _apply_signal_result(self, signal_result: CommandResult):
+        message = signal_result.message
+        if isinstance(message, IncomingSignal):
+            self._set_power_state(PowerState.ON, message.summary)
+        elif isinstance(message, NoSignal):
+            self._set_power_state(PowerState.STANDBY, "No Signal (Standby)")
+        else:
+            self._set_power_state(PowerState.STANDBY, "Standby Mode")
+
+    def _set_power_state(self, new_state: PowerState, signal_info: str):
+        if self._state == new_state and self._signal_info == signal_info:
+            return
+
+        old_state = self._state
+        self._state = new_state
+        self._signal_info = signal_info
+
+        _LOG.info(f"[{self.name}] State: {old_state} -> {new_state}, Signal: {signal_info}")
+
+        if old_state != new_state:
+            self._scheduler.reset()
+        if new_state != PowerState.OFF:
+            self._scheduler.signal_changed(self._loop.time())
+        self._wake()
+
+        self._publish(self.identifier, {
+            "state": self._state,
+            "signal_info": self._signal_info
+        })
+
+    async def send_command(self, command: str) -> CommandResult:
+        if command == const.CMD_STANDBY and (self._state == PowerState.OFF or self.power_transition):
+            return await self.power_on()
+        if command == const.CMD_POWER_OFF:
+            self._cancel_power_transition()
+
         return await self._send_command(command)
 
+    @property
+    def power_transition(self) -> PowerTransition | None:
+        """The power-on currently in progress, if any."""
+        if self._power_transition and not self._power_transition.done():
+            return self._power_transition
+        return None
+
+    def power_on(self) -> PowerTransition:
+        """Start powering on, or join the power-on already in progress."""
+        transition = self.power_transition
+        if transition:
+            _LOG.info(f"[{self.name}] Power on already in progress ({transition.stage}, "
+                      f"{transition.elapsed:.1f}s), joining it")
+            return transition
+
+        transition = PowerTransition(self._loop)
+        transition.task = self._loop.create_task(self._run_power_on(transition))
+        self._power_transition = transition
+        return transition
+
+    async def power_off(self, command: str = const.CMD_POWER_OFF) -> CommandResult:
+        """Cancel a pending power-on and send the power off command."""
+        self._cancel_power_transition()
+        return await self._send_command(command)
+
+    def _cancel_power_transition(self):
+        transition = self.power_transition
+        if transition:
+            _LOG.info(f"[{self.name}] Cancelling power on in progress ({transition.stage})")
+            transition.task.cancel()
+
+    def _set_transition_stage(self, transition: PowerTransition, stage: str):
+        transition.stage = stage
+        _LOG.info(f"[{self.name}] Power on: {stage} ({transition.elapsed:.1f}s)")
+        if self._state == PowerState.OFF:
+            self._set_power_state(PowerState.OFF, f"{stage}...")
+
+    async def _run_power_on(self, transition: PowerTransition) -> CommandResult:
+        try:
+            if self._state == PowerState.OFF:
+                _LOG.info(f"[{self.name}] Device is OFF, triggering Wake-on-LAN before Standby")
+                self._set_transition_stage(transition, "Waking Up")
+                wol_result = await self._wake_on_lan()
+                if not wol_result.success:
+                    _LOG.error(f"[{self.name}] Wake-on-LAN failed: {wol_result.error}")
+                    self._set_power_state(PowerState.OFF, "Powered Off")
+                    return wol_result
+                _LOG.info(f"[{self.name}] Wake-on-LAN sequence completed")
+
+            transition.stage = "Sending Standby"
+            return await self._send_command(const.CMD_STANDBY)
+
+        except asyncio.CancelledError:
+            if self._state == PowerState.OFF:
+                self._set_power_state(PowerState.OFF, "Powered Off")
+            return CommandResult.failed("Power on cancelled")
+
     def set_aspect_ratio_mode(self, mode: str):
         """Set aspect ratio mode and emit update event.
 
@@ -185,146 +887,514 @@ class MadVRDevice:
 
         select_id = f"select.{self.identifier}.aspect_ratio_mode"
 
-        self.events.emit(EVENTS.UPDATE, select_id, {
+        self._publish(select_id, {
             SelectAttributes.STATE: SelectStates.ON,
             SelectAttributes.CURRENT_OPTION: self._aspect_ratio_mode
         })
 
-    async def _update_sensor_data(self):
-        """Query sensor data and emit update events."""
-        from ucapi.sensor import Attributes as SensorAttributes, States as SensorStates
+    def _publish(self, entity_id: str, attributes: dict[str, Any]):
+        """Emit the attributes that differ from the last published values of the entity."""
+        published = self._attributes.setdefault(entity_id, {})
+        changed = {key: value for key, value in attributes.items() if published.get(key, _UNSET) != value}
+        if not changed:
+            return
 
-        # Query temperatures
-        temp_result = await self._send_command(const.CMD_GET_TEMPERATURES, timeout=const.COMMAND_TIMEOUT)
-        if temp_result["success"] and temp_result.get("data"):
-            try:
-                # Parse: "Temperatures 65 58 42 45"
-                parts = temp_result["data"].split()
-                if len(parts) >= 5:
-                    self._temperatures = [int(parts[1]), int(parts[2]), int(parts[3]), int(parts[4])]
-
-                    # Emit events for each temperature sensor
-                    temp_names = ["gpu", "cpu", "board", "psu"]
-                    for idx, temp_name in enumerate(temp_names):
-                        sensor_id = f"sensor.{self.identifier}.temp_{temp_name}"
-                        self.events.emit(EVENTS.UPDATE, sensor_id, {
-                            SensorAttributes.STATE: SensorStates.ON,
-                            SensorAttributes.VALUE: self._temperatures[idx],
-                            SensorAttributes.UNIT: "°C"
-                        })
-            except (ValueError, IndexError) as e:
-                _LOG.debug(f"[{self.name}] Failed to parse temperatures: {e}")
-
-        # Query aspect ratio
-        aspect_result = await self._send_command(const.CMD_GET_ASPECT_RATIO, timeout=const.COMMAND_TIMEOUT)
-        if aspect_result["success"] and aspect_result.get("data"):
-            # Parse: "AspectRatio 1920:1080 1.778 178 "16:9""
-            aspect_data = aspect_result["data"]
-            if "AspectRatio" in aspect_data:
-                # Extract the readable part
-                parts = aspect_data.replace("AspectRatio", "").strip()
-                self._aspect_ratio = parts if parts else "Unknown"
-
-                sensor_id = f"sensor.{self.identifier}.aspect_ratio"
-                self.events.emit(EVENTS.UPDATE, sensor_id, {
-                    SensorAttributes.STATE: SensorStates.ON,
-                    SensorAttributes.VALUE: self._aspect_ratio
-                })
-
-        # Query masking ratio
-        masking_result = await self._send_command(const.CMD_GET_MASKING_RATIO, timeout=const.COMMAND_TIMEOUT)
-        if masking_result["success"] and masking_result.get("data"):
-            # Parse: "MaskingRatio 1920:1080 1.778 178"
-            masking_data = masking_result["data"]
-            if "MaskingRatio" in masking_data:
-                parts = masking_data.replace("MaskingRatio", "").strip()
-                self._masking_ratio = parts if parts else "Unknown"
-
-                sensor_id = f"sensor.{self.identifier}.masking_ratio"
-                self.events.emit(EVENTS.UPDATE, sensor_id, {
-                    SensorAttributes.STATE: SensorStates.ON,
-                    SensorAttributes.VALUE: self._masking_ratio
-                })
+        published.update(changed)
+        self.events.emit(EVENTS.UPDATE, entity_id, changed)
+        if self._snapshot:
+            self._snapshot.update(self.snapshot_state())
+
+    def snapshot_state(self) -> dict[str, Any]:
+        """Compact last known state, as persisted in the state snapshot."""
+        return {
+            "state": self._state.value,
+            "signal_info": self._signal_info,
+            "temperatures": self._temperatures,
+            "aspect_ratio": self._aspect_ratio,
+            "masking_ratio": self._masking_ratio,
+            "aspect_ratio_mode": self._aspect_ratio_mode,
+        }
+
+    def restore(self, snapshot: dict[str, Any]) -> bool:
+        """Publish the last known state from a snapshot until the next poll reconciles it.
+
+        Args:
+            snapshot: State as returned by ``snapshot_state``
+
+        Returns:
+            False if the snapshot was not usable
+        """
+        if self._state != PowerState.UNKNOWN:
+            return False
+        try:
+            state = PowerState(snapshot["state"])
+            signal_info = str(snapshot["signal_info"])
+            temperatures = [int(value) for value in snapshot["temperatures"]][:4]
+            aspect_ratio = str(snapshot["aspect_ratio"])
+            masking_ratio = str(snapshot["masking_ratio"])
+            aspect_ratio_mode = str(snapshot["aspect_ratio_mode"])
+        except (KeyError, TypeError, ValueError) as e:
+            _LOG.warning(f"[{self.name}] Ignoring unusable state snapshot: {e!r}")
+            return False
+        if state == PowerState.UNKNOWN or len(temperatures) != 4:
+            return False
+
+        _LOG.info(f"[{self.name}] Restored last known state: {state}, Signal: {signal_info}")
+        self._state = state
+        self._signal_info = signal_info
+        self._aspect_ratio_mode = aspect_ratio_mode
+        self._restored = True
+
+        self._publish(self.identifier, {"state": self._state, "signal_info": self._signal_info})
+        self._emit_signal_sensor()
+        self._set_temperatures(temperatures)
+        self._set_aspect_ratio(aspect_ratio)
+        self._set_masking_ratio(masking_ratio)
+        self._emit_select_update()
+        return True
+
+    def _update_sensor_data(self, results: dict[str, CommandResult]):
+        """Apply sensor query results and emit update events for changed values."""
+        temp_result = results.get(const.CMD_GET_TEMPERATURES)
+        if temp_result and isinstance(temp_result.message, Temperatures):
+            self._set_temperatures(temp_result.message.values)
+
+        aspect_result = results.get(const.CMD_GET_ASPECT_RATIO)
+        if aspect_result and isinstance(aspect_result.message, AspectRatio):
+            self._set_aspect_ratio(aspect_result.message.text)
+
+        masking_result = results.get(const.CMD_GET_MASKING_RATIO)
+        if masking_result and isinstance(masking_result.message, MaskingRatio):
+            self._set_masking_ratio(masking_result.message.text)
 
         # Emit signal sensor update (already tracked in _signal_info)
+        if const.CMD_GET_SIGNAL_INFO in results:
+            self._emit_signal_sensor()
+
+    def _set_temperatures(self, temperatures: tuple[int, ...] | list[int]):
+        from ucapi.sensor import Attributes as SensorAttributes, States as SensorStates
+
+        self._temperatures = list(temperatures)
+
+        # Emit events for each temperature sensor
+        temp_names = ["gpu", "cpu", "board", "psu"]
+        for idx, temp_name in enumerate(temp_names):
+            sensor_id = f"sensor.{self.identifier}.temp_{temp_name}"
+            self._publish(sensor_id, {
+                SensorAttributes.STATE: SensorStates.ON,
+                SensorAttributes.VALUE: self._temperatures[idx],
+                SensorAttributes.UNIT: "°C"
+            })
+
+    def _set_aspect_ratio(self, value: str):
+        from ucapi.sensor import Attributes as SensorAttributes, States as SensorStates
+
+        self._aspect_ratio = value if value else "Unknown"
+
+        sensor_id = f"sensor.{self.identifier}.aspect_ratio"
+        self._publish(sensor_id, {
+            SensorAttributes.STATE: SensorStates.ON,
+            SensorAttributes.VALUE: self._aspect_ratio
+        })
+
+    def _set_masking_ratio(self, value: str):
+        from ucapi.sensor import Attributes as SensorAttributes, States as SensorStates
+
+        self._masking_ratio = value if value else "Unknown"
+
+        sensor_id = f"sensor.{self.identifier}.masking_ratio"
+        self._publish(sensor_id, {
+            SensorAttributes.STATE: SensorStates.ON,
+            SensorAttributes.VALUE: self._masking_ratio
+        })
+
+    def _emit_signal_sensor(self):
+        from ucapi.sensor import Attributes as SensorAttributes, States as SensorStates
+
         signal_sensor_id = f"sensor.{self.identifier}.signal"
-        self.events.emit(EVENTS.UPDATE, signal_sensor_id, {
+        self._publish(signal_sensor_id, {
             SensorAttributes.STATE: SensorStates.ON if self._state == PowerState.ON else SensorStates.UNAVAILABLE,
             SensorAttributes.VALUE: self._signal_info
         })
 
-    async def _send_command(self, command: str, timeout: float = None) -> dict:
+    async def query_batch(
+        self, commands: list[str], timeout: float = None, priority: CommandPriority = CommandPriority.QUERY
+    ) -> dict[str, CommandResult]:
+        """Send several commands in one write and gather every reply.
+
+        Args:
+            commands: Device protocol commands, answered in order by the Envy
+            timeout: Time to wait for each reply once the batch is written
+            priority: Command lane the batch is queued in
+
+        Returns:
+            CommandResult for each command, keyed by command
+        """
+        results = await self._send_batch(commands, timeout, priority)
+        return dict(zip(commands, results))
+
+    async def _send_command(
+        self, command: str, timeout: float = None, priority: CommandPriority = None
+    ) -> CommandResult:
+        if priority is None:
+            priority = CommandPriority.QUERY if command.startswith("Get") else CommandPriority.CONTROL
+        results = await self._send_batch([command], timeout, priority)
+        return results[0]
+
+    async def _send_batch(
+        self, commands: list[str], timeout: float = None, priority: CommandPriority = CommandPriority.CONTROL
+    ) -> list[CommandResult]:
         if timeout is None:
             timeout = const.COMMAND_TIMEOUT
-            
+
+        if not self.is_connected and self._breaker.state != CircuitState.CLOSED and self._is_probing():
+            return [self._DEVICE_OFF_RESULT] * len(commands)
+
+        # Background work connects before queueing, so the sender never waits on a connect it did not need
+        if priority == CommandPriority.POLL and not await self._ensure_connected():
+            return [self._connect_failure_result()] * len(commands)
+
+        pending_commands = [_PendingCommand(command, self._loop, priority) for command in commands]
+        if TRACER.enabled:
+            for pending in pending_commands:
+                pending.trace = TRACER.begin(self.identifier, pending.command)
+
+        if not self._command_queue.put(pending_commands):
+            _LOG.warning(f"[{self.name}] Command queue full, rejecting: {', '.join(commands)}")
+            for pending in pending_commands:
+                self._finish_trace(pending, _CommandQueue.QUEUE_FULL_RESULT)
+            return [_CommandQueue.QUEUE_FULL_RESULT] * len(commands)
+
+        if self._sender_task is None or self._sender_task.done():
+            self._sender_task = self._loop.create_task(self._sender_loop())
+
+        # Replies are awaited outside the sender so other commands can be in flight
+        return list(await asyncio.gather(*(self._await_reply(pending, timeout) for pending in pending_commands)))
+
+    async def _sender_loop(self):
+        while True:
+            try:
+                batch = await self._command_queue.get_batch(self._loop.time)
+            except asyncio.CancelledError:
+                break
+            try:
+                await self._write_batch(batch)
+            except asyncio.CancelledError:
+                # Stopped while connecting or writing, the batch is out of the queue but may not be awaiting a reply
+                for pending in batch:
+                    pending.resolve(self._STOPPED_RESULT)
+                break
+            except Exception as e:
+                _LOG.error(f"[{self.name}] Sender error: {e}")
+                for pending in batch:
+                    pending.resolve(CommandResult.failed(str(e)))
+
+    async def _write_batch(self, batch: list[_PendingCommand]):
+        was_connected = self.is_connected
+        if not was_connected and self._is_connecting() and self._breaker.state != CircuitState.CLOSED:
+            result = self._CONNECTING_RESULT
+        elif not await self._ensure_connected():
+            result = self._connect_failure_result()
+        else:
+            result = None
+        if result is not None:
+            for pending in batch:
+                pending.resolve(result)
+            return
+
+        if TRACER.enabled and not was_connected:
+            self._mark_traces(batch, "connected")
+
+        lock_requested = self._loop.time()
         async with self._lock:
+            self.metrics.lock_wait.observe(self._loop.time() - lock_requested)
+            if TRACER.enabled:
+                self._mark_traces(batch, "lock_acquired")
             try:
-                if not await self._ensure_connected():
-                    return {"success": False, "error": "Connection failed"}
+                if not self.is_connected:
+                    # Dropped between connecting and taking the lock
+                    for pending in batch:
+                        pending.resolve(CommandResult.failed("Connection lost"))
+                    return
 
-                _LOG.debug(f"[{self.name}] Sending: {command}")
-                self._writer.write(f"{command}\r\n".encode())
+                _LOG.debug(f"[{self.name}] Sending: {', '.join(pending.command for pending in batch)}")
+                for pending in batch:
+                    self._register_pending(pending)
+                # Local start time, the listener updates _last_activity for every line received while draining
+                write_started = self._last_activity = self._loop.time()
+                data = batch[0].frame if len(batch) == 1 else b"".join(pending.frame for pending in batch)
+                self._writer.write(data)
                 await self._writer.drain()
-
-                try:
-                    response_line = await asyncio.wait_for(
-                        self._reader.readline(),
-                        timeout=timeout
-                    )
-                    response = response_line.decode().strip()
-                    _LOG.debug(f"[{self.name}] Received: {response}")
-
-                    if response.startswith(const.RESPONSE_OK):
-                        return {"success": True}
-                    elif response.startswith(const.RESPONSE_ERROR):
-                        error_msg = response.replace(const.RESPONSE_ERROR, "").strip().strip('"')
-                        return {"success": False, "error": error_msg}
-                    else:
-                        return {"success": True, "data": response}
-
-                except asyncio.TimeoutError:
-                    _LOG.warning(f"[{self.name}] Command timeout: {command}")
-                    await self._disconnect()
-                    return {"success": False, "error": "Timeout"}
+                self.metrics.write.observe(self._loop.time() - write_started)
+                self.metrics.counters["commands"] += len(batch)
+                self.metrics.counters["bytes_out"] += len(data)
+                if TRACER.enabled:
+                    self._mark_traces(batch, "written")
+                for pending in batch:
+                    pending.mark_sent()
 
             except (ConnectionResetError, ConnectionAbortedError, BrokenPipeError) as e:
                 _LOG.error(f"[{self.name}] Network error: {e}")
                 await self._disconnect()
-                return {"success": False, "error": f"Network error: {e.__class__.__name__}"}
+                for pending in batch:
+                    pending.resolve(CommandResult.failed(f"Network error: {e.__class__.__name__}"))
 
             except Exception as e:
                 _LOG.error(f"[{self.name}] Command failed: {e}")
                 await self._disconnect()
-                return {"success": False, "error": str(e)}
+                for pending in batch:
+                    pending.resolve(CommandResult.failed(str(e)))
+
+    @staticmethod
+    def _mark_traces(batch: list[_PendingCommand], stage: str):
+        for pending in batch:
+            if pending.trace:
+                pending.trace.mark(stage)
+
+    @staticmethod
+    def _finish_trace(pending: _PendingCommand, result: CommandResult):
+        if pending.trace:
+            TRACER.finish(pending.trace, "OK" if result.success else result.error)
+
+    def _register_pending(self, pending: _PendingCommand):
+        self._ack_queue.append(pending)
+        for keyword in pending.keywords:
+            self._data_waiters.setdefault(keyword, deque()).append(pending)
+
+    def _discard_pending(self, pending: _PendingCommand):
+        # The ack entry stays until the command's own OK or ERROR consumes it, so a late
+        # reply to a timed-out command is dropped instead of answering the next command
+        for keyword in pending.keywords:
+            waiters = self._data_waiters.get(keyword)
+            if waiters and pending in waiters:
+                waiters.remove(pending)
+
+    async def _await_reply(self, pending: _PendingCommand, timeout: float) -> CommandResult:
+        # Time spent queued or connecting is not part of the reply timeout, but is bounded on its own
+        try:
+            await asyncio.wait_for(pending.sent, timeout=const.COMMAND_SEND_TIMEOUT)
+        except asyncio.TimeoutError:
+            # The cancelled sent future also keeps the sender from writing it later
+            self._discard_pending(pending)
+            result = CommandResult.failed("Not sent")
+            pending.resolve(result)
+            self.metrics.counters["timeouts"] += 1
+            _LOG.warning(f"[{self.name}] Command not sent within {const.COMMAND_SEND_TIMEOUT:.0f}s: {pending.command}")
+            self._finish_trace(pending, result)
+            return result
+        sent_at = self._loop.time()
+        try:
+            result = await asyncio.wait_for(pending.future, timeout=timeout)
+            self._consecutive_timeouts = 0
+            if result.success:
+                self.metrics.observe_rtt(pending.command, self._loop.time() - sent_at)
+            else:
+                self.metrics.counters["errors"] += 1
+            self._finish_trace(pending, result)
+            return result
+
+        except asyncio.TimeoutError:
+            self._discard_pending(pending)
+            self._consecutive_timeouts += 1
+            self.metrics.counters["timeouts"] += 1
+            _LOG.warning(f"[{self.name}] Command timeout: {pending.command}")
+            if self._consecutive_timeouts >= const.MAX_CONSECUTIVE_TIMEOUTS:
+                _LOG.warning(f"[{self.name}] {self._consecutive_timeouts} timeouts in a row, reconnecting")
+                self._consecutive_timeouts = 0
+                await self._disconnect()
+            result = CommandResult.failed("Timeout")
+            self._finish_trace(pending, result)
+            return result
+
+    def _dispatch_line(self, message: Message):
+        if message is OK:
+            pending = self._pop_ack(message)
+            if pending is None:
+                return
+            if pending.keywords:
+                # Queries are acknowledged first, the data line follows
+                pending.acked = True
+            else:
+                pending.resolve(RESULT_OK)
+            return
+
+        if isinstance(message, Error):
+            pending = self._pop_ack(message)
+            if pending is not None:
+                self._discard_pending(pending)
+                pending.resolve(CommandResult.failed(message.message))
+            return
+
+        # Only an acknowledged query takes a data line, one arriving before the OK is a notification
+        waiters = self._data_waiters.get(message.keyword)
+        if waiters and waiters[0].acked:
+            pending = waiters.popleft()
+            if pending.trace:
+                pending.trace.mark("first_reply")
+            self._discard_pending(pending)
+            pending.resolve(CommandResult(True, message))
+            return
+
+        self._handle_notification(message)
+
+    def _pop_ack(self, message: Message) -> _PendingCommand | None:
+        """Take the command an OK or ERROR answers, None if none is waiting or it already gave up."""
+        if not self._ack_queue:
+            if message is OK:
+                _LOG.debug(f"[{self.name}] Unexpected acknowledgement")
+            else:
+                _LOG.warning(f"[{self.name}] Unsolicited error: {message.message}")
+            return None
+
+        pending = self._ack_queue.popleft()
+        if pending.future.done():
+            _LOG.debug(f"[{self.name}] Late reply to {pending.command} dropped: {message.line}")
+            return None
+        if pending.trace:
+            pending.trace.mark("first_reply")
+        return pending
+
+    def _fail_pending(self, error: Exception):
+        pending_commands = list(self._ack_queue)
+        for waiters in self._data_waiters.values():
+            pending_commands.extend(waiters)
+        self._ack_queue.clear()
+        self._data_waiters.clear()
+
+        # Resolved with an error result rather than an exception, the waiter may already be cancelled
+        for pending in pending_commands:
+            pending.resolve(CommandResult.failed(f"Network error: {error.__class__.__name__}"))
 
     async def _ensure_connected(self) -> bool:
-        if self._writer and not self._writer.is_closing():
+        """Connect unless connected, concurrent callers share one connect attempt."""
+        if self.is_connected:
             return True
 
+        if not self._is_connecting():
+            # While the background probe owns the open circuit, fail fast instead of connecting
+            if self._is_probing() or not self._breaker.try_half_open(self._loop.time()):
+                return False
+            self._connect_task = self._loop.create_task(self._connect())
+
+        # Shielded, a cancelled caller must not abort the attempt other callers wait on
+        return await asyncio.shield(self._connect_task)
+
+    async def _connect(self) -> bool:
+        # Runs outside the command lock so writes of other paths never wait on a doomed attempt
         try:
-            _LOG.info(f"[{self.name}] Connecting to {self._config.host}:{self._config.port}")
-            
-            self._reader, self._writer = await asyncio.wait_for(
-                asyncio.open_connection(self._config.host, self._config.port),
-                timeout=const.CONNECTION_TIMEOUT
-            )
+            reader, writer = await self._open_connection(const.CONNECTION_TIMEOUT)
+        except Exception as e:
+            self._record_connect_failure(e)
+            await self._disconnect()
+            return False
+
+        await self._adopt_or_close(reader, writer)
+        return True
+
+    async def _open_connection(self, timeout: float) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        _LOG.debug(f"[{self.name}] Connecting to {self._config.host}:{self._config.port}")
+        started = self._loop.time()
 
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self._config.host, self._config.port),
+            timeout=timeout
+        )
+
+        try:
             welcome = await asyncio.wait_for(
-                self._reader.readline(), 
+                reader.readline(),
                 timeout=const.COMMAND_TIMEOUT
             )
-            welcome_msg = welcome.decode().strip()
-            _LOG.info(f"[{self.name}] Connected: {welcome_msg}")
-            
-            return True
+        except BaseException:
+            writer.close()
+            raise
 
-        except Exception as e:
-            _LOG.error(f"[{self.name}] Connection failed: {e}")
-            await self._disconnect()
-            return False
+        self.metrics.connect.observe(self._loop.time() - started)
+        self.metrics.counters["bytes_in"] += len(welcome)
+        _LOG.info(f"[{self.name}] Connected: {welcome.decode().strip()}")
+        return reader, writer
+
+    async def _adopt_or_close(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # Connections are opened outside the lock, one opened by another path in the meantime wins
+        async with self._lock:
+            if self.is_connected:
+                writer.close()
+            else:
+                self._adopt_connection(reader, writer)
+
+    def _adopt_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader, self._writer = reader, writer
+        self._last_activity = self._loop.time()
+        self.metrics.counters["reconnects" if self.metrics.counters["connects"] else "connects"] += 1
+        self._listener_task = self._loop.create_task(self._listen_loop(reader))
+
+        if self._breaker.state != CircuitState.CLOSED:
+            _LOG.info(f"[{self.name}] Connection restored, circuit closed")
+        self._breaker.record_success()
+
+        if self._state == PowerState.OFF:
+            # Refresh state right away instead of waiting for the backed-off poll
+            self._scheduler.reset()
+            self._wake()
+
+    def _record_connect_failure(self, error: Exception):
+        self.metrics.counters["connect_failures"] += 1
+        opened = self._breaker.record_failure(self._loop.time())
+
+        if self._breaker.failures == 1:
+            _LOG.warning(f"[{self.name}] Connection failed: {error}")
+        else:
+            _LOG.debug(f"[{self.name}] Connection failed ({self._breaker.failures} in a row): {error}")
+
+        if opened:
+            _LOG.info(f"[{self.name}] Circuit open, probing {self._config.host}:{self._config.port} in the background")
+        if self._breaker.state == CircuitState.OPEN and self._is_polling and not self._is_probing():
+            self._probe_task = self._loop.create_task(self._probe_loop())
+
+    def _connect_failure_result(self) -> CommandResult:
+        return self._DEVICE_OFF_RESULT if self._breaker.state != CircuitState.CLOSED else self._CONNECT_FAILED_RESULT
+
+    def _is_connecting(self) -> bool:
+        return self._connect_task is not None and not self._connect_task.done()
+
+    def _is_probing(self) -> bool:
+        return self._probe_task is not None and not self._probe_task.done()
+
+    async def _probe_loop(self):
+        # Connects outside the command lock so button presses never wait on a doomed attempt
+        while self._is_polling and self._breaker.state != CircuitState.CLOSED:
+            try:
+                await asyncio.sleep(max(0.0, self._breaker.retry_at - self._loop.time()))
+                if self.is_connected or not self._breaker.try_half_open(self._loop.time()):
+                    continue
+
+                try:
+                    reader, writer = await self._open_connection(const.PROBE_CONNECT_TIMEOUT)
+                except (asyncio.TimeoutError, OSError) as e:
+                    self._breaker.record_failure(self._loop.time())
+                    self.metrics.counters["connect_failures"] += 1
+                    _LOG.debug(f"[{self.name}] Probe failed, retrying in "
+                               f"{self._breaker.retry_at - self._loop.time():.1f}s: {e.__class__.__name__}")
+                    continue
+
+                await self._adopt_or_close(reader, writer)
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                _LOG.error(f"[{self.name}] Probe error: {e}")
+                self._breaker.record_failure(self._loop.time())
 
     async def _disconnect(self):
+        listener = self._listener_task
+        self._listener_task = None
+        if listener and listener is not asyncio.current_task():
+            listener.cancel()
+
+        self._fail_pending(ConnectionResetError("Connection closed"))
+
         if self._writer:
+            self.metrics.counters["disconnects"] += 1
             try:
                 self._writer.close()
                 await self._writer.wait_closed()
@@ -334,99 +1404,147 @@ class MadVRDevice:
                 self._writer = None
                 self._reader = None
 
+    async def _listen_loop(self, reader: asyncio.StreamReader):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    _LOG.info(f"[{self.name}] Connection closed by device")
+                    break
+
+                self._last_activity = self._loop.time()
+                self.metrics.counters["bytes_in"] += len(line)
+                message = parse_line(line)
+                if message is None:
+                    continue
+
+                _LOG.debug(f"[{self.name}] Received: {message.line}")
+
+                self._dispatch_line(message)
+
+        except asyncio.CancelledError:
+            return
+        except Exception as e:
+            _LOG.debug(f"[{self.name}] Listener error: {e}")
+
+        if self._reader is reader:
+            await self._disconnect()
+            # Reconnect in the background from the next periodic run
+            self._wake()
+
+    def _handle_notification(self, message: Message):
+        _LOG.debug(f"[{self.name}] Notification: {message.line}")
+
+        if isinstance(message, IncomingSignal):
+            self._set_power_state(PowerState.ON, message.summary)
+            self._emit_signal_sensor()
+        elif isinstance(message, NoSignal):
+            self._set_power_state(PowerState.STANDBY, "No Signal (Standby)")
+            self._emit_signal_sensor()
+        elif isinstance(message, AspectRatio):
+            self._set_aspect_ratio(message.text)
+        elif isinstance(message, MaskingRatio):
+            self._set_masking_ratio(message.text)
+        elif isinstance(message, Temperatures):
+            self._set_temperatures(message.values)
+        elif message.keyword == const.CMD_STANDBY:
+            self._set_power_state(PowerState.STANDBY, "Standby Mode")
+            self._emit_signal_sensor()
+        elif message.keyword == const.CMD_POWER_OFF:
+            self._set_power_state(PowerState.OFF, "Powered Off")
+            self._emit_signal_sensor()
+
     async def _fetch_mac_address(self):
         _LOG.info(f"[{self.name}] Attempting to fetch MAC address...")
         try:
             result = await self._send_command(const.CMD_GET_MAC_ADDRESS)
             _LOG.info(f"[{self.name}] MAC address query result: {result}")
-            
-            if result["success"] and result.get("data"):
-                response_data = result["data"]
-                _LOG.debug(f"[{self.name}] MAC address raw response: {response_data}")
-                
-                if "MacAddress" in response_data:
-                    lines = response_data.split('\n')
-                    for line in lines:
-                        line = line.strip()
-                        if line.startswith("MacAddress"):
-                            parts = line.split()
-                            if len(parts) >= 2:
-                                mac_address = parts[1]
-                                self._config.set_mac_address(mac_address)
-                                _LOG.info(f"[{self.name}] MAC address stored in config: {mac_address}")
-                                return
-                
-                _LOG.error(f"[{self.name}] Could not parse MAC address from response")
-            else:
-                _LOG.error(f"[{self.name}] Failed to get MAC address: {result.get('error')}")
+            self._store_mac_address(result)
         except Exception as e:
             _LOG.error(f"[{self.name}] Exception fetching MAC address: {e}", exc_info=True)
 
-    async def _wake_on_lan(self) -> dict:
+    def _store_mac_address(self, result: CommandResult):
+        if not result.success:
+            _LOG.error(f"[{self.name}] Failed to get MAC address: {result.error}")
+        elif isinstance(result.message, MacAddress):
+            mac_address = result.message.address
+            self._config.set_mac_address(mac_address)
+            _LOG.info(f"[{self.name}] MAC address stored in config: {mac_address}")
+        else:
+            _LOG.error(f"[{self.name}] Could not parse MAC address from response: {result.message}")
+
+    async def _wake_on_lan(self) -> CommandResult:
         mac_address = self._config.mac_address
         
         if not mac_address:
             _LOG.error(f"[{self.name}] No MAC address available for WOL")
-            return {"success": False, "error": "No MAC address configured"}
+            return CommandResult.failed("No MAC address configured")
 
         try:
             mac_with_colons = mac_address.replace("-", ":")
-            _LOG.info(f"[{self.name}] Sending WOL packet to MAC: {mac_with_colons}")
-            
             mac_bytes = bytes.fromhex(mac_with_colons.replace(":", ""))
             magic_packet = b'\xff' * 6 + mac_bytes * 16
+            targets = await self._loop.run_in_executor(None, self._wol_targets)
 
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-            sock.sendto(magic_packet, ('<broadcast>', 9))
-            sock.close()
-
-            _LOG.info(f"[{self.name}] WOL packet sent successfully")
+            started = self._loop.time()
+            deadline = started + const.WOL_READY_TIMEOUT
+            next_burst = started
+            attempt = 0
 
-            initial_delay = 12
-            _LOG.info(f"[{self.name}] Waiting {initial_delay} seconds for device to start booting...")
-            await asyncio.sleep(initial_delay)
+            while self._loop.time() < deadline:
+                if self._loop.time() >= next_burst:
+                    _LOG.info(f"[{self.name}] Sending WOL packets to MAC {mac_with_colons} via {', '.join(targets)}")
+                    await self._send_magic_packet(magic_packet, targets)
+                    next_burst = self._loop.time() + const.WOL_RESEND_INTERVAL
 
-            max_retries = 6
-            retry_interval = 5
-            total_wait = initial_delay
-            
-            for attempt in range(1, max_retries + 1):
-                _LOG.info(f"[{self.name}] Connection attempt {attempt}/{max_retries} (elapsed: {total_wait}s)")
-                
+                attempt += 1
                 try:
-                    reader, writer = await asyncio.wait_for(
-                        asyncio.open_connection(self._config.host, self._config.port),
-                        timeout=3.0
-                    )
-                    
-                    welcome = await asyncio.wait_for(
-                        reader.readline(),
-                        timeout=2.0
-                    )
-                    welcome_msg = welcome.decode().strip()
-                    
-                    writer.close()
-                    await writer.wait_closed()
-                    
-                    _LOG.info(f"[{self.name}] Device responded after {total_wait}s: {welcome_msg}")
-                    _LOG.info(f"[{self.name}] Wake-on-LAN successful!")
-                    return {"success": True}
-                    
-                except (asyncio.TimeoutError, ConnectionRefusedError, OSError) as e:
-                    _LOG.debug(f"[{self.name}] Attempt {attempt} failed: {e.__class__.__name__}")
-                    
-                    if attempt < max_retries:
-                        _LOG.info(f"[{self.name}] Retrying in {retry_interval} seconds...")
-                        await asyncio.sleep(retry_interval)
-                        total_wait += retry_interval
-                    else:
-                        _LOG.error(f"[{self.name}] Device did not respond after {total_wait}s")
-                        return {
-                            "success": False, 
-                            "error": f"Device failed to wake up after {total_wait} seconds"
-                        }
+                    reader, writer = await self._open_connection(const.WOL_PROBE_TIMEOUT)
+                except (asyncio.TimeoutError, OSError) as e:
+                    _LOG.debug(f"[{self.name}] Readiness probe {attempt} failed: {e.__class__.__name__}")
+                    await asyncio.sleep(const.WOL_PROBE_INTERVAL)
+                    continue
+
+                # Hand the probe's connection to the device instead of reconnecting
+                await self._adopt_or_close(reader, writer)
+
+                elapsed = self._loop.time() - started
+                _LOG.info(f"[{self.name}] Wake-on-LAN successful, device ready after {elapsed:.1f}s")
+                return RESULT_OK
+
+            _LOG.error(f"[{self.name}] Device did not respond after {const.WOL_READY_TIMEOUT:.0f}s")
+            return CommandResult.failed(f"Device failed to wake up after {const.WOL_READY_TIMEOUT:.0f} seconds")
 
         except Exception as e:
             _LOG.error(f"[{self.name}] Wake-on-LAN failed: {e}", exc_info=True)
-            return {"success": False, "error": str(e)}
\ No newline at end of file
+            return CommandResult.failed(str(e))
+
+    def _wol_targets(self) -> list[str]:
+        targets = ["255.255.255.255"]
+        try:
+            network = _interface_network(self._config.host)
+            if network is None:
+                # Not on a local interface's network, the netmask of a routed network is unknown and
+                # assumed to be WOL_BROADCAST_PREFIX bits long
+                network = ipaddress.ip_network(f"{self._config.host}/{const.WOL_BROADCAST_PREFIX}", strict=False)
+            # Directed broadcast, which routers forward more often than a limited broadcast
+            if network.prefixlen < 31:
+                targets.insert(0, str(network.broadcast_address))
+        except (ValueError, OSError) as e:
+            _LOG.debug(f"[{self.name}] No directed broadcast for {self._config.host}: {e}")
+        return targets
+
+    async def _send_magic_packet(self, magic_packet: bytes, targets: list[str]):
+        transport, _ = await self._loop.create_datagram_endpoint(
+            asyncio.DatagramProtocol,
+            family=socket.AF_INET,
+            allow_broadcast=True
+        )
+        try:
+            for burst in range(const.WOL_BURST_COUNT):
+                for target in targets:
+                    transport.sendto(magic_packet, (target, const.WOL_PORT))
+                if burst < const.WOL_BURST_COUNT - 1:
+                    await asyncio.sleep(const.WOL_BURST_INTERVAL)
+        finally:
+            transport.close()
@@ -0,0 +1,150 @@
+"""
+Discovery of madVR Envy units on the local network.
+
+The Envy does not announce itself, so the networks of the local interfaces
+are swept for the IP control port with a bounded number of concurrent
+connection attempts. A host counts as an Envy when it greets with the
+protocol's welcome banner.
+
+:copyright: (c) 2025 by Meir Miyara
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import time
+from typing import Iterable
+
+import ifaddr
+
+from uc_intg_madvr import const
+
+_LOG = logging.getLogger(__name__)
+
+
+class DiscoveredDevice:
+    """An Envy that answered on the IP control port."""
+
+    __slots__ = ("host", "port", "banner")
+
+    def __init__(self, host: str, port: int, banner: str):
+        self.host = host
+        self.port = port
+        self.banner = banner
+
+    @property
+    def version(self) -> str:
+        """Firmware version from the banner, e.g. ``1.1.3.0``, empty if the banner has none."""
+        last = self.banner.rsplit(" ", 1)[-1]
+        return last[1:] if last[:1] in ("v", "V") else ""
+
+    def __repr__(self) -> str:
+        return f"DiscoveredDevice({self.host}:{self.port}, {self.banner!r})"
+
+
+def is_welcome_banner(line: str) -> bool:
+    """Whether a line is the greeting an Envy sends to new connections, e.g. ``WELCOME to Envy v1.1.3.0``."""
+    words = line.split()
+    return bool(words) and words[0] == "WELCOME" and any(word.lower() in ("envy", "madvr") for word in words[1:])
+
+
+def interface_addresses() -> list[ipaddress.IPv4Interface]:
+    """IPv4 addresses of the local interfaces with their netmask, loopback excluded.
+
+    Blocking, reads the interface list from the OS.
+    """
+    addresses = []
+    for adapter in ifaddr.get_adapters():
+        for ip in adapter.ips:
+            if not isinstance(ip.ip, str):
+                continue  # IPv6 addresses are (address, flowinfo, scope_id) tuples
+            address = ipaddress.IPv4Interface(f"{ip.ip}/{ip.network_prefix}")
+            if not address.is_loopback and address not in addresses:
+                addresses.append(address)
+    return addresses
+
+
+def local_networks(min_prefix_length: int = const.DISCOVERY_MIN_PREFIX_LENGTH) -> list[ipaddress.IPv4Network]:
+    """Networks of the local interfaces, link-local excluded.
+
+    A network larger than min_prefix_length allows is swept only around the
+    local address, so a /16 does not turn into 65k connection attempts.
+    Blocking, run it in an executor.
+    """
+    networks = []
+    for address in interface_addresses():
+        if address.is_link_local or address.ip.is_unspecified:
+            continue
+        network = address.network
+        if network.prefixlen < min_prefix_length:
+            network = ipaddress.ip_network(f"{address.ip}/{min_prefix_length}", strict=False)
+        if network not in networks:
+            networks.append(network)
+    return networks
+
+
+async def probe(host: str, port: int = const.DEFAULT_PORT,
+                timeout: float = const.DISCOVERY_PROBE_TIMEOUT) -> DiscoveredDevice | None:
+    """Connect to a host and return it if it greets like an Envy, None otherwise."""
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=timeout)
+    except (OSError, asyncio.TimeoutError):
+        return None
+
+    try:
+        line = await asyncio.wait_for(reader.readline(), timeout=timeout)
+    except (OSError, asyncio.TimeoutError):
+        return None
+    finally:
+        writer.close()
+
+    banner = line.decode(errors="replace").strip()
+    if not is_welcome_banner(banner):
+        _LOG.debug(f"Port {port} open on {host}, but not an Envy: {banner!r}")
+        return None
+    return DiscoveredDevice(host, port, banner)
+
+
+async def discover(
+    networks: Iterable[ipaddress.IPv4Network] | None = None,
+    port: int = const.DEFAULT_PORT,
+    timeout: float = const.DISCOVERY_PROBE_TIMEOUT,
+    concurrency: int = const.DISCOVERY_CONCURRENCY,
+) -> list[DiscoveredDevice]:
+    """Sweep networks for Envy units.
+
+    Args:
+        networks: Networks to sweep, the local networks if None
+        port: IP control port
+        timeout: Seconds to wait for each connection and its banner
+        concurrency: Connection attempts in flight at once
+
+    Returns:
+        The units found, in address order
+    """
+    loop = asyncio.get_running_loop()
+    if networks is None:
+        networks = await loop.run_in_executor(None, local_networks)
+    networks = list(networks)
+
+    hosts = iter(dict.fromkeys(str(host) for network in networks for host in network.hosts()))
+    found: list[DiscoveredDevice] = []
+    started = time.monotonic()
+
+    async def worker():
+        # Workers share one iterator, no more than concurrency connections are open at once
+        for host in hosts:
+            device = await probe(host, port, timeout)
+            if device is not None:
+                _LOG.info(f"Discovered {device.banner} at {host}:{port}")
+                found.append(device)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+
+    found.sort(key=lambda device: ipaddress.IPv4Address(device.host))
+    _LOG.info(
+        f"Discovery swept {', '.join(str(network) for network in networks) or 'no networks'} "
+        f"in {time.monotonic() - started:.1f}s, found {len(found)} devices"
+    )
+    return found
@@ -7,14 +7,17 @@ madVR Envy integration driver.
 
 import asyncio
 import logging
-from typing import Any
+import os
+from typing import Any, Callable, Collection
 
 import ucapi
 from ucapi import DeviceStates, Events, EntityTypes
 
-from uc_intg_madvr.config import MadVRConfig
-from uc_intg_madvr.device import MadVRDevice, EVENTS as DeviceEvents, PowerState
+from uc_intg_madvr import const
+from uc_intg_madvr.config import MadVRConfig, MadVRDeviceConfig
+from uc_intg_madvr.device import MadVRDevice, DeviceScheduler, EventBus, EVENTS as DeviceEvents, PowerState
 from uc_intg_madvr.media_player import MadVRMediaPlayer
+from uc_intg_madvr.metrics import MetricsServer
 from uc_intg_madvr.remote import MadVRRemote
 from uc_intg_madvr.sensor import (
     MadVRSignalSensor,
@@ -24,16 +27,113 @@ from uc_intg_madvr.sensor import (
 )
 from uc_intg_madvr.select import MadVRAspectRatioSelect
 from uc_intg_madvr.setup import MadVRSetup
+from uc_intg_madvr.snapshot import StateSnapshot, snapshot_path
+from uc_intg_madvr.trace import TRACER
 
 _LOG = logging.getLogger(__name__)
 
+
+class _UpdateCoalescer:
+    """Merges attribute updates per entity and sends them once per flush window.
+
+    A poll cycle or a burst of notifications updates the same entities
+    several times in a row, the remote only needs the merged result.
+    """
+
+    def __init__(self, window: float):
+        self._window = window
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._handle: asyncio.Handle | None = None
+
+    def add(self, entity_id: str, attributes: dict[str, Any]):
+        pending = self._pending.get(entity_id)
+        if pending is None:
+            self._pending[entity_id] = dict(attributes)
+        else:
+            pending.update(attributes)
+
+        if self._handle is None:
+            self._handle = asyncio.get_running_loop().call_later(self._window, self.flush)
+
+    def flush(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+        pending, self._pending = self._pending, {}
+        for entity_id, attributes in pending.items():
+            api.configured_entities.update_attributes(entity_id, attributes)
+
+
+class _DeviceUnit:
+    """One configured Envy with its connection and the entities it backs."""
+
+    def __init__(
+        self,
+        config: MadVRDeviceConfig,
+        loop: asyncio.AbstractEventLoop,
+        events: EventBus,
+        scheduler: DeviceScheduler,
+        state_dir: str,
+    ):
+        self.config = config
+        self.snapshot = StateSnapshot(snapshot_path(state_dir, config.identifier), loop)
+        self.device = MadVRDevice(config, loop, events, scheduler, self.snapshot)
+        self.media_player = MadVRMediaPlayer(config, self.device)
+        self.remote = MadVRRemote(config, self.device)
+        self.sensors = [
+            MadVRSignalSensor(config, self.device),
+            MadVRTemperatureSensor(config, self.device, 0, "GPU"),
+            MadVRTemperatureSensor(config, self.device, 1, "CPU"),
+            MadVRTemperatureSensor(config, self.device, 2, "Board"),
+            MadVRTemperatureSensor(config, self.device, 3, "PSU"),
+            MadVRAspectRatioSensor(config, self.device),
+            MadVRMaskingRatioSensor(config, self.device),
+        ]
+        self.select = MadVRAspectRatioSelect(config, self.device)
+
+    @property
+    def entities(self) -> list:
+        return [self.media_player, self.remote, *self.sensors, self.select]
+
+    def routes(self) -> list[tuple[str, Callable[[dict[str, Any]], dict], Any]]:
+        """Device event identifier, attribute handler and target entity of every entity."""
+        return [
+            (self.device.identifier, _media_player_attributes, self.media_player),
+            (self.device.identifier, _remote_attributes, self.remote),
+            *((sensor.id, _entity_attributes, sensor) for sensor in self.sensors),
+            (self.select.id, _entity_attributes, self.select),
+        ]
+
+    def seed_attributes(self):
+        """Copy the last published device attributes into the entities, e.g. after restoring a snapshot."""
+        for identifier, handler, entity in self.routes():
+            attributes = handler(self.device.attributes(identifier))
+            if attributes:
+                entity.attributes.update(attributes)
+
+    def is_same_device(self, config: MadVRDeviceConfig) -> bool:
+        return (self.config.host, self.config.port, self.config.name) == (config.host, config.port, config.name)
+
+    def use_config(self, config: MadVRDeviceConfig):
+        """Switch to the current settings object of the same device, which may carry a new MAC address."""
+        self.config = config
+        self.device.use_config(config)
+
+
 api: ucapi.IntegrationAPI | None = None
 _config: MadVRConfig | None = None
-_device: MadVRDevice | None = None
-_media_player: MadVRMediaPlayer | None = None
-_remote: MadVRRemote | None = None
-_sensors: list = []
-_select: MadVRAspectRatioSelect | None = None
+
+# Configured units by device identifier, and the unit behind each entity id
+_units: dict[str, _DeviceUnit] = {}
+_entity_units: dict[str, _DeviceUnit] = {}
+_events: EventBus | None = None
+_scheduler: DeviceScheduler | None = None
+
+# Device event identifier -> (attribute handler, configured entity id) pairs
+_routes: dict[str, list[tuple[Callable[[dict[str, Any]], dict], str]]] = {}
+_updates = _UpdateCoalescer(const.UPDATE_FLUSH_WINDOW)
+_metrics_server: MetricsServer | None = None
 
 
 def _device_state_to_media_player_state(dev_state: PowerState) -> ucapi.media_player.States:
@@ -72,106 +172,141 @@ def _device_state_to_remote_state(dev_state: PowerState) -> ucapi.remote.States:
         return ucapi.remote.States.UNKNOWN
 
 
-async def on_device_update(identifier: str, update: dict[str, Any] | None) -> None:
-    """Handle device state updates."""
-    if not update:
-        return
+def _media_player_attributes(update: dict[str, Any]) -> dict:
+    """Translate a device update into media player attributes."""
+    mp_attributes = {}
+
+    if "state" in update:
+        mp_state = _device_state_to_media_player_state(update["state"])
+        mp_attributes[ucapi.media_player.Attributes.STATE] = mp_state
+        _LOG.info(f"Media Player state update: {update['state']} → {mp_state}")
+
+    if "signal_info" in update:
+        mp_attributes[ucapi.media_player.Attributes.MEDIA_TITLE] = update["signal_info"]
+
+    return mp_attributes
 
-    _LOG.debug(f"Device update for {identifier}: {update}")
 
-    # Handle media player updates
-    if _media_player and identifier == _media_player.id.split('.')[1]:
-        if api.configured_entities.contains(_media_player.id):
-            mp_attributes = {}
+def _remote_attributes(update: dict[str, Any]) -> dict:
+    """Translate a device update into remote attributes."""
+    if "state" in update:
+        return {ucapi.remote.Attributes.STATE: _device_state_to_remote_state(update["state"])}
+    return {}
 
-            if "state" in update:
-                mp_state = _device_state_to_media_player_state(update["state"])
-                mp_attributes[ucapi.media_player.Attributes.STATE] = mp_state
-                _LOG.info(f"Media Player state update: {update['state']} → {mp_state}")
 
-            if "signal_info" in update:
-                mp_attributes[ucapi.media_player.Attributes.MEDIA_TITLE] = update["signal_info"]
+def _entity_attributes(update: dict[str, Any]) -> dict:
+    """Sensor and select updates already carry entity attributes."""
+    return update
 
-            if mp_attributes:
-                api.configured_entities.update_attributes(_media_player.id, mp_attributes)
 
-    # Handle remote updates
-    if _remote and identifier == _remote.id.split('.')[1]:
-        if api.configured_entities.contains(_remote.id):
-            if "state" in update:
-                remote_state = _device_state_to_remote_state(update["state"])
-                remote_attributes = {
-                    ucapi.remote.Attributes.STATE: remote_state
-                }
-                api.configured_entities.update_attributes(_remote.id, remote_attributes)
+def _build_routes():
+    """Index configured entities by the device event identifier that updates them."""
+    global _routes
 
-    # Handle sensor updates
-    for sensor in _sensors:
-        if identifier == sensor.id:
-            if api.configured_entities.contains(sensor.id):
-                api.configured_entities.update_attributes(sensor.id, update)
+    routes = {}
+    for unit in _units.values():
+        for identifier, handler, entity in unit.routes():
+            if api.configured_entities.contains(entity.id):
+                routes.setdefault(identifier, []).append((handler, entity.id))
+    _routes = routes
+
+
+def on_device_update(identifier: str, update: dict[str, Any] | None) -> None:
+    """Handle device state updates."""
+    if not update:
+        return
+
+    _LOG.debug(f"Device update for {identifier}: {update}")
 
-    # Handle select entity updates
-    if _select and identifier == _select.id:
-        if api.configured_entities.contains(_select.id):
-            api.configured_entities.update_attributes(_select.id, update)
+    for handler, entity_id in _routes.get(identifier, ()):
+        attributes = handler(update)
+        if attributes:
+            _updates.add(entity_id, attributes)
 
 
 async def _initialize_entities():
-    """Initialize device and entities."""
-    global _device, _media_player, _remote, _sensors, _select
+    """Create devices and entities for every configured unit, and drop units no longer configured."""
+    global _events, _scheduler
 
     if not _config or not _config.is_configured():
         _LOG.info("Integration not configured")
+        for identifier in list(_units):
+            await _remove_unit(identifier, forget=True)
+        _build_routes()
         return False
 
     try:
-        _LOG.info("Initializing madVR device and entities...")
+        _LOG.info("Initializing madVR devices and entities...")
 
         loop = asyncio.get_running_loop()
-        _device = MadVRDevice(_config, loop)
-
-        _device.events.on(DeviceEvents.UPDATE, on_device_update)
-
-        _media_player = MadVRMediaPlayer(_config, _device)
-        _remote = MadVRRemote(_config, _device)
-
-        # Create sensor entities
-        _sensors = [
-            MadVRSignalSensor(_config, _device),
-            MadVRTemperatureSensor(_config, _device, 0, "GPU"),
-            MadVRTemperatureSensor(_config, _device, 1, "CPU"),
-            MadVRTemperatureSensor(_config, _device, 2, "Board"),
-            MadVRTemperatureSensor(_config, _device, 3, "PSU"),
-            MadVRAspectRatioSensor(_config, _device),
-            MadVRMaskingRatioSensor(_config, _device),
-        ]
+        if _events is None:
+            _events = EventBus(loop)
+            _events.on(DeviceEvents.UPDATE, on_device_update)
+        if _scheduler is None:
+            _scheduler = DeviceScheduler(loop)
+
+        configured = {device_config.identifier: device_config for device_config in _config.devices}
+
+        for identifier in [identifier for identifier in _units if identifier not in configured]:
+            await _remove_unit(identifier, forget=True)
+
+        for identifier, device_config in configured.items():
+            unit = _units.get(identifier)
+            if unit and unit.is_same_device(device_config):
+                # Setup replaces the settings object when it re-adds a host, keep the running unit on the new one
+                unit.use_config(device_config)
+                continue
+            subscribed = []
+            if unit:
+                # Entities the remote subscribed to stay subscribed on the replacement unit
+                subscribed = [entity.id for entity in unit.entities if api.configured_entities.contains(entity.id)]
+                await _remove_unit(identifier)
+            await _add_unit(device_config, loop, subscribed)
+
+        _build_routes()
+
+        _LOG.info(f"✓ Entities initialized successfully for {len(_units)} devices")
+        return True
 
-        # Create select entity
-        _select = MadVRAspectRatioSelect(_config, _device)
+    except Exception as e:
+        _LOG.error(f"Failed to initialize entities: {e}", exc_info=True)
+        return False
 
-        _LOG.info(f"Media Player features: {_media_player.features}")
-        _LOG.info(f"Remote features: {_remote.features}")
-        _LOG.info(f"Created {len(_sensors)} sensor entities")
-        _LOG.info(f"Created select entity for aspect ratio mode")
 
-        api.available_entities.clear()
-        api.available_entities.add(_media_player)
-        api.available_entities.add(_remote)
+async def _add_unit(
+    device_config: MadVRDeviceConfig, loop: asyncio.AbstractEventLoop, subscribed: Collection[str] = ()
+):
+    unit = _DeviceUnit(device_config, loop, _events, _scheduler, _config.config_dir)
+    _units[device_config.identifier] = unit
 
-        for sensor in _sensors:
-            api.available_entities.add(sensor)
+    for entity in unit.entities:
+        api.available_entities.add(entity)
+        if entity.id in subscribed:
+            api.configured_entities.add(entity)
+        _entity_units[entity.id] = unit
 
-        api.available_entities.add(_select)
+    _LOG.info(f"[{device_config.name}] Created {len(unit.entities)} entities for {device_config.host}")
 
-        await _device.start_polling()
+    # Show the last known state right away, the first poll reconciles it
+    snapshot = await unit.snapshot.load()
+    if snapshot and unit.device.restore(snapshot):
+        unit.seed_attributes()
 
-        _LOG.info("✓ Entities initialized successfully")
-        return True
+    await unit.device.start_polling()
 
-    except Exception as e:
-        _LOG.error(f"Failed to initialize entities: {e}", exc_info=True)
-        return False
+
+async def _remove_unit(identifier: str, forget: bool = False):
+    unit = _units.pop(identifier)
+    await unit.device.stop_polling()
+    if forget:
+        await unit.snapshot.remove()
+
+    for entity in unit.entities:
+        api.available_entities.remove(entity.id)
+        api.configured_entities.remove(entity.id)
+        _entity_units.pop(entity.id, None)
+
+    _LOG.info(f"[{unit.config.name}] Removed entities for {unit.config.host}")
 
 
 async def on_setup_complete():
@@ -181,6 +316,8 @@ async def on_setup_complete():
     if await _initialize_entities():
         await api.set_device_state(DeviceStates.CONNECTED)
         _LOG.info("✓ Device state set to CONNECTED")
+    elif not _config.is_configured():
+        await api.set_device_state(DeviceStates.DISCONNECTED)
     else:
         await api.set_device_state(DeviceStates.ERROR)
         _LOG.error("✗ Entity initialization failed")
@@ -195,18 +332,18 @@ async def on_connect() -> None:
     if not _config:
         _config = MadVRConfig()
 
-    _config.reload_from_disk()
+    await _config.reload_from_disk()
 
-    if _config.is_configured() and not _device:
-        _LOG.info("Configuration found, reinitializing...")
+    if _config.is_configured():
+        if not _units:
+            _LOG.info("Configuration found, reinitializing...")
+        # Also picks up units added or removed while the remote was away
         if await _initialize_entities():
             await api.set_device_state(DeviceStates.CONNECTED)
         else:
             await api.set_device_state(DeviceStates.ERROR)
-    elif not _config.is_configured():
-        await api.set_device_state(DeviceStates.DISCONNECTED)
     else:
-        await api.set_device_state(DeviceStates.CONNECTED)
+        await api.set_device_state(DeviceStates.DISCONNECTED)
 
 
 async def on_disconnect() -> None:
@@ -218,16 +355,48 @@ async def on_subscribe_entities(entity_ids: list[str]):
     """Handle entity subscriptions."""
     _LOG.info(f"Entities subscription requested: {entity_ids}")
 
+    _build_routes()
+
     for entity_id in entity_ids:
-        if _media_player and entity_id == _media_player.id:
-            if _device:
-                await _device.update()
-        elif _remote and entity_id == _remote.id:
-            if _device and api.configured_entities.contains(_remote.id):
-                api.configured_entities.update_attributes(
-                    _remote.id,
-                    {ucapi.remote.Attributes.STATE: _device_state_to_remote_state(_device.state)}
+        unit = _entity_units.get(entity_id)
+        if not unit:
+            continue
+
+        device = unit.device
+        if entity_id == unit.media_player.id:
+            await device.update()
+            # Only changes are emitted, so send the subscriber the full current state
+            device.republish(device.identifier)
+        elif entity_id == unit.remote.id:
+            if api.configured_entities.contains(entity_id):
+                _updates.add(
+                    entity_id,
+                    {ucapi.remote.Attributes.STATE: _device_state_to_remote_state(device.state)}
                 )
+        else:
+            device.republish(entity_id)
+
+
+async def on_unsubscribe_entities(entity_ids: list[str]):
+    """Handle entity unsubscriptions."""
+    _LOG.info(f"Entities unsubscription requested: {entity_ids}")
+
+    _build_routes()
+
+
+async def _start_metrics_server():
+    """Serve device metrics locally when the metrics port environment variable is set."""
+    global _metrics_server
+
+    port = os.getenv(const.METRICS_PORT_ENV)
+    if not port:
+        return
+    try:
+        _metrics_server = MetricsServer(lambda: [unit.device for unit in _units.values()], port=int(port))
+        await _metrics_server.start()
+    except (ValueError, OSError) as e:
+        _LOG.warning(f"Metrics endpoint not started ({const.METRICS_PORT_ENV}={port}): {e}")
+        _metrics_server = None
 
 
 async def main():
@@ -248,8 +417,11 @@ async def main():
         api.listens_to(Events.CONNECT)(on_connect)
         api.listens_to(Events.DISCONNECT)(on_disconnect)
         api.listens_to(Events.SUBSCRIBE_ENTITIES)(on_subscribe_entities)
+        api.listens_to(Events.UNSUBSCRIBE_ENTITIES)(on_unsubscribe_entities)
 
         _config = MadVRConfig()
+        await _config.load()
+        TRACER.configure_from_env(dump_dir=_config.config_dir)
 
         if _config.is_configured():
             _LOG.info("Found existing configuration, pre-initializing for reboot survival")
@@ -258,6 +430,7 @@ async def main():
         setup_handler = MadVRSetup(api, _config, on_setup_complete)
 
         await api.init("driver.json", setup_handler.handle_setup)
+        await _start_metrics_server()
 
         _LOG.info("madVR integration initialized")
 
@@ -268,8 +441,12 @@ async def main():
     except Exception as e:
         _LOG.error(f"Driver error: {e}", exc_info=True)
     finally:
-        if _device:
-            await _device.stop_polling()
+        if _metrics_server:
+            await _metrics_server.stop()
+        for unit in _units.values():
+            await unit.device.stop_polling()
+        if _config:
+            await _config.flush()
 
 
 if __name__ == "__main__":
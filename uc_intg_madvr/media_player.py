@@ -11,19 +11,21 @@ from typing import Any
 from ucapi import StatusCodes
 from ucapi.media_player import Attributes, Commands, DeviceClasses, Features, MediaPlayer, States
 
-from uc_intg_madvr.config import MadVRConfig
+from uc_intg_madvr import const
+from uc_intg_madvr.config import MadVRDeviceConfig
 from uc_intg_madvr.device import MadVRDevice
+from uc_intg_madvr.trace import traced
 
 _LOG = logging.getLogger(__name__)
 
 
 class MadVRMediaPlayer(MediaPlayer):
 
-    def __init__(self, config: MadVRConfig, device: MadVRDevice):
+    def __init__(self, config: MadVRDeviceConfig, device: MadVRDevice):
         self._config = config
         self._device = device
 
-        entity_id = f"media_player.{config.host.replace('.', '_')}"
+        entity_id = f"media_player.{config.identifier}"
 
         features = [Features.ON_OFF]
 
@@ -45,6 +47,7 @@ class MadVRMediaPlayer(MediaPlayer):
 
         _LOG.info(f"Created status display entity: {entity_id} (device_class=RECEIVER)")
 
+    @traced("media_player")
     async def command_handler(
         self, entity: MediaPlayer, cmd_id: str, params: dict[str, Any] | None
     ) -> StatusCodes:
@@ -52,12 +55,12 @@ class MadVRMediaPlayer(MediaPlayer):
 
         try:
             if cmd_id == Commands.ON:
-                result = await self._device.send_command("Standby")
-                return StatusCodes.OK if result["success"] else StatusCodes.SERVER_ERROR
+                result = await self._device.power_on()
+                return StatusCodes.OK if result.success else StatusCodes.SERVER_ERROR
             
             elif cmd_id == Commands.OFF:
-                result = await self._device.send_command("Standby")
-                return StatusCodes.OK if result["success"] else StatusCodes.SERVER_ERROR
+                result = await self._device.power_off(const.CMD_STANDBY)
+                return StatusCodes.OK if result.success else StatusCodes.SERVER_ERROR
             
             else:
                 _LOG.debug(f"Ignoring unsupported command: {cmd_id}")
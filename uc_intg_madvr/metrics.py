@@ -0,0 +1,221 @@
+"""
+Connection and command metrics.
+
+Every device keeps fixed-size histograms of command round trip per command,
+lock wait, write time and connect time, plus counters for timeouts,
+reconnects and bytes on the wire. They are read through
+``MadVRDevice.diagnostics()`` or, when ``UC_MADVR_METRICS_PORT`` is set, from
+a local HTTP endpoint in Prometheus text format.
+
+:copyright: (c) 2025 by Meir Miyara
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import asyncio
+import json
+import logging
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Callable, Iterable
+
+from uc_intg_madvr import const
+from uc_intg_madvr.trace import TRACER
+
+_LOG = logging.getLogger(__name__)
+
+# Upper bucket bounds in seconds, the last bucket counts everything above
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Latency distribution in fixed buckets, memory does not grow with the number of samples."""
+
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile, capped at the largest sample."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return min(LATENCY_BUCKETS[index], self.max) if index < len(LATENCY_BUCKETS) else self.max
+        return self.max
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.sum / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.quantile(0.50) * 1000, 3),
+            "p95_ms": round(self.quantile(0.95) * 1000, 3),
+            "p99_ms": round(self.quantile(0.99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class DeviceMetrics:
+    """Metrics of one device connection.
+
+    Round trips are kept per command keyword (``KeyPress UP`` counts as
+    ``KeyPress``), so the number of series stays bounded by the protocol.
+    """
+
+    COUNTERS = (
+        "commands", "timeouts", "errors", "connects", "reconnects",
+        "connect_failures", "disconnects", "bytes_in", "bytes_out",
+    )
+
+    def __init__(self):
+        self.rtt: dict[str, Histogram] = {}
+        self.lock_wait = Histogram()
+        self.write = Histogram()
+        self.connect = Histogram()
+        self.counters: Counter[str] = Counter(dict.fromkeys(self.COUNTERS, 0))
+
+    def observe_rtt(self, command: str, seconds: float):
+        keyword = command.split(" ", 1)[0]
+        histogram = self.rtt.get(keyword)
+        if histogram is None:
+            histogram = self.rtt[keyword] = Histogram()
+        histogram.observe(seconds)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "counters": dict(self.counters),
+            "lock_wait": self.lock_wait.snapshot(),
+            "write": self.write.snapshot(),
+            "connect": self.connect.snapshot(),
+            "rtt": {keyword: histogram.snapshot() for keyword, histogram in sorted(self.rtt.items())},
+        }
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _histogram_lines(name: str, histogram: Histogram, labels: dict[str, str]) -> list[str]:
+    lines = []
+    cumulative = 0
+    for bound, bucket_count in zip(LATENCY_BUCKETS, histogram.counts):
+        cumulative += bucket_count
+        lines.append(f"{name}_bucket{_labels(**labels, le=repr(bound))} {cumulative}")
+    lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {histogram.count}")
+    lines.append(f"{name}_sum{_labels(**labels)} {histogram.sum}")
+    lines.append(f"{name}_count{_labels(**labels)} {histogram.count}")
+    return lines
+
+
+def render_prometheus(devices: Iterable[Any]) -> str:
+    """Metrics of every device in Prometheus text exposition format.
+
+    Args:
+        devices: Devices exposing ``name``, ``identifier``, ``metrics`` and ``queue_stats``
+    """
+    histograms = {
+        "madvr_command_rtt_seconds": "Time from writing a command to its reply",
+        "madvr_lock_wait_seconds": "Time waiting for the connection lock before writing",
+        "madvr_write_seconds": "Time to write and drain a command batch",
+        "madvr_connect_seconds": "Time to connect and receive the welcome banner",
+    }
+    series: dict[str, list[str]] = {name: [] for name in histograms}
+    counters: dict[str, list[str]] = {name: [] for name in DeviceMetrics.COUNTERS}
+    queue_depth = []
+
+    for device in devices:
+        metrics: DeviceMetrics = device.metrics
+        labels = {"device": device.identifier, "name": device.name}
+        for keyword, histogram in sorted(metrics.rtt.items()):
+            series["madvr_command_rtt_seconds"] += _histogram_lines(
+                "madvr_command_rtt_seconds", histogram, {**labels, "command": keyword}
+            )
+        series["madvr_lock_wait_seconds"] += _histogram_lines("madvr_lock_wait_seconds", metrics.lock_wait, labels)
+        series["madvr_write_seconds"] += _histogram_lines("madvr_write_seconds", metrics.write, labels)
+        series["madvr_connect_seconds"] += _histogram_lines("madvr_connect_seconds", metrics.connect, labels)
+        for counter in DeviceMetrics.COUNTERS:
+            counters[counter].append(f"madvr_{counter}_total{_labels(**labels)} {metrics.counters[counter]}")
+        for lane, stats in device.queue_stats.items():
+            queue_depth.append(f"madvr_queue_depth{_labels(**labels, lane=lane)} {stats['depth']}")
+
+    lines = []
+    for name, description in histograms.items():
+        lines += [f"# HELP {name} {description}", f"# TYPE {name} histogram", *series[name]]
+    for counter, samples in counters.items():
+        lines += [f"# TYPE madvr_{counter}_total counter", *samples]
+    lines += ["# HELP madvr_queue_depth Commands waiting per lane", "# TYPE madvr_queue_depth gauge", *queue_depth]
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Minimal local HTTP endpoint.
+
+    Serves ``/metrics`` in Prometheus text format, ``/diagnostics`` as JSON and
+    ``/traces`` as the buffered command traces in JSONL.
+    """
+
+    def __init__(self, devices: Callable[[], Iterable[Any]], host: str = const.METRICS_HOST, port: int = 0):
+        self._devices = devices
+        self.host = host
+        self.port = port
+        self._server: asyncio.Server | None = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        _LOG.info(f"Metrics available at http://{self.host}:{self.port}/metrics")
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await asyncio.wait_for(reader.readline(), timeout=const.COMMAND_TIMEOUT)
+            # Headers are not needed, but read them so the client sees a clean close
+            while (await asyncio.wait_for(reader.readline(), timeout=const.COMMAND_TIMEOUT)).strip():
+                pass
+
+            parts = request.decode(errors="replace").split()
+            path = parts[1] if len(parts) > 1 else "/"
+            if path == "/metrics":
+                status, content_type = "200 OK", "text/plain; version=0.0.4"
+                body = render_prometheus(self._devices())
+            elif path == "/diagnostics":
+                status, content_type = "200 OK", "application/json"
+                body = json.dumps({device.identifier: device.diagnostics() for device in self._devices()}, indent=2)
+            elif path == "/traces":
+                status, content_type = "200 OK", "application/x-ndjson"
+                body = TRACER.to_jsonl()
+            else:
+                status, content_type, body = "404 Not Found", "text/plain", "Not found\n"
+
+            payload = body.encode()
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode() + payload
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError) as e:
+            _LOG.debug(f"Metrics request failed: {e}")
+        finally:
+            writer.close()
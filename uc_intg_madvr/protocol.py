@@ -0,0 +1,211 @@
+"""
+madVR Envy IP control protocol messages.
+
+Every line received from the Envy is decoded once, straight from bytes, into
+a small message object. Decoders are looked up by the line's first token.
+
+:copyright: (c) 2025 by Meir Miyara
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from typing import Callable
+
+from uc_intg_madvr import const
+
+
+class Message:
+    """A line from the Envy that has no dedicated message type.
+
+    ``keyword`` is the first token of the line, ``text`` the rest of it.
+    """
+
+    __slots__ = ("keyword", "text")
+
+    def __init__(self, keyword: str, text: str = ""):
+        self.keyword = keyword
+        self.text = text
+
+    @property
+    def line(self) -> str:
+        return f"{self.keyword} {self.text}" if self.text else self.keyword
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.line!r})"
+
+
+class Ok(Message):
+    """Command acknowledgement."""
+
+    __slots__ = ()
+
+
+class Error(Message):
+    """Command rejected by the Envy, ``message`` is the unquoted reason."""
+
+    __slots__ = ("message",)
+
+    def __init__(self, keyword: str, text: str):
+        super().__init__(keyword, text)
+        self.message = text.strip('"')
+
+
+class IncomingSignal(Message):
+    """Incoming signal description.
+
+    Example: ``IncomingSignalInfo 3840x2160 23.976p 2D 422 10bit HDR10 2020 TV 16:9``
+    """
+
+    __slots__ = ("resolution", "frame_rate", "dimension", "chroma",
+                 "bit_depth", "hdr", "colorimetry", "black_levels", "aspect")
+
+    def __init__(self, keyword: str, text: str):
+        super().__init__(keyword, text)
+        fields = text.split()
+        fields += [""] * (9 - len(fields))
+        (self.resolution, self.frame_rate, self.dimension, self.chroma,
+         self.bit_depth, self.hdr, self.colorimetry, self.black_levels, self.aspect) = fields[:9]
+
+    @property
+    def summary(self) -> str:
+        """Short description shown in the UI, e.g. ``3840x2160 23.976p 2D 422``."""
+        fields = (self.resolution, self.frame_rate, self.dimension, self.chroma)
+        return " ".join(field for field in fields if field) or "Signal Active"
+
+
+class NoSignal(Message):
+    """No incoming signal."""
+
+    __slots__ = ()
+
+
+class AspectRatio(Message):
+    """Detected aspect ratio of the content.
+
+    Example: ``AspectRatio 3840:1600 2.400 240 "Panavision"``
+    """
+
+    __slots__ = ("resolution", "ratio", "ratio_int", "name")
+
+    def __init__(self, keyword: str, text: str):
+        super().__init__(keyword, text)
+        fields = text.split(maxsplit=3)
+        self.resolution = fields[0]
+        self.ratio = float(fields[1])
+        self.ratio_int = int(fields[2])
+        self.name = fields[3].strip('"') if len(fields) > 3 else ""
+
+
+class MaskingRatio(Message):
+    """Current masking ratio.
+
+    Example: ``MaskingRatio 3840:1600 2.400 240``
+    """
+
+    __slots__ = ("resolution", "ratio", "ratio_int")
+
+    def __init__(self, keyword: str, text: str):
+        super().__init__(keyword, text)
+        fields = text.split()
+        self.resolution = fields[0]
+        self.ratio = float(fields[1])
+        self.ratio_int = int(fields[2])
+
+
+class Temperatures(Message):
+    """Temperatures in degrees Celsius.
+
+    Example: ``Temperatures 65 58 42 45``
+    """
+
+    __slots__ = ("gpu", "cpu", "board", "psu")
+
+    def __init__(self, keyword: str, text: str):
+        super().__init__(keyword, text)
+        self.gpu, self.cpu, self.board, self.psu = (int(value) for value in text.split()[:4])
+
+    @property
+    def values(self) -> tuple[int, int, int, int]:
+        return self.gpu, self.cpu, self.board, self.psu
+
+
+class MacAddress(Message):
+    """MAC address of the Envy.
+
+    Example: ``MacAddress 01-02-03-04-05-06``
+    """
+
+    __slots__ = ("address",)
+
+    def __init__(self, keyword: str, text: str):
+        super().__init__(keyword, text)
+        self.address = text.split()[0]
+
+
+# Shared instance, acknowledgements carry no data
+OK = Ok(const.RESPONSE_OK)
+
+_DECODERS: dict[bytes, tuple[str, Callable[[str, str], Message]]] = {
+    keyword.encode(): (keyword, decoder) for keyword, decoder in (
+        (const.RESPONSE_ERROR, Error),
+        (const.NOTIFY_INCOMING_SIGNAL, IncomingSignal),
+        (const.NO_SIGNAL, NoSignal),
+        (const.NOTIFY_ASPECT_RATIO, AspectRatio),
+        (const.NOTIFY_MASKING_RATIO, MaskingRatio),
+        (const.NOTIFY_TEMPERATURES, Temperatures),
+        (const.NOTIFY_MAC_ADDRESS, MacAddress),
+    )
+}
+_OK_LINE = const.RESPONSE_OK.encode()
+
+
+def parse_line(line: bytes) -> Message | None:
+    """Decode one received line, returns None for a blank line.
+
+    Lines whose fields cannot be decoded come back as a plain ``Message``.
+    """
+    line = line.strip()
+    if line == _OK_LINE:
+        return OK
+    if not line:
+        return None
+
+    token, _, payload = line.partition(b" ")
+    text = payload.decode(errors="replace").strip()
+
+    entry = _DECODERS.get(token)
+    if entry is None:
+        return Message(token.decode(errors="replace"), text)
+
+    keyword, decoder = entry
+    try:
+        return decoder(keyword, text)
+    except (ValueError, IndexError):
+        return Message(keyword, text)
+
+
+class CommandResult:
+    """Outcome of a command sent to the Envy.
+
+    ``message`` is the data line answering a query, ``error`` the reason a
+    command failed.
+    """
+
+    __slots__ = ("success", "message", "error")
+
+    def __init__(self, success: bool, message: Message | None = None, error: str | None = None):
+        self.success = success
+        self.message = message
+        self.error = error
+
+    @classmethod
+    def failed(cls, error: str) -> "CommandResult":
+        return cls(False, error=error)
+
+    def __repr__(self) -> str:
+        if self.success:
+            return f"CommandResult(success, {self.message!r})" if self.message else "CommandResult(success)"
+        return f"CommandResult(failed, {self.error!r})"
+
+
+# Shared results for outcomes that carry no data
+RESULT_OK = CommandResult(True)
@@ -13,20 +13,91 @@ from ucapi import StatusCodes
 from ucapi.remote import Remote, Attributes, Commands, Features, States
 from ucapi.ui import EntityCommand, Size, UiPage, create_ui_text
 
-from uc_intg_madvr.config import MadVRConfig
-from uc_intg_madvr.device import MadVRDevice
+from uc_intg_madvr.commands import HOLD_COMMANDS, SIMPLE_COMMANDS
+from uc_intg_madvr.config import MadVRDeviceConfig
+from uc_intg_madvr.device import MadVRDevice, PowerState
+from uc_intg_madvr.protocol import CommandResult, RESULT_OK
+from uc_intg_madvr.trace import traced
 from uc_intg_madvr import const
 
 _LOG = logging.getLogger(__name__)
 
 
+def _send_cmd(name: str) -> EntityCommand:
+    """UI button sending the protocol command of a simple command."""
+    return EntityCommand("send_cmd", {"command": SIMPLE_COMMANDS[name]})
+
+
+class _KeyStreamer:
+    """Streams key presses to the device at a rate-limited cadence.
+
+    Presses are written without waiting for the previous OK. A stream runs
+    until one interval has passed since its last send; further presses of
+    the same key extend it up to KEY_BACKLOG_MAX, and a different key
+    replaces whatever is still queued, so the OSD follows the latest intent
+    instead of replaying a backlog. The press that opens a stream returns as
+    soon as the presses it asked for are answered.
+    """
+
+    def __init__(self, device: MadVRDevice):
+        self._device = device
+        self._command: str | None = None
+        self._remaining = 0
+        self._interval = const.KEY_STREAM_INTERVAL
+        self._sending = False
+        self._task: asyncio.Task | None = None
+
+    @property
+    def is_streaming(self) -> bool:
+        """Whether a stream is still open, presses made now join it."""
+        return self._sending
+
+    async def press(self, command: str, count: int = 1, interval: float | None = None) -> CommandResult:
+        if command != self._command:
+            if self._remaining:
+                _LOG.debug(f"Dropping {self._remaining} queued '{self._command}' presses for '{command}'")
+            self._command = command
+            self._remaining = 0
+
+        self._remaining = min(self._remaining + count, max(count, const.KEY_BACKLOG_MAX))
+        self._interval = max(interval or 0.0, const.KEY_STREAM_INTERVAL)
+
+        if self.is_streaming:
+            return RESULT_OK
+
+        self._sending = True
+        sent = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._stream(sent))
+        # Answered once the presses asked for here are, the stream stays open in the background
+        presses = await asyncio.shield(sent)
+        results = await asyncio.shield(asyncio.gather(*presses))
+        failed = [result for result in results if not result.success]
+        return failed[-1] if failed else RESULT_OK
+
+    async def _stream(self, sent: asyncio.Future):
+        in_flight = []
+        try:
+            while self._remaining > 0:
+                self._remaining -= 1
+                in_flight.append(asyncio.create_task(self._device.send_command(self._command)))
+                if self._remaining == 0 and not sent.done():
+                    sent.set_result(list(in_flight))
+                # Open for one interval after each send, so taps made in that window are paced and merged
+                await asyncio.sleep(self._interval)
+        finally:
+            self._sending = False
+            if not sent.done():
+                sent.set_result(list(in_flight))
+
+
 class MadVRRemote(Remote):
 
-    def __init__(self, config: MadVRConfig, device: MadVRDevice):
+    def __init__(self, config: MadVRDeviceConfig, device: MadVRDevice):
         self._config = config
         self._device = device
+        self._key_streamer = _KeyStreamer(device)
 
-        entity_id = f"remote.{config.host.replace('.', '_')}"
+        entity_id = f"remote.{config.identifier}"
 
         # Define simple commands for custom button mapping
         simple_commands = self._get_simple_commands()
@@ -45,9 +116,9 @@ class MadVRRemote(Remote):
 
     def _get_simple_commands(self) -> list[str]:
         """Return list of simple commands for custom button mapping."""
-        # Return the keys from the command map to ensure consistency
-        return list(self._get_command_map().keys())
+        return list(SIMPLE_COMMANDS)
 
+    @traced("remote")
     async def command_handler(
         self, entity: Remote, cmd_id: str, params: dict[str, Any] | None = None
     ) -> StatusCodes:
@@ -55,18 +126,11 @@ class MadVRRemote(Remote):
 
         try:
             if cmd_id == Commands.ON:
-                task = asyncio.create_task(self._device.send_command(const.CMD_STANDBY))
-
-                try:
-                    result = await asyncio.wait_for(task, timeout=3.0)
-                    return StatusCodes.OK if result["success"] else StatusCodes.SERVER_ERROR
-                except asyncio.TimeoutError:
-                    _LOG.info("Power ON command initiated (may take up to 40s for WOL)")
-                    return StatusCodes.OK
+                return await self._power_on()
 
             elif cmd_id == Commands.OFF:
-                result = await self._device.send_command(const.CMD_POWER_OFF)
-                return StatusCodes.OK if result["success"] else StatusCodes.SERVER_ERROR
+                result = await self._device.power_off()
+                return StatusCodes.OK if result.success else StatusCodes.SERVER_ERROR
 
             elif cmd_id == Commands.SEND_CMD:
                 if not params or "command" not in params:
@@ -83,25 +147,24 @@ class MadVRRemote(Remote):
                     command = device_command
 
                 # Check if this is a power-related command that might trigger WOL
-                if command == const.CMD_STANDBY and self._device.state.value == "OFF":
+                off_or_waking = self._device.state == PowerState.OFF or self._device.power_transition
+                if command == const.CMD_STANDBY and off_or_waking:
                     # Handle like Commands.ON
-                    task = asyncio.create_task(self._device.send_command(command))
-                    try:
-                        result = await asyncio.wait_for(task, timeout=3.0)
-                        return StatusCodes.OK if result["success"] else StatusCodes.SERVER_ERROR
-                    except asyncio.TimeoutError:
-                        _LOG.info(f"Command {command} initiated (may involve WOL)")
-                        return StatusCodes.OK
+                    return await self._power_on()
+                elif command.startswith(const.CMD_KEY_PRESS):
+                    return await self._send_key(command, params)
                 else:
                     # Normal command
                     result = await self._device.send_command(command)
-                    return StatusCodes.OK if result["success"] else StatusCodes.SERVER_ERROR
+                    return StatusCodes.OK if result.success else StatusCodes.SERVER_ERROR
             else:
                 # Handle simple commands
                 device_command = self._map_simple_command_to_device(cmd_id)
-                if device_command:
+                if device_command and device_command.startswith(const.CMD_KEY_PRESS):
+                    return await self._send_key(device_command, params)
+                elif device_command:
                     result = await self._device.send_command(device_command)
-                    return StatusCodes.OK if result["success"] else StatusCodes.SERVER_ERROR
+                    return StatusCodes.OK if result.success else StatusCodes.SERVER_ERROR
                 else:
                     _LOG.warning(f"Unknown command: {cmd_id}")
                     return StatusCodes.NOT_IMPLEMENTED
@@ -112,78 +175,34 @@ class MadVRRemote(Remote):
             _LOG.error(f"Command failed: {e}", exc_info=True)
             return StatusCodes.SERVER_ERROR
 
-    def _get_command_map(self) -> dict[str, str]:
-        """Get the complete command mapping dictionary."""
-        return {
-            # Power commands
-            "Standby": const.CMD_STANDBY,
-            "Power Off": const.CMD_POWER_OFF,
-            "Restart": const.CMD_RESTART,
-            "Reload Software": const.CMD_RELOAD_SOFTWARE,
-
-            # Menu commands
-            "Open Info Menu": f"{const.CMD_OPEN_MENU} {const.MENU_INFO}",
-            "Open Settings Menu": f"{const.CMD_OPEN_MENU} {const.MENU_SETTINGS}",
-            "Open Configuration Menu": f"{const.CMD_OPEN_MENU} {const.MENU_CONFIGURATION}",
-            "Open Profiles Menu": f"{const.CMD_OPEN_MENU} {const.MENU_PROFILES}",
-            "Open Test Patterns Menu": f"{const.CMD_OPEN_MENU} {const.MENU_TEST_PATTERNS}",
-            "Close Menu": const.CMD_CLOSE_MENU,
-
-            # Navigation keys
-            "Up": f"{const.CMD_KEY_PRESS} {const.KEY_UP}",
-            "Down": f"{const.CMD_KEY_PRESS} {const.KEY_DOWN}",
-            "Left": f"{const.CMD_KEY_PRESS} {const.KEY_LEFT}",
-            "Right": f"{const.CMD_KEY_PRESS} {const.KEY_RIGHT}",
-            "OK": f"{const.CMD_KEY_PRESS} {const.KEY_OK}",
-            "Back": f"{const.CMD_KEY_PRESS} {const.KEY_BACK}",
-
-            # Color keys
-            "Red": f"{const.CMD_KEY_PRESS} {const.KEY_RED}",
-            "Green": f"{const.CMD_KEY_PRESS} {const.KEY_GREEN}",
-            "Blue": f"{const.CMD_KEY_PRESS} {const.KEY_BLUE}",
-            "Yellow": f"{const.CMD_KEY_PRESS} {const.KEY_YELLOW}",
-            "Magenta": f"{const.CMD_KEY_PRESS} {const.KEY_MAGENTA}",
-            "Cyan": f"{const.CMD_KEY_PRESS} {const.KEY_CYAN}",
-
-            # Aspect ratio presets
-            "Aspect Auto": f"{const.CMD_SET_ASPECT_RATIO_MODE} {const.AR_AUTO}",
-            "Aspect Hold": f"{const.CMD_SET_ASPECT_RATIO_MODE} {const.AR_HOLD}",
-            "Aspect 4:3": f"{const.CMD_SET_ASPECT_RATIO_MODE} {const.AR_4_3}",
-            "Aspect 16:9": f"{const.CMD_SET_ASPECT_RATIO_MODE} {const.AR_16_9}",
-            "Aspect 1.85:1": f"{const.CMD_SET_ASPECT_RATIO_MODE} {const.AR_1_85}",
-            "Aspect 2.00:1": f"{const.CMD_SET_ASPECT_RATIO_MODE} {const.AR_2_00}",
-            "Aspect 2.35:1": f"{const.CMD_SET_ASPECT_RATIO_MODE} {const.AR_2_35}",
-            "Aspect 2.40:1": f"{const.CMD_SET_ASPECT_RATIO_MODE} {const.AR_2_40}",
-            "Aspect 2.55:1": f"{const.CMD_SET_ASPECT_RATIO_MODE} {const.AR_2_55}",
-            "Aspect 2.76:1": f"{const.CMD_SET_ASPECT_RATIO_MODE} {const.AR_2_76}",
-
-            # Picture settings toggles
-            "Toggle Tone Map": f"{const.CMD_TOGGLE} {const.TOGGLE_TONE_MAP}",
-            "Tone Map On": const.CMD_TONE_MAP_ON,
-            "Tone Map Off": const.CMD_TONE_MAP_OFF,
-            "Toggle Highlight Recovery": f"{const.CMD_TOGGLE} {const.TOGGLE_HIGHLIGHT_RECOVERY}",
-            "Toggle Shadow Recovery": f"{const.CMD_TOGGLE} {const.TOGGLE_SHADOW_RECOVERY}",
-            "Toggle Contrast Recovery": f"{const.CMD_TOGGLE} {const.TOGGLE_CONTRAST_RECOVERY}",
-            "Toggle 3DLUT": f"{const.CMD_TOGGLE} {const.TOGGLE_3DLUT}",
-            "Toggle Histogram": f"{const.CMD_TOGGLE} {const.TOGGLE_HISTOGRAM}",
-            "Toggle Debug OSD": f"{const.CMD_TOGGLE} {const.TOGGLE_DEBUG_OSD}",
-
-            # Info commands
-            "Get Signal Info": const.CMD_GET_SIGNAL_INFO,
-            "Get Aspect Ratio": const.CMD_GET_ASPECT_RATIO,
-            "Get Temperatures": const.CMD_GET_TEMPERATURES,
-            "Get MAC Address": const.CMD_GET_MAC_ADDRESS,
-            "Get Masking Ratio": const.CMD_GET_MASKING_RATIO,
-
-            # Utility commands
-            "Force 1080p60": const.CMD_FORCE_1080P60,
-            "Hotplug": const.CMD_HOTPLUG,
-            "Refresh License": const.CMD_REFRESH_LICENSE,
-        }
+    async def _send_key(self, command: str, params: dict[str, Any] | None) -> StatusCodes:
+        """Send a KeyPress through the key streamer, honouring repeat, delay and hold."""
+        params = params or {}
+        repeat = max(1, int(params.get("repeat") or 1))
+        delay = float(params.get("delay") or 0) / 1000
+        hold = int(params.get("hold") or 0)
+
+        if hold >= const.KEY_HOLD_THRESHOLD:
+            command = HOLD_COMMANDS.get(command) or command.replace(const.CMD_KEY_PRESS, const.CMD_KEY_HOLD, 1)
+
+        result = await self._key_streamer.press(command, repeat, delay)
+        return StatusCodes.OK if result.success else StatusCodes.SERVER_ERROR
+
+    async def _power_on(self) -> StatusCodes:
+        """Start or join the device power-on and answer before a long WOL sequence completes."""
+        transition = self._device.power_on()
+
+        try:
+            result = await asyncio.wait_for(transition.wait(), timeout=3.0)
+            return StatusCodes.OK if result.success else StatusCodes.SERVER_ERROR
+        except asyncio.TimeoutError:
+            _LOG.info(f"Power ON in progress: {transition.stage} (may take up to "
+                      f"{const.WOL_READY_TIMEOUT:.0f}s for WOL)")
+            return StatusCodes.OK
 
     def _map_simple_command_to_device(self, simple_cmd: str) -> str | None:
         """Map simple command names to device protocol commands."""
-        return self._get_command_map().get(simple_cmd)
+        return SIMPLE_COMMANDS.get(simple_cmd)
 
     def _create_ui_pages(self) -> list[UiPage]:
         return [
@@ -201,108 +220,103 @@ class MadVRRemote(Remote):
             create_ui_text("Power Control", 0, 0, size=Size(4, 1)),
             create_ui_text("Power On", 0, 1, cmd=Commands.ON),
             create_ui_text("Power Off", 1, 1, cmd=Commands.OFF),
-            create_ui_text("Restart", 2, 1, cmd=EntityCommand("send_cmd", {"command": const.CMD_RESTART})),
-            create_ui_text("Reload SW", 3, 1, cmd=EntityCommand("send_cmd", {"command": const.CMD_RELOAD_SOFTWARE})),
+            create_ui_text("Restart", 2, 1, cmd=_send_cmd("Restart")),
+            create_ui_text("Reload SW", 3, 1, cmd=_send_cmd("Reload Software")),
         ]
         return UiPage(page_id="power", name="Power", grid=Size(4, 6), items=items)
 
     def _create_menu_navigation_page(self) -> UiPage:
         items = [
             create_ui_text("Menu Navigation", 0, 0, size=Size(4, 1)),
-            
-            create_ui_text("Info", 0, 1, cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_OPEN_MENU} {const.MENU_INFO}"})),
-            create_ui_text("Settings", 1, 1, cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_OPEN_MENU} {const.MENU_SETTINGS}"})),
-            create_ui_text("Config", 2, 1, cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_OPEN_MENU} {const.MENU_CONFIGURATION}"})),
-            create_ui_text("Profiles", 3, 1, cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_OPEN_MENU} {const.MENU_PROFILES}"})),
-            
+
+            create_ui_text("Info", 0, 1, cmd=_send_cmd("Open Info Menu")),
+            create_ui_text("Settings", 1, 1, cmd=_send_cmd("Open Settings Menu")),
+            create_ui_text("Config", 2, 1, cmd=_send_cmd("Open Configuration Menu")),
+            create_ui_text("Profiles", 3, 1, cmd=_send_cmd("Open Profiles Menu")),
+
             create_ui_text("D-Pad Control", 0, 2, size=Size(4, 1)),
-            create_ui_text("↑", 1, 3, cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_KEY_PRESS} {const.KEY_UP}"})),
-            create_ui_text("←", 0, 4, cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_KEY_PRESS} {const.KEY_LEFT}"})),
-            create_ui_text("OK", 1, 4, cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_KEY_PRESS} {const.KEY_OK}"})),
-            create_ui_text("→", 2, 4, cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_KEY_PRESS} {const.KEY_RIGHT}"})),
-            create_ui_text("↓", 1, 5, cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_KEY_PRESS} {const.KEY_DOWN}"})),
-            create_ui_text("Back", 3, 4, cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_KEY_PRESS} {const.KEY_BACK}"})),
-            create_ui_text("Close", 3, 5, cmd=EntityCommand("send_cmd", {"command": const.CMD_CLOSE_MENU})),
+            create_ui_text("↑", 1, 3, cmd=_send_cmd("Up")),
+            create_ui_text("←", 0, 4, cmd=_send_cmd("Left")),
+            create_ui_text("OK", 1, 4, cmd=_send_cmd("OK")),
+            create_ui_text("→", 2, 4, cmd=_send_cmd("Right")),
+            create_ui_text("↓", 1, 5, cmd=_send_cmd("Down")),
+            create_ui_text("Back", 3, 4, cmd=_send_cmd("Back")),
+            create_ui_text("Close", 3, 5, cmd=_send_cmd("Close Menu")),
         ]
         return UiPage(page_id="menu", name="Menu", grid=Size(4, 6), items=items)
 
     def _create_aspect_ratio_page(self) -> UiPage:
         items = [
             create_ui_text("Aspect Ratio", 0, 0, size=Size(4, 1)),
-            
-            create_ui_text("Auto", 0, 1, cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_SET_ASPECT_RATIO_MODE} {const.AR_AUTO}"})),
-            create_ui_text("Hold", 1, 1, cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_SET_ASPECT_RATIO_MODE} {const.AR_HOLD}"})),
-            
+
+            create_ui_text("Auto", 0, 1, cmd=_send_cmd(f"Aspect {const.AR_AUTO}")),
+            create_ui_text("Hold", 1, 1, cmd=_send_cmd(f"Aspect {const.AR_HOLD}")),
+
             create_ui_text("Common Ratios", 0, 2, size=Size(4, 1)),
         ]
-        
+
         ratios = [
-            ("4:3", const.AR_4_3), ("16:9", const.AR_16_9),
-            ("1.85:1", const.AR_1_85), ("2.00:1", const.AR_2_00),
-            ("2.35:1", const.AR_2_35), ("2.40:1", const.AR_2_40),
-            ("2.55:1", const.AR_2_55), ("2.76:1", const.AR_2_76),
+            const.AR_4_3, const.AR_16_9, const.AR_1_85, const.AR_2_00,
+            const.AR_2_35, const.AR_2_40, const.AR_2_55, const.AR_2_76,
         ]
-        
+
         row, col = 3, 0
-        for label, ratio in ratios:
-            items.append(create_ui_text(
-                label, col, row,
-                cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_SET_ASPECT_RATIO_MODE} {ratio}"})
-            ))
+        for ratio in ratios:
+            items.append(create_ui_text(ratio, col, row, cmd=_send_cmd(f"Aspect {ratio}")))
             col += 1
             if col >= 4:
                 col, row = 0, row + 1
-        
+
         return UiPage(page_id="aspect", name="Aspect", grid=Size(4, 6), items=items)
 
     def _create_picture_settings_page(self) -> UiPage:
         items = [
             create_ui_text("Picture Settings", 0, 0, size=Size(4, 1)),
-            
-            create_ui_text("ToneMap", 0, 1, size=Size(2, 1), cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_TOGGLE} {const.TOGGLE_TONE_MAP}"})),
-            create_ui_text("TM On", 0, 2, cmd=EntityCommand("send_cmd", {"command": const.CMD_TONE_MAP_ON})),
-            create_ui_text("TM Off", 1, 2, cmd=EntityCommand("send_cmd", {"command": const.CMD_TONE_MAP_OFF})),
-            
-            create_ui_text("Highlight", 2, 2, cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_TOGGLE} {const.TOGGLE_HIGHLIGHT_RECOVERY}"})),
-            create_ui_text("Shadow", 3, 2, cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_TOGGLE} {const.TOGGLE_SHADOW_RECOVERY}"})),
-            create_ui_text("Contrast", 0, 3, cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_TOGGLE} {const.TOGGLE_CONTRAST_RECOVERY}"})),
-            create_ui_text("3DLUT", 1, 3, cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_TOGGLE} {const.TOGGLE_3DLUT}"})),
-            create_ui_text("Histogram", 2, 3, cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_TOGGLE} {const.TOGGLE_HISTOGRAM}"})),
-            create_ui_text("Debug", 3, 3, cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_TOGGLE} {const.TOGGLE_DEBUG_OSD}"})),
+
+            create_ui_text("ToneMap", 0, 1, size=Size(2, 1), cmd=_send_cmd("Toggle Tone Map")),
+            create_ui_text("TM On", 0, 2, cmd=_send_cmd("Tone Map On")),
+            create_ui_text("TM Off", 1, 2, cmd=_send_cmd("Tone Map Off")),
+
+            create_ui_text("Highlight", 2, 2, cmd=_send_cmd("Toggle Highlight Recovery")),
+            create_ui_text("Shadow", 3, 2, cmd=_send_cmd("Toggle Shadow Recovery")),
+            create_ui_text("Contrast", 0, 3, cmd=_send_cmd("Toggle Contrast Recovery")),
+            create_ui_text("3DLUT", 1, 3, cmd=_send_cmd("Toggle 3DLUT")),
+            create_ui_text("Histogram", 2, 3, cmd=_send_cmd("Toggle Histogram")),
+            create_ui_text("Debug", 3, 3, cmd=_send_cmd("Toggle Debug OSD")),
         ]
         return UiPage(page_id="picture", name="Picture", grid=Size(4, 6), items=items)
 
     def _create_test_patterns_page(self) -> UiPage:
         items = [
             create_ui_text("Test Patterns", 0, 0, size=Size(4, 1)),
-            create_ui_text("Open", 0, 1, size=Size(2, 1), cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_OPEN_MENU} {const.MENU_TEST_PATTERNS}"})),
-            
+            create_ui_text("Open", 0, 1, size=Size(2, 1), cmd=_send_cmd("Open Test Patterns Menu")),
+
             create_ui_text("Color Buttons", 0, 2, size=Size(4, 1)),
-            create_ui_text("Red", 0, 3, cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_KEY_PRESS} {const.KEY_RED}"})),
-            create_ui_text("Green", 1, 3, cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_KEY_PRESS} {const.KEY_GREEN}"})),
-            create_ui_text("Blue", 2, 3, cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_KEY_PRESS} {const.KEY_BLUE}"})),
-            create_ui_text("Yellow", 3, 3, cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_KEY_PRESS} {const.KEY_YELLOW}"})),
-            create_ui_text("Magenta", 0, 4, cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_KEY_PRESS} {const.KEY_MAGENTA}"})),
-            create_ui_text("Cyan", 1, 4, cmd=EntityCommand("send_cmd", {"command": f"{const.CMD_KEY_PRESS} {const.KEY_CYAN}"})),
+            create_ui_text("Red", 0, 3, cmd=_send_cmd("Red")),
+            create_ui_text("Green", 1, 3, cmd=_send_cmd("Green")),
+            create_ui_text("Blue", 2, 3, cmd=_send_cmd("Blue")),
+            create_ui_text("Yellow", 3, 3, cmd=_send_cmd("Yellow")),
+            create_ui_text("Magenta", 0, 4, cmd=_send_cmd("Magenta")),
+            create_ui_text("Cyan", 1, 4, cmd=_send_cmd("Cyan")),
         ]
         return UiPage(page_id="test", name="Test", grid=Size(4, 6), items=items)
 
     def _create_info_page(self) -> UiPage:
         items = [
             create_ui_text("Device Info", 0, 0, size=Size(4, 1)),
-            create_ui_text("Signal", 0, 1, size=Size(2, 1), cmd=EntityCommand("send_cmd", {"command": const.CMD_GET_SIGNAL_INFO})),
-            create_ui_text("Aspect", 2, 1, size=Size(2, 1), cmd=EntityCommand("send_cmd", {"command": const.CMD_GET_ASPECT_RATIO})),
-            create_ui_text("Temp", 0, 2, size=Size(2, 1), cmd=EntityCommand("send_cmd", {"command": const.CMD_GET_TEMPERATURES})),
-            create_ui_text("MAC", 2, 2, size=Size(2, 1), cmd=EntityCommand("send_cmd", {"command": const.CMD_GET_MAC_ADDRESS})),
-            create_ui_text("Masking", 0, 3, size=Size(2, 1), cmd=EntityCommand("send_cmd", {"command": const.CMD_GET_MASKING_RATIO})),
+            create_ui_text("Signal", 0, 1, size=Size(2, 1), cmd=_send_cmd("Get Signal Info")),
+            create_ui_text("Aspect", 2, 1, size=Size(2, 1), cmd=_send_cmd("Get Aspect Ratio")),
+            create_ui_text("Temp", 0, 2, size=Size(2, 1), cmd=_send_cmd("Get Temperatures")),
+            create_ui_text("MAC", 2, 2, size=Size(2, 1), cmd=_send_cmd("Get MAC Address")),
+            create_ui_text("Masking", 0, 3, size=Size(2, 1), cmd=_send_cmd("Get Masking Ratio")),
         ]
         return UiPage(page_id="info", name="Info", grid=Size(4, 6), items=items)
 
     def _create_utility_page(self) -> UiPage:
         items = [
             create_ui_text("Utility", 0, 0, size=Size(4, 1)),
-            create_ui_text("Force 1080p60", 0, 1, size=Size(2, 1), cmd=EntityCommand("send_cmd", {"command": const.CMD_FORCE_1080P60})),
-            create_ui_text("Hotplug", 2, 1, size=Size(2, 1), cmd=EntityCommand("send_cmd", {"command": const.CMD_HOTPLUG})),
-            create_ui_text("Refresh Lic", 0, 2, size=Size(2, 1), cmd=EntityCommand("send_cmd", {"command": const.CMD_REFRESH_LICENSE})),
+            create_ui_text("Force 1080p60", 0, 1, size=Size(2, 1), cmd=_send_cmd("Force 1080p60")),
+            create_ui_text("Hotplug", 2, 1, size=Size(2, 1), cmd=_send_cmd("Hotplug")),
+            create_ui_text("Refresh Lic", 0, 2, size=Size(2, 1), cmd=_send_cmd("Refresh License")),
         ]
-        return UiPage(page_id="utility", name="Utility", grid=Size(4, 6), items=items)
\ No newline at end of file
+        return UiPage(page_id="utility", name="Utility", grid=Size(4, 6), items=items)
@@ -11,9 +11,10 @@ from typing import Any
 from ucapi import StatusCodes
 from ucapi.select import Select, Attributes, Commands, States
 
-from uc_intg_madvr.config import MadVRConfig
+from uc_intg_madvr.commands import ASPECT_RATIO_MODES
+from uc_intg_madvr.config import MadVRDeviceConfig
 from uc_intg_madvr.device import MadVRDevice
-from uc_intg_madvr import const
+from uc_intg_madvr.trace import traced
 
 _LOG = logging.getLogger(__name__)
 
@@ -22,30 +23,19 @@ class MadVRAspectRatioSelect(Select):
     """Select entity for MadVR aspect ratio mode."""
 
     # Available aspect ratio modes
-    ASPECT_RATIO_OPTIONS = [
-        "Auto",
-        "Hold",
-        "4:3",
-        "16:9",
-        "1.85:1",
-        "2.00:1",
-        "2.35:1",
-        "2.40:1",
-        "2.55:1",
-        "2.76:1",
-    ]
-
-    def __init__(self, config: MadVRConfig, device: MadVRDevice):
+    ASPECT_RATIO_OPTIONS = list(ASPECT_RATIO_MODES)
+
+    def __init__(self, config: MadVRDeviceConfig, device: MadVRDevice):
         """Initialize aspect ratio select entity.
 
         Args:
-            config: MadVR configuration
+            config: MadVR device configuration
             device: MadVR device instance
         """
         self._config = config
         self._device = device
 
-        entity_id = f"select.{config.host.replace('.', '_')}.aspect_ratio_mode"
+        entity_id = f"select.{config.identifier}.aspect_ratio_mode"
 
         attributes = {
             Attributes.STATE: States.UNKNOWN,
@@ -62,6 +52,7 @@ class MadVRAspectRatioSelect(Select):
 
         _LOG.info(f"Created aspect ratio select entity: {entity_id}")
 
+    @traced("select")
     async def handle_command(self, entity: Select, command: str, params: dict[str, Any] | None = None) -> StatusCodes:
         """Handle commands from the remote.
 
@@ -110,19 +101,16 @@ class MadVRAspectRatioSelect(Select):
 
         _LOG.info(f"Setting aspect ratio mode to: {mode}")
 
-        # Map display names to API values
-        api_value = self._map_mode_to_api(mode)
-
         # Send command to device
-        result = await self._device.send_command(f"{const.CMD_SET_ASPECT_RATIO_MODE} {api_value}")
+        result = await self._device.send_command(ASPECT_RATIO_MODES[mode])
 
-        if result["success"]:
+        if result.success:
             # Update device state
             self._device.set_aspect_ratio_mode(mode)
             _LOG.info(f"Aspect ratio mode set to: {mode}")
             return StatusCodes.OK
         else:
-            _LOG.error(f"Failed to set aspect ratio mode: {result.get('error')}")
+            _LOG.error(f"Failed to set aspect ratio mode: {result.error}")
             return StatusCodes.SERVER_ERROR
 
     async def _select_next(self) -> StatusCodes:
@@ -154,16 +142,3 @@ class MadVRAspectRatioSelect(Select):
         except (ValueError, IndexError) as e:
             _LOG.error(f"Error selecting previous mode: {e}")
             return StatusCodes.SERVER_ERROR
-
-    def _map_mode_to_api(self, mode: str) -> str:
-        """Map display mode name to API value.
-
-        Args:
-            mode: Display mode name
-
-        Returns:
-            API value for the mode
-        """
-        # Most modes are the same, just return as-is
-        # The API expects exactly these values
-        return mode
@@ -10,7 +10,7 @@ from typing import Any
 
 from ucapi.sensor import Attributes, DeviceClasses, Sensor, States
 
-from uc_intg_madvr.config import MadVRConfig
+from uc_intg_madvr.config import MadVRDeviceConfig
 from uc_intg_madvr.device import MadVRDevice
 
 _LOG = logging.getLogger(__name__)
@@ -19,12 +19,12 @@ _LOG = logging.getLogger(__name__)
 class MadVRSignalSensor(Sensor):
     """MadVR signal info sensor."""
 
-    def __init__(self, config: MadVRConfig, device: MadVRDevice):
+    def __init__(self, config: MadVRDeviceConfig, device: MadVRDevice):
         """Initialize sensor."""
         self._device = device
         self._config = config
 
-        entity_id = f"sensor.{config.host.replace('.', '_')}.signal"
+        entity_id = f"sensor.{config.identifier}.signal"
 
         super().__init__(
             entity_id,
@@ -44,11 +44,11 @@ class MadVRSignalSensor(Sensor):
 class MadVRTemperatureSensor(Sensor):
     """MadVR temperature sensor."""
 
-    def __init__(self, config: MadVRConfig, device: MadVRDevice, temp_index: int, temp_name: str):
+    def __init__(self, config: MadVRDeviceConfig, device: MadVRDevice, temp_index: int, temp_name: str):
         """Initialize temperature sensor.
 
         Args:
-            config: MadVR configuration
+            config: MadVR device configuration
             device: MadVR device instance
             temp_index: Index of temperature value (0=GPU, 1=CPU, 2=Board, 3=PSU)
             temp_name: Display name for the temperature sensor
@@ -57,7 +57,7 @@ class MadVRTemperatureSensor(Sensor):
         self._config = config
         self._temp_index = temp_index
 
-        entity_id = f"sensor.{config.host.replace('.', '_')}.temp_{temp_name.lower()}"
+        entity_id = f"sensor.{config.identifier}.temp_{temp_name.lower()}"
 
         super().__init__(
             entity_id,
@@ -78,12 +78,12 @@ class MadVRTemperatureSensor(Sensor):
 class MadVRAspectRatioSensor(Sensor):
     """MadVR aspect ratio sensor."""
 
-    def __init__(self, config: MadVRConfig, device: MadVRDevice):
+    def __init__(self, config: MadVRDeviceConfig, device: MadVRDevice):
         """Initialize sensor."""
         self._device = device
         self._config = config
 
-        entity_id = f"sensor.{config.host.replace('.', '_')}.aspect_ratio"
+        entity_id = f"sensor.{config.identifier}.aspect_ratio"
 
         super().__init__(
             entity_id,
@@ -103,12 +103,12 @@ class MadVRAspectRatioSensor(Sensor):
 class MadVRMaskingRatioSensor(Sensor):
     """MadVR masking ratio sensor."""
 
-    def __init__(self, config: MadVRConfig, device: MadVRDevice):
+    def __init__(self, config: MadVRDeviceConfig, device: MadVRDevice):
         """Initialize sensor."""
         self._device = device
         self._config = config
 
-        entity_id = f"sensor.{config.host.replace('.', '_')}.masking_ratio"
+        entity_id = f"sensor.{config.identifier}.masking_ratio"
 
         super().__init__(
             entity_id,
@@ -19,7 +19,8 @@ from ucapi.api_definitions import (
 )
 
 from uc_intg_madvr.device import MadVRDevice
-from uc_intg_madvr.config import MadVRConfig
+from uc_intg_madvr.discovery import DiscoveredDevice, discover
+from uc_intg_madvr.config import MadVRConfig, MadVRDeviceConfig
 from uc_intg_madvr import const
 
 _LOG = logging.getLogger(__name__)
@@ -32,6 +33,8 @@ class MadVRSetup:
         self._api = api
         self._config = config
         self._on_setup_complete = on_setup_complete
+        # Units found on the network, swept once per setup session
+        self._discovered: list[DiscoveredDevice] | None = None
         _LOG.info("MadVRSetup initialized")
 
     async def handle_setup(self, msg: SetupDriver) -> SetupAction:
@@ -41,35 +44,25 @@ class MadVRSetup:
         _LOG.info("=" * 70)
         
         if isinstance(msg, DriverSetupRequest):
-            _LOG.info("SETUP: Handling DriverSetupRequest")
-            return RequestUserInput(
-                title={"en": "madVR Envy Connection"},
-                settings=[
-                    {
-                        "id": "host",
-                        "label": {"en": "IP Address"},
-                        "field": {"text": {"value": self._config.host if self._config.host else ""}}
-                    },
-                    {
-                        "id": "port",
-                        "label": {"en": "Port"},
-                        "field": {"number": {"value": self._config.port if self._config.port else const.DEFAULT_PORT}}
-                    },
-                    {
-                        "id": "name",
-                        "label": {"en": "Device Name"},
-                        "field": {"text": {"value": self._config.name if self._config.name else "madVR Envy"}}
-                    }
-                ]
-            )
+            _LOG.info("SETUP: Handling DriverSetupRequest (reconfigure=%s)", msg.reconfigure)
+            self._discovered = None
+            if msg.reconfigure and self._config.is_configured():
+                return self._device_action_form()
+            return await self._device_form()
         
         elif isinstance(msg, UserDataResponse):
             _LOG.info("SETUP: Handling UserDataResponse")
             _LOG.info("SETUP: Input values: %s", msg.input_values)
-            action = await self._handle_user_input(msg.input_values)
+            if "action" in msg.input_values:
+                action = await self._handle_device_action(msg.input_values["action"])
+            else:
+                action = await self._handle_user_input(msg.input_values)
             
-            if isinstance(action, SetupComplete) and self._on_setup_complete:
-                await self._on_setup_complete()
+            if isinstance(action, SetupComplete):
+                # The configuration is on disk before the driver reports the setup as done
+                await self._config.flush()
+                if self._on_setup_complete:
+                    await self._on_setup_complete()
                 
             return action
         
@@ -81,6 +74,94 @@ class MadVRSetup:
             _LOG.error("SETUP: Unknown message type: %s", type(msg).__name__)
             return SetupError(IntegrationSetupError.OTHER)
 
+    async def _discover(self) -> list[DiscoveredDevice]:
+        """Units on the network that are not configured yet."""
+        if self._discovered is None:
+            try:
+                self._discovered = await discover()
+            except Exception as e:
+                _LOG.warning("SETUP: Discovery failed: %s", e)
+                self._discovered = []
+
+        configured = {device.host for device in self._config.devices}
+        return [device for device in self._discovered if device.host not in configured]
+
+    async def _device_form(self) -> RequestUserInput:
+        """Connection settings of a unit to add, offering the units found on the network."""
+        discovered = await self._discover()
+        settings = []
+        if discovered:
+            items = [
+                {
+                    "id": f"{device.host}:{device.port}",
+                    "label": {"en": f"Envy {device.version} ({device.host})" if device.version else device.host}
+                }
+                for device in discovered
+            ]
+            items.append({"id": "manual", "label": {"en": "Enter IP address below"}})
+            settings.append({
+                "id": "discovered",
+                "label": {"en": "Discovered Devices"},
+                "field": {"dropdown": {"value": items[0]["id"], "items": items}}
+            })
+
+        return RequestUserInput(
+            title={"en": "madVR Envy Connection"},
+            settings=settings + [
+                {
+                    "id": "host",
+                    "label": {"en": "IP Address"},
+                    "field": {"text": {"value": ""}}
+                },
+                {
+                    "id": "port",
+                    "label": {"en": "Port"},
+                    "field": {"number": {"value": const.DEFAULT_PORT}}
+                },
+                {
+                    "id": "name",
+                    "label": {"en": "Device Name"},
+                    "field": {"text": {"value": "madVR Envy"}}
+                }
+            ]
+        )
+
+    def _device_action_form(self) -> RequestUserInput:
+        """Choose between adding a unit and removing one of the configured units."""
+        items = [{"id": "add", "label": {"en": "Add a madVR Envy"}}]
+        for device in self._config.devices:
+            items.append({
+                "id": f"remove:{device.identifier}",
+                "label": {"en": f"Remove {device.name} ({device.host})"}
+            })
+
+        return RequestUserInput(
+            title={"en": "madVR Envy Devices"},
+            settings=[
+                {
+                    "id": "action",
+                    "label": {"en": "Action"},
+                    "field": {"dropdown": {"value": "add", "items": items}}
+                }
+            ]
+        )
+
+    async def _handle_device_action(self, action: str) -> SetupAction:
+        """Process the choice made on the device action form."""
+        if action == "add":
+            return await self._device_form()
+
+        if action.startswith("remove:"):
+            identifier = action.split(":", 1)[1]
+            if self._config.remove_device(identifier):
+                _LOG.info("SETUP: Removed device %s", identifier)
+                return SetupComplete()
+            _LOG.error("SETUP: Unknown device %s", identifier)
+            return SetupError(IntegrationSetupError.NOT_FOUND)
+
+        _LOG.error("SETUP: Unknown action '%s'", action)
+        return SetupError(IntegrationSetupError.OTHER)
+
     async def _handle_user_input(self, input_values: dict[str, str]) -> SetupAction:
         """Process user input from setup form."""
         _LOG.info("SETUP: Processing user input")
@@ -88,6 +169,11 @@ class MadVRSetup:
         host = input_values.get("host", "").strip()
         port_str = input_values.get("port", str(const.DEFAULT_PORT))
         name = input_values.get("name", "madVR Envy").strip()
+
+        # The dropdown defaults to the first unit found, an address typed in by the user wins over it
+        discovered = input_values.get("discovered", "manual")
+        if discovered != "manual" and not host:
+            host, port_str = discovered.rsplit(":", 1)
         
         _LOG.info("SETUP: Host=%s, Port=%s, Name=%s", host, port_str, name)
         
@@ -105,8 +191,8 @@ class MadVRSetup:
         
         _LOG.info("SETUP: Testing connection to %s:%d", host, port)
         
-        test_config = MadVRConfig()
-        test_config.set_config(host, port, name)
+        # Not bound to the stored configuration, nothing is saved until the test passes
+        test_config = MadVRDeviceConfig(host, port, name)
         
         loop = asyncio.get_running_loop()
         test_device = MadVRDevice(test_config, loop)
@@ -114,7 +200,7 @@ class MadVRSetup:
         try:
             result = await test_device.send_command(const.CMD_HEARTBEAT)
             
-            if not result["success"]:
+            if not result.success:
                 _LOG.error("SETUP: Failed to connect to madVR device")
                 return SetupError(IntegrationSetupError.CONNECTION_REFUSED)
             
@@ -130,9 +216,7 @@ class MadVRSetup:
             
             await test_device.stop_polling()
             
-            self._config.set_config(host, port, name)
-            if test_config.mac_address:
-                self._config.set_mac_address(test_config.mac_address)
+            self._config.add_device(host, port, name, test_config.mac_address)
             
             _LOG.info("SETUP: Configuration saved successfully")
             _LOG.info("=" * 70)
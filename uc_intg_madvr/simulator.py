@@ -0,0 +1,345 @@
+"""
+madVR Envy IP control simulator.
+
+Speaks enough of the Envy protocol to run MadVRDevice without hardware, with
+configurable latency, jitter, dropped replies, power state and boot delay.
+Run it in-process from tests and benchmarks, or standalone:
+
+    python -m uc_intg_madvr.simulator --port 44077 --latency 5 --jitter 2
+
+:copyright: (c) 2025 by Meir Miyara
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+from collections import Counter
+
+from uc_intg_madvr import const
+from uc_intg_madvr.device import PowerState
+
+_LOG = logging.getLogger(__name__)
+
+WELCOME_BANNER = "WELCOME to Envy v1.1.3.0"
+DEFAULT_SIGNAL = "3840x2160 23.976p 2D 422 10bit HDR10 2020 TV 16:9"
+
+
+class _Client:
+    """One control connection, replies are written in order after the simulated latency."""
+
+    def __init__(self, simulator: "EnvySimulator", writer: asyncio.StreamWriter):
+        self._simulator = simulator
+        self._writer = writer
+        self._outbox: asyncio.Queue[tuple[float, bytes]] = asyncio.Queue()
+        self._last_delivery = 0.0
+        self._task = asyncio.create_task(self._deliver())
+
+    def send(self, *lines: str):
+        loop = asyncio.get_running_loop()
+        # Later lines never overtake earlier ones, whatever the jitter
+        deliver_at = max(self._last_delivery, loop.time() + self._simulator.reply_delay())
+        self._last_delivery = deliver_at
+        self._outbox.put_nowait((deliver_at, "".join(f"{line}\r\n" for line in lines).encode()))
+
+    async def _deliver(self):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                deliver_at, data = await self._outbox.get()
+                delay = deliver_at - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self._writer.write(data)
+                await self._writer.drain()
+        except (asyncio.CancelledError, ConnectionError):
+            pass
+
+    def close(self):
+        self._task.cancel()
+        self._writer.close()
+
+
+class _WakeOnLanProtocol(asyncio.DatagramProtocol):
+
+    def __init__(self, simulator: "EnvySimulator"):
+        self._simulator = simulator
+
+    def datagram_received(self, data: bytes, addr):
+        mac_bytes = bytes.fromhex(self._simulator.mac_address.replace("-", "").replace(":", ""))
+        if data == b"\xff" * 6 + mac_bytes * 16:
+            _LOG.info(f"Simulator: magic packet from {addr[0]}")
+            self._simulator.wake()
+
+
+class EnvySimulator:
+    """Simulated madVR Envy.
+
+    While OFF nothing listens on the control port. Waking (Wake-on-LAN or
+    ``wake()``) starts listening in STANDBY after ``boot_delay`` seconds, and
+    the Standby command toggles between STANDBY and ON.
+    """
+
+    def __init__(
+        self,
+        host: str = "0.0.0.0",
+        port: int = const.DEFAULT_PORT,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        packet_loss: float = 0.0,
+        power_state: PowerState = PowerState.ON,
+        boot_delay: float = 0.0,
+        wol_port: int | None = None,
+        notify_interval: float | None = None,
+        mac_address: str = "00-1B-21-AA-BB-CC",
+    ):
+        """Initialize the simulator.
+
+        Args:
+            host: Address to listen on
+            port: Control port, 0 picks a free port
+            latency: Mean reply latency in seconds
+            jitter: Maximum deviation from the mean latency in seconds
+            packet_loss: Probability that a command gets no reply at all
+            power_state: Initial power state
+            boot_delay: Seconds from wake to accepting connections
+            wol_port: UDP port to listen for magic packets on, None to disable
+            notify_interval: Seconds between unsolicited Temperatures notifications, None to disable
+            mac_address: MAC address reported and matched in magic packets
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.packet_loss = packet_loss
+        self.boot_delay = boot_delay
+        self.wol_port = wol_port
+        self.notify_interval = notify_interval
+        self.mac_address = mac_address
+
+        self.state = power_state
+        self.signal: str | None = DEFAULT_SIGNAL
+        self.aspect_ratio = '3840:1600 2.400 240 "Panavision"'
+        self.masking_ratio = "3840:1600 2.400 240"
+        self.temperatures = [65, 58, 42, 45]
+        self.aspect_ratio_mode = "Auto"
+
+        # Commands received by name, e.g. for asserting what a test sent
+        self.commands: Counter[str] = Counter()
+        self.connections = 0
+
+        self._server: asyncio.Server | None = None
+        self._clients: set[_Client] = set()
+        self._handlers: set[asyncio.Task] = set()
+        self._wol_transport: asyncio.DatagramTransport | None = None
+        self._boot_task: asyncio.Task | None = None
+        self._notify_task: asyncio.Task | None = None
+
+    def reply_delay(self) -> float:
+        return max(0.0, self.latency + random.uniform(-self.jitter, self.jitter))
+
+    async def start(self):
+        """Start the simulator in its initial power state."""
+        loop = asyncio.get_running_loop()
+        if self.wol_port is not None:
+            self._wol_transport, _ = await loop.create_datagram_endpoint(
+                lambda: _WakeOnLanProtocol(self), local_addr=("0.0.0.0", self.wol_port), allow_broadcast=True
+            )
+        if self.notify_interval:
+            self._notify_task = loop.create_task(self._notify_loop())
+        if self.state != PowerState.OFF:
+            await self._listen()
+
+    async def stop(self):
+        for task in (self._boot_task, self._notify_task):
+            if task:
+                task.cancel()
+        if self._wol_transport:
+            self._wol_transport.close()
+            self._wol_transport = None
+        await self._shutdown()
+
+    def wake(self):
+        """Power on from OFF, the control port opens after the boot delay."""
+        if self.state == PowerState.OFF and (self._boot_task is None or self._boot_task.done()):
+            self._boot_task = asyncio.get_running_loop().create_task(self._boot())
+
+    async def power_off(self):
+        self.push(const.CMD_POWER_OFF)
+        # Let queued replies go out before the connections drop
+        await asyncio.sleep(self.latency + self.jitter)
+        self.state = PowerState.OFF
+        await self._shutdown()
+
+    def set_signal(self, signal: str | None):
+        """Change the incoming signal, None for no signal, and notify clients."""
+        self.signal = signal
+        if self.state == PowerState.OFF:
+            return
+        self.state = PowerState.ON if signal else PowerState.STANDBY
+        self.push(self._signal_line())
+
+    def set_aspect_ratio(self, aspect_ratio: str):
+        self.aspect_ratio = aspect_ratio
+        self.push(f"{const.NOTIFY_ASPECT_RATIO} {aspect_ratio}")
+
+    def push(self, line: str):
+        """Send an unsolicited notification to every connected client."""
+        for client in self._clients:
+            client.send(line)
+
+    def drop_connections(self):
+        """Close every control connection while staying powered, like a network blip."""
+        for client in list(self._clients):
+            client.close()
+        self._clients.clear()
+
+    async def _listen(self):
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        _LOG.info(f"Simulator: listening on {self.host}:{self.port} ({self.state})")
+
+    async def _shutdown(self):
+        for client in list(self._clients):
+            client.close()
+        self._clients.clear()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        # Let connection handlers see the close, a PowerOff command shuts down from inside its own
+        handlers = self._handlers - {asyncio.current_task()}
+        if handlers:
+            await asyncio.wait(handlers)
+
+    async def _boot(self):
+        _LOG.info(f"Simulator: booting, ready in {self.boot_delay:.1f}s")
+        await asyncio.sleep(self.boot_delay)
+        self.state = PowerState.STANDBY
+        await self._listen()
+
+    async def _restart(self):
+        await self._shutdown()
+        self.state = PowerState.OFF
+        self.wake()
+
+    async def _notify_loop(self):
+        while True:
+            await asyncio.sleep(self.notify_interval)
+            if self.state != PowerState.OFF:
+                self.push(self._temperatures_line())
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        client = _Client(self, writer)
+        self._clients.add(client)
+        self._handlers.add(asyncio.current_task())
+        self.connections += 1
+        client.send(WELCOME_BANNER)
+
+        try:
+            while line := await reader.readline():
+                command = line.decode(errors="replace").strip()
+                if command:
+                    await self._handle_command(client, command)
+        except ConnectionError:
+            pass
+        finally:
+            self._clients.discard(client)
+            self._handlers.discard(asyncio.current_task())
+            client.close()
+
+    async def _handle_command(self, client: _Client, line: str):
+        command, _, argument = line.partition(" ")
+        self.commands[command] += 1
+
+        if random.random() < self.packet_loss:
+            return
+
+        if command == const.CMD_HEARTBEAT:
+            client.send(const.RESPONSE_OK)
+        elif command == const.CMD_GET_SIGNAL_INFO:
+            client.send(const.RESPONSE_OK, self._signal_line())
+        elif command == const.CMD_GET_ASPECT_RATIO:
+            client.send(const.RESPONSE_OK, f"{const.NOTIFY_ASPECT_RATIO} {self.aspect_ratio}")
+        elif command == const.CMD_GET_MASKING_RATIO:
+            client.send(const.RESPONSE_OK, f"{const.NOTIFY_MASKING_RATIO} {self.masking_ratio}")
+        elif command == const.CMD_GET_TEMPERATURES:
+            client.send(const.RESPONSE_OK, self._temperatures_line())
+        elif command == const.CMD_GET_MAC_ADDRESS:
+            client.send(const.RESPONSE_OK, f"{const.NOTIFY_MAC_ADDRESS} {self.mac_address}")
+        elif command in (const.CMD_KEY_PRESS, const.CMD_KEY_HOLD, const.CMD_TOGGLE):
+            if argument:
+                client.send(const.RESPONSE_OK)
+            else:
+                client.send(f'{const.RESPONSE_ERROR} "Missing parameter"')
+        elif command == const.CMD_SET_ASPECT_RATIO_MODE:
+            self.aspect_ratio_mode = argument or "Auto"
+            client.send(const.RESPONSE_OK)
+        elif command == const.CMD_STANDBY:
+            client.send(const.RESPONSE_OK)
+            if self.state == PowerState.ON:
+                self.state = PowerState.STANDBY
+                self.push(const.CMD_STANDBY)
+            else:
+                self.set_signal(self.signal)
+        elif command == const.CMD_POWER_OFF:
+            client.send(const.RESPONSE_OK)
+            await self.power_off()
+        elif command == const.CMD_RESTART:
+            client.send(const.RESPONSE_OK)
+            await asyncio.sleep(self.latency + self.jitter)
+            await self._restart()
+        else:
+            client.send(f'{const.RESPONSE_ERROR} "Unknown command"')
+
+    def _signal_line(self) -> str:
+        if self.signal and self.state == PowerState.ON:
+            return f"{const.NOTIFY_INCOMING_SIGNAL} {self.signal}"
+        return const.NO_SIGNAL
+
+    def _temperatures_line(self) -> str:
+        return f"{const.NOTIFY_TEMPERATURES} {' '.join(str(value) for value in self.temperatures)}"
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="madVR Envy IP control simulator")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=const.DEFAULT_PORT)
+    parser.add_argument("--latency", type=float, default=0.0, help="mean reply latency in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="maximum latency deviation in ms")
+    parser.add_argument("--packet-loss", type=float, default=0.0, help="probability a command gets no reply")
+    parser.add_argument("--power-state", choices=[state.value for state in PowerState if state != PowerState.UNKNOWN],
+                        default=PowerState.ON.value)
+    parser.add_argument("--boot-delay", type=float, default=0.0, help="seconds from wake to ready")
+    parser.add_argument("--wol-port", type=int, default=None, help="UDP port to accept magic packets on")
+    parser.add_argument("--notify-interval", type=float, default=None, help="seconds between temperature pushes")
+    parser.add_argument("--mac-address", default="00-1B-21-AA-BB-CC")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(name)s: %(message)s')
+
+    simulator = EnvySimulator(
+        args.host,
+        args.port,
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        packet_loss=args.packet_loss,
+        power_state=PowerState(args.power_state),
+        boot_delay=args.boot_delay,
+        wol_port=args.wol_port,
+        notify_interval=args.notify_interval,
+        mac_address=args.mac_address,
+    )
+    await simulator.start()
+    try:
+        await asyncio.Future()
+    finally:
+        await simulator.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,66 @@
+"""
+Persisted last known device state.
+
+A small JSON file per device lets the driver show the last known power state
+and sensor values right after a restart, while the first poll reconciles
+them in the background. Writes are deferred and coalesced, and skipped when
+nothing changed since the last one.
+
+:copyright: (c) 2025 by Meir Miyara
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import os
+from typing import Any
+
+from uc_intg_madvr import const
+from uc_intg_madvr.storage import WriteBehindFile, read_if_changed
+
+_LOG = logging.getLogger(__name__)
+
+
+def snapshot_path(config_dir: str, identifier: str) -> str:
+    return os.path.join(config_dir, f"madvr_state_{identifier}.json")
+
+
+def _encode(snapshot: dict[str, Any]) -> bytes:
+    return json.dumps(snapshot, separators=(",", ":"), sort_keys=True).encode()
+
+
+class StateSnapshot:
+    """Write-behind store for the last known state of one device."""
+
+    def __init__(self, path: str, loop: asyncio.AbstractEventLoop, delay: float = const.SNAPSHOT_WRITE_DELAY):
+        self.path = path
+        self._loop = loop
+        self._file = WriteBehindFile(path, delay)
+
+    async def load(self) -> dict[str, Any] | None:
+        """Read the snapshot, None if there is none or it cannot be decoded."""
+        try:
+            signature, data = await self._loop.run_in_executor(None, read_if_changed, self.path)
+            if data is None:
+                return None
+            snapshot = json.loads(data)
+        except (OSError, ValueError) as e:
+            _LOG.warning(f"Ignoring state snapshot {self.path}: {e}")
+            return None
+
+        self._file.loaded(data, signature)
+        return snapshot if isinstance(snapshot, dict) else None
+
+    def update(self, snapshot: dict[str, Any]):
+        """Schedule writing the snapshot, the latest one wins if several arrive within the write delay."""
+        self._file.schedule(functools.partial(_encode, snapshot))
+
+    async def flush(self):
+        """Write a pending snapshot now, e.g. on shutdown."""
+        await self._file.flush()
+
+    async def remove(self):
+        """Delete the snapshot, e.g. when the device is no longer configured."""
+        await self._file.remove()
@@ -0,0 +1,164 @@
+"""
+File storage off the event loop.
+
+The configuration and the state snapshots live on the remote's flash storage,
+where a write can take long enough to stall websocket handling and device I/O.
+File I/O therefore runs in the default executor, writes are deferred and
+coalesced, and files are replaced atomically so a crash mid-write leaves the
+previous version rather than a truncated one.
+
+:copyright: (c) 2025 by Meir Miyara
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Callable
+
+_LOG = logging.getLogger(__name__)
+
+# Modification time in nanoseconds and size, enough to tell whether a file changed since it was read
+FileSignature = tuple[int, int]
+
+
+def file_signature(path: str) -> FileSignature | None:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_if_changed(path: str, known: FileSignature | None = None) -> tuple[FileSignature | None, bytes | None]:
+    """Read a file unless its signature still matches a known one.
+
+    Returns:
+        The current signature, None if the file does not exist, and the content,
+        None if the file does not exist or did not change
+    """
+    signature = file_signature(path)
+    if signature is None or signature == known:
+        return signature, None
+    with open(path, "rb") as f:
+        data = f.read()
+    # Signature of what was actually read, the file may have been replaced in between
+    return file_signature(path), data
+
+
+def write_atomic(path: str, data: bytes) -> FileSignature:
+    """Replace a file with new content, returns the signature of the written file."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    return file_signature(path)
+
+
+class WriteBehindFile:
+    """Deferred, coalesced and ordered writes of one file.
+
+    Writers pass a callable that encodes the current content, it runs once per
+    write, when the delay has passed, so a burst of changes costs one encode
+    and one write. Content identical to what was last written or read is not
+    written again.
+    """
+
+    def __init__(self, path: str, delay: float):
+        self.path = path
+        self.signature: FileSignature | None = None
+        self._delay = delay
+        self._encode: Callable[[], bytes] | None = None
+        self._written: bytes | None = None
+        self._handle: asyncio.TimerHandle | None = None
+        self._write_task: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> bool:
+        return self._handle is not None
+
+    def loaded(self, data: bytes | None, signature: FileSignature | None):
+        """Record the content read from disk, so an unchanged write is skipped."""
+        self._written = data
+        self.signature = signature
+
+    def schedule(self, encode: Callable[[], bytes]):
+        """Write the content returned by encode once the delay has passed.
+
+        Without a running event loop the file is written right away.
+        """
+        self._encode = encode
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_now()
+            return
+        if self._handle is None:
+            self._handle = loop.call_later(self._delay, self._start_write)
+
+    async def flush(self):
+        """Write pending content now and wait for every write in flight."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._start_write()
+        if self._write_task is not None:
+            await self._write_task
+
+    async def remove(self) -> bool:
+        """Flush, then delete the file, returns False if it could not be removed."""
+        await self.flush()
+        self._written = None
+        self.signature = None
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, os.remove, self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            _LOG.warning(f"Failed to remove {self.path}: {e}")
+            return False
+        return True
+
+    def _take(self) -> bytes | None:
+        self._handle = None
+        encode, self._encode = self._encode, None
+        if encode is None:
+            return None
+        data = encode()
+        if data == self._written:
+            return None
+        self._written = data
+        return data
+
+    def _write_now(self):
+        data = self._take()
+        if data is None:
+            return
+        try:
+            self.signature = write_atomic(self.path, data)
+        except OSError as e:
+            _LOG.error(f"Failed to write {self.path}: {e}")
+            self._written = None
+
+    def _start_write(self):
+        data = self._take()
+        if data is None:
+            return
+        previous = self._write_task
+        self._write_task = asyncio.get_running_loop().create_task(self._write(data, previous))
+
+    async def _write(self, data: bytes, previous: asyncio.Task | None):
+        # Keep writes in order, older content must not replace newer content
+        if previous is not None and not previous.done():
+            await asyncio.wait([previous])
+        try:
+            signature = await asyncio.get_running_loop().run_in_executor(None, write_atomic, self.path, data)
+        except OSError as e:
+            _LOG.error(f"Failed to write {self.path}: {e}")
+            if self._written == data:
+                self._written = None
+            return
+        if self._written == data:
+            self.signature = signature
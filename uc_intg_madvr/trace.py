@@ -0,0 +1,177 @@
+"""
+Opt-in command tracing.
+
+A trace follows one command from the entity command handler to its reply:
+handler entry, enqueue, connected (only when the write had to connect
+first), lock acquired, written, first reply line and completion. Finished
+traces go to a bounded ring buffer that can be dumped as JSONL on demand, and
+is dumped automatically when a command exceeds the slow threshold.
+
+Tracing is off unless ``UC_MADVR_TRACE`` or ``UC_MADVR_TRACE_SLOW_MS`` is set,
+and then costs a single attribute check per command.
+
+:copyright: (c) 2025 by Meir Miyara
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Callable, Iterable
+
+from uc_intg_madvr import const
+
+_LOG = logging.getLogger(__name__)
+
+# Entity handler the current task is serving, inherited by tasks it creates
+_HANDLER: ContextVar[tuple[str, float] | None] = ContextVar("madvr_trace_handler", default=None)
+
+
+class CommandTrace:
+    """Monotonic timestamps of the stages of one command."""
+
+    __slots__ = ("device", "command", "source", "wall_time", "marks", "result")
+
+    def __init__(self, device: str, command: str):
+        handler = _HANDLER.get()
+        self.device = device
+        self.command = command
+        self.source = handler[0] if handler else None
+        self.wall_time = time.time()
+        self.marks: dict[str, float] = {"handler": handler[1]} if handler else {}
+        self.result: str | None = None
+
+    def mark(self, stage: str, when: float | None = None):
+        """Record a stage, the first time it is reached."""
+        if stage not in self.marks:
+            self.marks[stage] = time.monotonic() if when is None else when
+
+    @property
+    def duration(self) -> float:
+        return max(self.marks.values()) - min(self.marks.values()) if self.marks else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        start = min(self.marks.values()) if self.marks else 0.0
+        return {
+            "time": self.wall_time,
+            "device": self.device,
+            "command": self.command,
+            "source": self.source,
+            "result": self.result,
+            "total_ms": round(self.duration * 1000, 3),
+            "stages_ms": {stage: round((when - start) * 1000, 3) for stage, when in self.marks.items()},
+        }
+
+
+class Tracer:
+    """Ring buffer of finished command traces."""
+
+    def __init__(self, capacity: int = const.TRACE_BUFFER_SIZE):
+        self.enabled = False
+        self.slow_threshold: float | None = None
+        self.dump_dir: str | None = None
+        self._traces: deque[CommandTrace] = deque(maxlen=capacity)
+        self._last_dump = 0.0
+
+    def configure(self, enabled: bool, slow_threshold: float | None = None, dump_dir: str | None = None):
+        """Switch tracing on or off.
+
+        Args:
+            enabled: Record traces
+            slow_threshold: Seconds from first to last stage that trigger a dump, None to disable
+            dump_dir: Directory slow dumps are written to
+        """
+        self.enabled = enabled
+        self.slow_threshold = slow_threshold
+        self.dump_dir = dump_dir
+
+    def configure_from_env(self, dump_dir: str | None = None):
+        slow_ms = os.getenv(const.TRACE_SLOW_MS_ENV)
+        try:
+            slow_threshold = float(slow_ms) / 1000 if slow_ms else None
+        except ValueError:
+            _LOG.warning(f"Ignoring invalid {const.TRACE_SLOW_MS_ENV}={slow_ms}")
+            slow_threshold = None
+        enabled = bool(os.getenv(const.TRACE_ENV)) or slow_threshold is not None
+        self.configure(enabled, slow_threshold, dump_dir)
+        if enabled:
+            _LOG.info(f"Command tracing enabled (slow threshold: {slow_ms or 'none'} ms)")
+
+    def begin(self, device: str, command: str) -> CommandTrace | None:
+        if not self.enabled:
+            return None
+        trace = CommandTrace(device, command)
+        trace.mark("enqueued")
+        return trace
+
+    def finish(self, trace: CommandTrace, result: str):
+        trace.mark("completed")
+        trace.result = result
+        self._traces.append(trace)
+
+        if self.slow_threshold is not None and trace.duration >= self.slow_threshold:
+            self._dump_slow(trace)
+
+    def traces(self) -> list[CommandTrace]:
+        return list(self._traces)
+
+    def to_jsonl(self, traces: Iterable[CommandTrace] | None = None) -> str:
+        return "".join(json.dumps(trace.to_dict()) + "\n" for trace in (traces or self._traces))
+
+    def dump(self, path: str) -> int:
+        """Write the buffered traces to a JSONL file, returns the number written."""
+        traces = self.traces()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_jsonl(traces))
+        return len(traces)
+
+    def clear(self):
+        self._traces.clear()
+
+    def _dump_slow(self, trace: CommandTrace):
+        _LOG.warning(f"[{trace.device}] Slow command {trace.command}: {trace.to_dict()['stages_ms']}")
+
+        now = time.monotonic()
+        if not self.dump_dir or now - self._last_dump < const.TRACE_DUMP_INTERVAL:
+            return
+        self._last_dump = now
+
+        path = os.path.join(self.dump_dir, f"madvr_trace_{time.strftime('%Y%m%d-%H%M%S')}.jsonl")
+        traces = self.traces()
+
+        def write():
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self.to_jsonl(traces))
+            _LOG.info(f"Wrote {len(traces)} command traces to {path}")
+
+        try:
+            asyncio.get_running_loop().run_in_executor(None, write)
+        except RuntimeError:
+            write()
+
+
+TRACER = Tracer()
+
+
+def traced(source: str) -> Callable:
+    """Mark an entity command handler as the start of the traces of the commands it sends."""
+
+    def decorator(handler: Callable) -> Callable:
+        @functools.wraps(handler)
+        async def wrapper(self, entity, cmd_id: str, *args, **kwargs):
+            if not TRACER.enabled:
+                return await handler(self, entity, cmd_id, *args, **kwargs)
+            token = _HANDLER.set((f"{source}:{cmd_id}", time.monotonic()))
+            try:
+                return await handler(self, entity, cmd_id, *args, **kwargs)
+            finally:
+                _HANDLER.reset(token)
+
+        return wrapper
+
+    return decorator